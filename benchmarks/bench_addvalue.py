@@ -0,0 +1,104 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Compare the key dispatch of BaseMatcher.addValue with ZConfig 4.3.
+
+Adds values for every key of section types with an increasing number
+of keys, and for arbitrary keys matched by a ``+`` key declared after
+all of them, which ZConfig 4.3 found only after scanning every child.
+
+Run as ``python benchmarks/bench_addvalue.py``.
+"""
+
+import time
+from io import StringIO
+
+import ZConfig
+from ZConfig.matcher import SchemaMatcher
+
+
+def find43(type_, realkey):
+    """The key lookup of addValue() as it was in ZConfig 4.3."""
+    arbkey_info = None
+    for i in range(len(type_)):
+        k, ci = type_[i]
+        if k == realkey:
+            break
+        if ci.name == "+" and not ci.issection():
+            arbkey_info = k, ci
+    else:
+        if arbkey_info is None:
+            raise ZConfig.ConfigurationError(
+                repr(realkey) + " is not a known key name")
+        k, ci = arbkey_info
+    return ci
+
+
+def find(type_, realkey):
+    ci = type_.getkeyinfo(realkey)
+    if ci is None:
+        raise ZConfig.ConfigurationError(
+            repr(realkey) + " is not a known key name")
+    return ci
+
+
+def make_schema(nkeys):
+    keys = "".join("<multikey name='key%d'/>\n" % i for i in range(nkeys))
+    text = ("<schema>\n%s<multikey name='+' attribute='other'/>\n</schema>\n"
+            % keys)
+    return ZConfig.loadSchemaFile(StringIO(text))
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def report(label, schema, keys, number):
+    def lookups(func):
+        def loop():
+            for _ in range(number):
+                for key in keys:
+                    func(schema, key)
+        return loop
+
+    def add_values():
+        matcher = SchemaMatcher(schema)
+        position = (1, None, "file:///bench.conf")
+        for _ in range(number):
+            for key in keys:
+                matcher.addValue(key, "value", position)
+
+    old = best_of(lookups(find43))
+    new = best_of(lookups(find))
+    print("  %-22s %8.4fs %8.4fs  (%.1fx)   addValue %8.4fs"
+          % (label, old, new, old / new, best_of(add_values)))
+
+
+def main():
+    print("  %-22s %9s %9s" % ("", "4.3", "indexed"))
+    for nkeys in (5, 20, 60, 200):
+        schema = make_schema(nkeys)
+        keys = ["key%d" % i for i in range(nkeys)]
+        number = max(1, 20000 // nkeys)
+        report("%d keys" % nkeys, schema, keys, number)
+        report("%d keys, arbitrary" % nkeys, schema,
+               ["other%d" % i for i in range(nkeys)], number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Compare the bulk tokenizer of ZConfigParser with the readline loop.
+
+Parses a generated configuration file of (by default) 200,000 lines
+with a context that does nothing, so only the parser itself is
+measured:
+
+- ``readline 4.3``: the parse loop of ZConfig 4.3;
+- ``readline``: the current parser with ``bulk_read`` disabled;
+- ``bulk``: the current parser reading the resource in one go.
+
+Run as ``python benchmarks/bench_cfgparser.py [lines]``.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import ZConfig.cfgparser
+from ZConfig.loader import Resource
+
+
+class NullSection:
+
+    def addValue(self, key, value, position):
+        pass
+
+
+class NullContext:
+
+    def startSection(self, parent, type_, name):
+        return NullSection()
+
+    def endSection(self, parent, type_, name, matcher):
+        pass
+
+
+class ReadlineParser(ZConfig.cfgparser.ZConfigParser):
+    bulk_read = False
+
+
+class Parser43(ZConfig.cfgparser.ZConfigParser):
+    """The parse loop as it was in ZConfig 4.3."""
+
+    def parse(self, section):
+        done, line = self.nextline()
+        while not done:
+            if line[:1] in ("", "#"):
+                pass
+            elif line[:2] == "</":
+                if line[-1] != ">":
+                    self.error("malformed section end")
+                section = self.end_section(section, line[2:-1])
+            elif line[0] == "<":
+                if line[-1] != ">":
+                    self.error("malformed section start")
+                section = self.start_section(section, line[1:-1])
+            elif line[0] == "%":
+                self.handle_directive(section, line[1:])
+            else:
+                self.handle_key_value(section, line)
+            done, line = self.nextline()
+        if self.stack:
+            self.error("unclosed sections not allowed")
+
+    def handle_key_value(self, section, rest):
+        m = ZConfig.cfgparser._keyvalue_rx.match(rest)
+        if not m:
+            self.error("malformed configuration data")
+        key, value = m.group('key', 'value')
+        if not value:
+            value = ''
+        else:
+            value = self.replace(value)
+        try:
+            section.addValue(key, value, (self.lineno, None, self.url))
+        except ZConfig.ConfigurationError as e:
+            if getattr(e, 'lineno', -1) < 0:
+                e.lineno = self.lineno
+            if not e.url:
+                e.url = self.url
+            raise
+
+
+PARSERS = [
+    ("readline 4.3", Parser43),
+    ("readline", ReadlineParser),
+    ("bulk", ZConfig.cfgparser.ZConfigParser),
+]
+
+SECTION = """\
+# storage %(i)d
+<storage s%(i)d>
+  path /var/lib/db/%(i)d.fs
+  cache-size %(i)dKB
+
+  read-only off
+</storage>
+"""
+
+
+def generate(lines):
+    chunks = []
+    per_section = SECTION.count("\n")
+    for i in range(lines // per_section):
+        chunks.append(SECTION % dict(i=i))
+    return "".join(chunks)
+
+
+def best_of(func, repeat=15):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def parse(factory, path):
+    # opened the way the loader opens local files
+    with open(path, encoding="utf-8", newline="\n") as f:
+        resource = Resource(f, "file:///bench.conf")
+        factory(resource, NullContext()).parse(NullSection())
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    lines = int(args[0]) if args else 200000
+    text = generate(lines)
+    fd, path = tempfile.mkstemp(suffix=".conf")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        print("%d lines:" % text.count("\n"))
+        baseline = None
+        for name, factory in PARSERS:
+            elapsed = best_of(lambda: parse(factory, path))
+            if baseline is None:
+                baseline = elapsed
+            print("  %-13s %7.3fs  (%.2fx)"
+                  % (name, elapsed, baseline / elapsed))
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Compare loading with generated matchers with the default matchers.
+
+Loads configurations with thousands of sections of one type with a
+ConfigLoader using the matchers of ZConfig.matcher, which interpret
+the load plans of the section types, and with one using the matchers
+of ZConfig.codegen, and times finishing the sections alone.
+
+Run as ``python benchmarks/bench_codegen.py``.
+"""
+
+import time
+from io import StringIO
+
+import ZConfig
+from ZConfig.codegen import getfinisher
+from ZConfig.loader import ConfigLoader
+from ZConfig.matcher import BaseMatcher
+
+
+SCHEMA = """\
+<schema>
+  <sectiontype name='server'>
+    <key name='host' default='localhost'/>
+    <key name='port' datatype='port-number' default='8080'/>
+    <key name='timeout' datatype='time-interval' default='30s'/>
+    <key name='retries' datatype='integer' default='3'/>
+    <key name='enabled' datatype='boolean' default='on'/>
+    <key name='size' datatype='byte-size' default='64MB'/>
+    <key name='name' datatype='identifier' default='server'/>
+    <key name='weight' datatype='float' default='1.0'/>
+    <multikey name='alias'>
+      <default>www</default>
+    </multikey>
+    <key name='+' attribute='options' datatype='integer'>
+      <default key='workers'>4</default>
+    </key>
+  </sectiontype>
+  <multisection type='server' name='+' attribute='servers'/>
+</schema>
+"""
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def finish_time(schema, text, finish):
+    # Time spent in finish() for the sections of a load.
+    spent = []
+    original = BaseMatcher.finish
+
+    def timed(matcher):
+        start = time.perf_counter()
+        try:
+            return finish(matcher)
+        finally:
+            spent.append(time.perf_counter() - start)
+
+    BaseMatcher.finish = timed
+    try:
+        ConfigLoader(schema).loadFile(StringIO(text))
+    finally:
+        BaseMatcher.finish = original
+    return sum(spent)
+
+
+def main():
+    schema = ZConfig.loadSchemaFile(StringIO(SCHEMA))
+    print("  %-22s %9s %9s" % ("", "plans", "generated"))
+    for count in (1000, 10000):
+        text = "".join("<server s%d>\n  host h%d\n</server>\n" % (i, i)
+                       for i in range(count))
+
+        def load(codegen):
+            def run():
+                loader = ConfigLoader(schema, codegen=codegen)
+                loader.loadFile(StringIO(text))
+            return run
+
+        old = best_of(load(False))
+        new = best_of(load(True))
+        print("  %-22s %8.4fs %8.4fs  (%.1fx)"
+              % ("load %d sections" % count, old, new, old / new))
+        old = min(finish_time(schema, text, BaseMatcher.finish)
+                  for _ in range(5))
+        new = min(finish_time(schema, text,
+                              lambda m: getfinisher(m.type)(m))
+                  for _ in range(5))
+        print("  %-22s %8.4fs %8.4fs  (%.1fx)"
+              % ("finish %d sections" % count, old, new, old / new))
+
+
+if __name__ == "__main__":
+    main()
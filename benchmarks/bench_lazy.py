@@ -0,0 +1,97 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Compare loading with lazy conversions with loading eagerly.
+
+Loads a configuration with thousands of sections whose keys use
+datatypes checking the file system and host names, and reads one
+value of one section, as a tool looking at a large configuration
+would; then converts all values with validate_all().
+
+Run as ``python benchmarks/bench_lazy.py``.
+"""
+
+import os
+import tempfile
+import time
+from io import StringIO
+
+import ZConfig
+from ZConfig.loader import ConfigLoader
+
+
+SCHEMA = """\
+<schema>
+  <sectiontype name='site'>
+    <key name='root' datatype='existing-directory'/>
+    <key name='logfile' datatype='existing-dirpath'/>
+    <key name='host' datatype='ipaddr-or-hostname'/>
+    <key name='port' datatype='port-number'/>
+    <key name='language' datatype='locale' default='C'/>
+  </sectiontype>
+  <multisection type='site' name='+' attribute='sites'/>
+</schema>
+"""
+
+SITE = """\
+<site s%d>
+  root %s
+  logfile %s/site.log
+  host www.example.com
+  port 8080
+</site>
+"""
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    schema = ZConfig.loadSchemaFile(StringIO(SCHEMA))
+    directory = tempfile.mkdtemp()
+    try:
+        print("  %-26s %9s %9s" % ("", "eager", "lazy"))
+        for count in (1000, 10000):
+            text = "".join(SITE % (i, directory, directory)
+                           for i in range(count))
+
+            def peek(lazy, validate=False):
+                def run():
+                    loader = ConfigLoader(schema, lazy=lazy)
+                    conf, _ = loader.loadFile(StringIO(text))
+                    conf.sites[count // 2].root
+                    if validate:
+                        conf.validate_all()
+                return run
+
+            eager = best_of(peek(False))
+            lazy = best_of(peek(True))
+            print("  %-26s %8.4fs %8.4fs  (%.1fx)"
+                  % ("%d sections, one value" % count, eager, lazy,
+                     eager / lazy))
+            lazy = best_of(peek(True, True))
+            print("  %-26s %8.4fs %8.4fs  (%.1fx)"
+                  % ("%d sections, all values" % count, eager, lazy,
+                     eager / lazy))
+    finally:
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Compare loading sections using load plans with ZConfig 4.3.
+
+Loads configurations with thousands of sections of one type, setting
+a few of their keys and leaving the others at their defaults, with
+the matchers executing the load plan of the section type and with the
+matcher methods of ZConfig 4.3, which looked at each child of the
+section type again for every section.
+
+Run as ``python benchmarks/bench_loadplan.py``.
+"""
+
+import time
+from io import StringIO
+
+import ZConfig
+from ZConfig.matcher import BaseMatcher
+
+
+def init43(self, info, type_, handlers):
+    """BaseMatcher.__init__() as it was in ZConfig 4.3."""
+    self.info = info
+    self.type = type_
+    self._values = {}
+    for _type_key, type_info in type_:
+        if type_info.name == "+" and not type_info.issection():
+            v = {}
+        elif type_info.ismulti():
+            v = []
+        else:
+            v = None
+        assert type_info.attribute is not None
+        self._values[type_info.attribute] = v
+    self._sectionnames = {}
+    self.handlers = handlers if handlers is not None else []
+
+
+def finish43(self):
+    """BaseMatcher.finish() as it was in ZConfig 4.3."""
+    values = self._values
+    for key, ci in self.type:
+        if key:
+            key = repr(key)
+        else:
+            key = "section type " + repr(ci.sectiontype.name)
+        assert ci.attribute is not None
+        attr = ci.attribute
+        v = values[attr]
+        if ci.name == '+' and not ci.issection():
+            # v is a dict
+            if ci.minOccurs > len(v):
+                raise ZConfig.ConfigurationError(
+                    "no keys defined for the %s key/value map; at least %d"
+                    " must be specified" % (attr, ci.minOccurs))
+        if v is None and ci.minOccurs:
+            default = ci.getdefault()
+            if default is None:
+                raise ZConfig.ConfigurationError(
+                    f"no values for {key}; {ci.minOccurs} required")
+            else:
+                v = values[attr] = default[:]
+        if ci.ismulti():
+            if not v:
+                default = ci.getdefault()
+                if isinstance(default, dict):
+                    v.update(default)
+                else:
+                    v[:] = default
+            if len(v) < ci.minOccurs:
+                raise ZConfig.ConfigurationError(
+                    "not enough values for %s; %d found, %d required"
+                    % (key, len(v), ci.minOccurs))
+        if v is None and not ci.issection():
+            if ci.ismulti():
+                v = ci.getdefault()[:]
+            else:
+                v = ci.getdefault()
+            values[attr] = v
+    return self.constuct()
+
+
+def constuct43(self):
+    """BaseMatcher.constuct() as it was in ZConfig 4.3."""
+    values = self._values
+    for name, ci in self.type:
+        assert ci.attribute is not None
+        attr = ci.attribute
+        if ci.ismulti():
+            if ci.issection():
+                v = []
+                for s in values[attr]:
+                    if s is not None:
+                        st = s.getSectionDefinition()
+                        try:
+                            s = st.datatype(s)
+                        except ValueError as e:
+                            raise ZConfig.DataConversionError(
+                                e, s, (-1, -1, None))
+
+                    v.append(s)
+            elif ci.name == '+':
+                v = values[attr]
+                for key, val in v.items():
+                    v[key] = [vi.convert(ci.datatype) for vi in val]
+            else:
+                v = [vi.convert(ci.datatype) for vi in values[attr]]
+        elif ci.issection():
+            if values[attr] is not None:
+                st = values[attr].getSectionDefinition()
+                try:
+                    v = st.datatype(values[attr])
+                except ValueError as e:
+                    raise ZConfig.DataConversionError(
+                        e, values[attr], (-1, -1, None))
+
+            else:
+                v = None
+        elif name == '+':
+            v = values[attr]
+            if not v:
+                for key, val in ci.getdefault().items():
+                    v[key] = val.convert(ci.datatype)
+            else:
+                for key, val in v.items():
+                    v[key] = val.convert(ci.datatype)
+        else:
+            v = values[attr]
+            if v is not None:
+                v = v.convert(ci.datatype)
+        values[attr] = v
+        if ci.handler is not None:
+            self.handlers.append((ci.handler, v))
+    return self.createValue()
+
+
+SCHEMA = """\
+<schema>
+  <sectiontype name='server'>
+    <key name='host' default='localhost'/>
+    <key name='port' datatype='port-number' default='8080'/>
+    <key name='timeout' datatype='time-interval' default='30s'/>
+    <key name='retries' datatype='integer' default='3'/>
+    <key name='enabled' datatype='boolean' default='on'/>
+    <key name='size' datatype='byte-size' default='64MB'/>
+    <key name='name' datatype='identifier' default='server'/>
+    <key name='weight' datatype='float' default='1.0'/>
+    <multikey name='alias'>
+      <default>www</default>
+    </multikey>
+    <key name='+' attribute='options' datatype='integer'>
+      <default key='workers'>4</default>
+    </key>
+  </sectiontype>
+  <multisection type='server' name='+' attribute='servers'/>
+</schema>
+"""
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    schema = ZConfig.loadSchemaFile(StringIO(SCHEMA))
+    print("  %-22s %9s %9s" % ("", "4.3", "plans"))
+    for count in (1000, 10000):
+        text = "".join("<server s%d>\n  host h%d\n</server>\n" % (i, i)
+                       for i in range(count))
+
+        def load():
+            ZConfig.loadConfigFile(schema, StringIO(text))
+
+        new = best_of(load)
+        saved = BaseMatcher.__init__, BaseMatcher.finish, BaseMatcher.constuct
+        BaseMatcher.__init__ = init43
+        BaseMatcher.finish = finish43
+        BaseMatcher.constuct = constuct43
+        try:
+            old = best_of(load)
+        finally:
+            (BaseMatcher.__init__, BaseMatcher.finish,
+             BaseMatcher.constuct) = saved
+        print("  %-22s %8.4fs %8.4fs  (%.1fx)"
+              % ("%d sections" % count, old, new, old / new))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Compare ways of reading large local configuration files.
+
+Generates configuration files of a few megabytes and reports the time
+and peak Python memory allocation needed to read them line by line
+through ``openResource``, and to load them with a ``ConfigLoader``:
+
+- ``urlopen``: the previous implementation, reading the resource with
+  :func:`urllib.request.urlopen` into a :class:`io.StringIO`;
+- ``file``: the buffered text file now used for ``file:`` URLs;
+- ``mmap``: the memory-mapped reader enabled by ``mmap_threshold``.
+
+Run as ``python benchmarks/bench_open_resource.py [megabytes...]``.
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+
+import ZConfig.loader
+import ZConfig.url
+
+
+SCHEMA = """\
+<schema>
+  <multikey name='item' attribute='items'/>
+</schema>
+"""
+
+
+class UrlopenLoader(ZConfig.loader.ConfigLoader):
+    """Loader reading ``file:`` URLs the way ZConfig 4.3 did."""
+
+    def openResource(self, url):
+        with urllib.request.urlopen(url) as f:
+            data = f.read()
+        return self.createResource(io.StringIO(data.decode("utf-8")), url)
+
+
+class MmapLoader(ZConfig.loader.ConfigLoader):
+    mmap_threshold = 0
+
+
+LOADERS = [
+    ("urlopen", UrlopenLoader),
+    ("file", ZConfig.loader.ConfigLoader),
+    ("mmap", MmapLoader),
+]
+
+
+def generate(path, megabytes):
+    line = "item %s\n" % ("x" * 58)
+    count = megabytes * 1024 * 1024 // len(line)
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write(line)
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def read_lines(loader, url):
+    with loader.openResource(url) as r:
+        for line in iter(r.readline, ""):
+            pass
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    sizes = [int(arg) for arg in args] or [4, 16]
+    schema = ZConfig.loader.SchemaLoader().loadFile(io.StringIO(SCHEMA))
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for megabytes in sizes:
+            path = os.path.join(tmpdir, "bench.conf")
+            generate(path, megabytes)
+            url = ZConfig.url.urlnormalize(
+                "file://" + urllib.request.pathname2url(path))
+            print("%d MB config:" % megabytes)
+            for name, factory in LOADERS:
+                loader = factory(schema)
+                read_time, read_peak = measure(
+                    lambda: read_lines(loader, url))
+                load_time, load_peak = measure(
+                    lambda: loader.loadURL(url))
+                print("  %-8s read %7.3fs %8.1f MB peak"
+                      "   load %7.3fs %8.1f MB peak"
+                      % (name, read_time, read_peak / 2**20,
+                         load_time, load_peak / 2**20))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Compare pickling loaded configurations with and without their schema.
+
+Loads configurations with an increasing number of sections using a
+schema registered in ZConfig.schemacache.shared_schemas, whose sections
+are pickled referring to the schema, and using the same schema loaded
+by a SchemaLoader of its own, whose sections are pickled with the
+schema.  Reports the size of the pickles and the time taken to pickle
+and unpickle them, next to the time taken to load the configuration
+again.
+
+Run as ``python benchmarks/bench_pickle.py``.
+"""
+
+import pickle
+import time
+from io import StringIO
+
+import ZConfig
+from ZConfig.loader import ConfigLoader
+from ZConfig.loader import SchemaLoader
+
+
+SCHEMA = """\
+<schema>
+  <sectiontype name='mapping'>
+    <key name='source'/>
+    <key name='target'/>
+    <key name='weight' datatype='integer' default='1'/>
+    <key name='enabled' datatype='boolean' default='on'/>
+  </sectiontype>
+  <key name='name'/>
+  <key name='port' datatype='port-number' default='8080'/>
+  <multisection type='mapping' name='*' attribute='mappings'/>
+</schema>
+"""
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    shared = ZConfig.loadSchemaFile(StringIO(SCHEMA))
+    private = SchemaLoader().loadFile(StringIO(SCHEMA))
+    print("  %-14s %-11s %8s %10s %10s %10s"
+          % ("", "", "bytes", "dumps", "loads", "load"))
+    for count in (1, 100, 10000):
+        text = "name app\n" + "".join(
+            "<mapping>\n  source /a/%d\n  target /b/%d\n</mapping>\n"
+            % (i, i) for i in range(count))
+        for label, schema in [("with schema", private),
+                              ("registered", shared)]:
+            loader = ConfigLoader(schema)
+            conf, _ = loader.loadFile(StringIO(text))
+            data = pickle.dumps(conf)
+            dumps = best_of(lambda: pickle.dumps(conf))
+            loads = best_of(lambda: pickle.loads(data))
+            load = best_of(lambda: loader.loadFile(StringIO(text)))
+            print("  %-14s %-11s %8d %9.6fs %9.6fs %9.6fs"
+                  % ("%d sections" % count, label, len(data),
+                     dumps, loads, load))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Compare SectionType.getsectioninfo with the scan of ZConfig 4.3.
+
+Looks up the sections of a schema with a number of named sections,
+sections of any name, and sections of abstract types (such as the
+handlers of ``<logger>`` sections), and loads a configuration with
+thousands of such sections.
+
+Run as ``python benchmarks/bench_sections.py``.
+"""
+
+import time
+from io import StringIO
+
+import ZConfig
+from ZConfig.info import SectionType
+
+
+def getsectioninfo43(self, type_, name):
+    """SectionType.getsectioninfo() as it was in ZConfig 4.3."""
+    for key, info in self._children:
+        if key:
+            if key == name:
+                if not info.issection():
+                    raise ZConfig.ConfigurationError(
+                        "section name %s already in use for key" % key)
+                st = info.sectiontype
+                if st.isabstract():
+                    try:
+                        st = st.getsubtype(type_)
+                    except ZConfig.ConfigurationError:
+                        raise ZConfig.ConfigurationError(
+                            "section type %s not allowed for name %s"
+                            % (repr(type_), repr(key)))
+                if st.name != type_:
+                    raise ZConfig.ConfigurationError(
+                        "name %s must be used for a %s section"
+                        % (repr(name), repr(st.name)))
+                return info
+        elif info.sectiontype.name == type_:
+            if not (name or info.allowUnnamed()):
+                raise ZConfig.ConfigurationError(
+                    repr(type_) + " sections must be named")
+            return info
+        elif info.sectiontype.isabstract():
+            st = info.sectiontype
+            try:
+                st = st.getsubtype(type_)
+            except ZConfig.ConfigurationError:
+                pass
+            else:
+                return info
+    raise ZConfig.ConfigurationError(
+        "no matching section defined for type='%s', name='%s'"
+        % (type_, name))
+
+
+def make_schema(count):
+    types = []
+    sections = []
+    for i in range(count):
+        types.append("<abstracttype name='abstract%d'/>" % i)
+        types.append("<sectiontype name='impl%d' implements='abstract%d'/>"
+                     % (i, i))
+        types.append("<sectiontype name='named%d'/>" % i)
+        sections.append("<section type='named%d' name='fixed%d'"
+                        " attribute='fixed%d'/>" % (i, i, i))
+        sections.append("<multisection type='abstract%d' name='*'"
+                        " attribute='abstract%d'/>" % (i, i))
+    types.append("<sectiontype name='mapping'><key name='value'/>"
+                 "</sectiontype>")
+    sections.append("<multisection type='mapping' name='+'"
+                    " attribute='mappings'/>")
+    text = "<schema>\n%s\n%s\n</schema>\n" % (
+        "\n".join(types), "\n".join(sections))
+    return ZConfig.loadSchemaFile(StringIO(text))
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    count = 20
+    schema = make_schema(count)
+    lookups = ([("named%d" % i, "fixed%d" % i) for i in range(count)]
+               + [("impl%d" % i, None) for i in range(count)]
+               + [("mapping", "m%d" % i) for i in range(count)])
+
+    def run(func):
+        def loop():
+            for _ in range(500):
+                for type_, name in lookups:
+                    func(schema, type_, name)
+        return loop
+
+    old = best_of(run(getsectioninfo43))
+    new = best_of(run(SectionType.getsectioninfo))
+    print("  %-22s %9s %9s" % ("", "4.3", "table"))
+    print("  %-22s %8.4fs %8.4fs  (%.1fx)"
+          % ("getsectioninfo", old, new, old / new))
+
+    text = "".join("<mapping m%d>\n  value %d\n</mapping>\n" % (i, i)
+                   for i in range(5000))
+    text += "".join("<impl%d/>\n" % (i % count) for i in range(5000))
+
+    def load():
+        ZConfig.loadConfigFile(schema, StringIO(text))
+
+    new = best_of(load, 3)
+    saved = SectionType.getsectioninfo
+    SectionType.getsectioninfo = getsectioninfo43
+    try:
+        old = best_of(load, 3)
+    finally:
+        SectionType.getsectioninfo = saved
+    print("  %-22s %8.4fs %8.4fs  (%.1fx)"
+          % ("10000 sections", old, new, old / new))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Measure the memory used by sections with and without slots.
+
+Loads (by default) 50,000 sections of one type with a ConfigLoader
+creating SectionValue objects and with one creating the classes with
+slots made by ZConfig.matcher.getvalueclass(), and reports the memory
+held by the loaded configuration and the time taken to load it.
+
+Run as ``python benchmarks/bench_slots.py [sections]``.
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from io import StringIO
+
+import ZConfig
+from ZConfig.loader import ConfigLoader
+
+
+SCHEMA = """\
+<schema>
+  <sectiontype name='mapping'>
+    <key name='source'/>
+    <key name='target'/>
+    <key name='weight' datatype='integer' default='1'/>
+    <key name='enabled' datatype='boolean' default='on'/>
+    <key name='comment' default=''/>
+  </sectiontype>
+  <multisection type='mapping' name='*' attribute='mappings'/>
+</schema>
+"""
+
+
+def measure(schema, text, slots):
+    loader = ConfigLoader(schema, slots=slots)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        conf, _ = loader.loadFile(StringIO(text))
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del conf
+    # timed separately, as tracing slows the load down
+    start = time.perf_counter()
+    loader.loadFile(StringIO(text))
+    return size, time.perf_counter() - start
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    count = int(args[0]) if args else 50000
+    schema = ZConfig.loadSchemaFile(StringIO(SCHEMA))
+    text = "".join("<mapping>\n  source /a/%d\n  target /b/%d\n</mapping>\n"
+                   % (i, i) for i in range(count))
+    print("%d sections:" % count)
+    for name, slots in [("SectionValue", False), ("slots", True)]:
+        size, elapsed = measure(schema, text, slots)
+        print("  %-13s %8.1f MB  %6.1f bytes/section  %.3fs"
+              % (name, size / 1e6, size / count, elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Compare loading a configuration with loading its snapshot.
+
+Generates a configuration with many sections spread over several
+included files and reports the time needed to load it with
+:func:`ZConfig.loadConfig` and from a snapshot written by
+:mod:`ZConfig.snapshot`.
+
+Run as ``python benchmarks/bench_snapshot.py [sections]``.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import ZConfig
+import ZConfig.snapshot
+
+
+SCHEMA = """\
+<schema>
+  <sectiontype name='storage'>
+    <key name='path' required='yes'/>
+    <key name='cache-size' datatype='byte-size' default='10MB'/>
+    <key name='pool-timeout' datatype='time-interval' default='30s'/>
+    <key name='read-only' datatype='boolean' default='off'/>
+    <key name='address' datatype='socket-address'/>
+  </sectiontype>
+  <multisection type='storage' name='*' attribute='storages'/>
+</schema>
+"""
+
+SECTION = """\
+<storage s%(i)d>
+  path /var/lib/db/%(i)d.fs
+  cache-size %(i)dKB
+  pool-timeout 5m
+  read-only %(ro)s
+  address 127.0.0.1:%(port)d
+</storage>
+"""
+
+
+def generate(tmpdir, sections, files=10):
+    with open(os.path.join(tmpdir, "schema.xml"), "w") as f:
+        f.write(SCHEMA)
+    with open(os.path.join(tmpdir, "main.conf"), "w") as main:
+        for n in range(files):
+            name = "part%d.conf" % n
+            main.write("%%include %s\n" % name)
+            with open(os.path.join(tmpdir, name), "w") as f:
+                for i in range(n, sections, files):
+                    f.write(SECTION % dict(i=i, ro=["on", "off"][i % 2],
+                                           port=8000 + i))
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    sections = int(args[0]) if args else 5000
+    tmpdir = tempfile.mkdtemp()
+    try:
+        generate(tmpdir, sections)
+        schema = ZConfig.loadSchema(os.path.join(tmpdir, "schema.xml"))
+        url = os.path.join(tmpdir, "main.conf")
+        snapshot = os.path.join(tmpdir, "main.snapshot")
+        ZConfig.snapshot.loadConfig(schema, url, snapshot)
+        full = best_of(lambda: ZConfig.loadConfig(schema, url))
+        warm = best_of(lambda: ZConfig.snapshot.loadConfig(
+            schema, url, snapshot))
+        print("%d sections, snapshot of %d bytes"
+              % (sections, os.path.getsize(snapshot)))
+        print("  loadConfig  %7.3fs" % full)
+        print("  snapshot    %7.3fs  (%.1fx faster)" % (warm, full / warm))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Compare ZConfig.substitution.substitute with the engine of ZConfig 4.3.
+
+Substitutes into values with an increasing number of references, and
+into a set of short values typical of configuration files, repeating
+each value as a configuration would (the same ``$name`` pattern on
+many lines), and into short values which are all different, so that
+each template is compiled.
+
+Run as ``python benchmarks/bench_substitution.py``.
+"""
+
+import time
+
+import ZConfig
+from ZConfig.substitution import _name_match
+from ZConfig.substitution import substitute
+
+
+def _split(s):
+    # _split() as it was in ZConfig 4.3.
+    # Return a four tuple:  prefix, name, namecase, suffix
+    # - prefix is text that can be used literally in the result (may be '')
+    # - name is a referenced name, or None
+    # - namecase is the name with case preserved
+    # - suffix is trailling text that may contain additional references
+    #   (may be '' or None)
+    if "$" in s:
+        i = s.find("$")
+        c = s[i + 1:i + 2]
+        if c == "":
+            raise ZConfig.SubstitutionSyntaxError(
+                "illegal lone '$' at end of source")
+        if c == "$":
+            return s[:i + 1], None, None, s[i + 2:], None
+        prefix = s[:i]
+        vtype = 'define'
+        if c == "{":
+            m = _name_match(s, i + 2)
+            if not m:
+                raise ZConfig.SubstitutionSyntaxError(
+                    "'${' not followed by name")
+            name = m.group(0)
+            i = m.end() + 1
+            if not s.startswith("}", i - 1):
+                raise ZConfig.SubstitutionSyntaxError(
+                    "'${%s' not followed by '}'" % name)
+        elif c == "(":
+            m = _name_match(s, i + 2)
+            if not m:
+                raise ZConfig.SubstitutionSyntaxError(
+                    "'$(' not followed by name")
+            name = m.group(0)
+            i = m.end() + 1
+            if not s.startswith(")", i - 1):
+                raise ZConfig.SubstitutionSyntaxError(
+                    "'$(%s' not followed by ')'" % name)
+            vtype = 'env'
+        else:
+            m = _name_match(s, i + 1)
+            if not m:
+                raise ZConfig.SubstitutionSyntaxError(
+                    "'$' not followed by '$' or name")
+            name = m.group(0)
+            i = m.end()
+        return prefix, name.lower(), name, s[i:], vtype
+    else:
+        return s, None, None, None, None
+
+
+def substitute43(s, mapping):
+    """substitute() as it was in ZConfig 4.3."""
+    if "$" in s:
+        result = ''
+        rest = s
+        while rest:
+            p, name, namecase, rest, vtype = _split(rest)
+            result += p
+            if name:
+                v = mapping.get(name)
+                if v is None:
+                    raise ZConfig.SubstitutionReplacementError(s, namecase)
+                result += v
+        return result
+    else:
+        return s
+
+
+MAPPING = {"home": "/srv/app", "name": "app", "port": "8080"}
+
+SHORT = [
+    "$home/var/data.fs",
+    "${name}-worker",
+    "http://localhost:$port/",
+    "$home/log/$name.log",
+    "$$5 per ${name}",
+]
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def report(label, values, number):
+    def run(func):
+        def loop():
+            for _ in range(number):
+                for value in values:
+                    func(value, MAPPING)
+        return loop
+
+    old = best_of(run(substitute43))
+    new = best_of(run(substitute))
+    print("  %-22s %8.4fs %8.4fs  (%.1fx)" % (label, old, new, old / new))
+
+
+def main():
+    print("  %-22s %9s %9s" % ("", "4.3", "compiled"))
+    for refs in (10, 100, 1000, 10000):
+        value = "$home/${name}:" * refs
+        report("%d references" % refs, [value], max(1, 10000 // refs))
+    report("short values", SHORT, 20000)
+    # all different, so none of them is found in the template cache
+    unique = ["$home/var/%d/$name" % i for i in range(100000)]
+    report("short values, unique", unique, 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Measure the memory used by the positions of ValueInfo objects.
+
+Creates (by default) 200,000 ValueInfo objects the way the matchers do
+while a configuration is parsed, and reports the memory they hold with
+the position tuples of ZConfig 4.3 and with the line numbers and URLs
+kept now, as well as the peak memory of loading a configuration with that
+many values.
+
+Run as ``python benchmarks/bench_valueinfo.py [values]``.
+"""
+
+import sys
+import time
+import tracemalloc
+from io import StringIO
+
+import ZConfig
+from ZConfig.info import ValueInfo
+
+
+class ValueInfo43:
+    """ValueInfo as it was in ZConfig 4.3."""
+
+    __slots__ = 'value', 'position'
+
+    def __init__(self, value, position):
+        self.value = value
+        self.position = position
+
+
+SCHEMA = """\
+<schema>
+  <multikey name='value' attribute='values'/>
+</schema>
+"""
+
+
+def create(factory, count):
+    url = "file:///etc/app/values.conf"
+    start = time.perf_counter()
+    infos = [factory("x", (lineno, None, url))
+             for lineno in range(1, count + 1)]
+    return infos, time.perf_counter() - start
+
+
+def measure(factory, count):
+    tracemalloc.start()
+    try:
+        infos, elapsed = create(factory, count)
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del infos
+    return size, elapsed
+
+
+def load_peak(count):
+    schema = ZConfig.loadSchemaFile(StringIO(SCHEMA))
+    text = "value x\n" * count
+    tracemalloc.start()
+    try:
+        ZConfig.loadConfigFile(schema, StringIO(text))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    count = int(args[0]) if args else 200000
+    print("%d values:" % count)
+    for name, factory in [("tuples (4.3)", ValueInfo43),
+                          ("lineno, url", ValueInfo)]:
+        size, elapsed = measure(factory, count)
+        print("  %-13s %8.1f MB  %6.1f bytes/value  %.3fs"
+              % (name, size / 1e6, size / count, elapsed))
+    print("  load peak     %8.1f MB" % (load_peak(count) / 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -41,6 +41,7 @@ import ZConfig.loader
 loadConfigFile = ZConfig.loader.loadConfigFile
 loadSchemaFile = ZConfig.loader.loadSchemaFile
 loadConfig = ZConfig.loader.loadConfig
+loadConfigs = ZConfig.loader.loadConfigs
 loadSchema = ZConfig.loader.loadSchema
 
 
@@ -205,6 +206,21 @@ class DataConversionError(ConfigurationError, ValueError):
         return s
 
 
+class MultipleConfigurationErrors(ConfigurationError):
+    """Raised when a configuration loaded with *collect_errors* set
+    contains errors.
+
+    The ``errors`` attribute is the list of the
+    :exc:`ConfigurationError` instances found, in the order in which
+    they were found.  The :func:`str` of the exception lists them all.
+    """
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        ConfigurationError.__init__(
+            self, "\n".join(str(e) for e in self.errors))
+
+
 class SubstitutionSyntaxError(ConfigurationError):
     """Raised when interpolation source text contains syntactical errors."""
 
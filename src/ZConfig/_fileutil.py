@@ -0,0 +1,87 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Helpers for the files written by the caches and snapshots."""
+
+import os
+import stat
+import tempfile
+
+import ZConfig
+
+
+def is_trusted(st):
+    """Return whether a file with the :func:`os.stat` result *st* may
+    be trusted.
+
+    Pickles are loaded only from files owned by the current user,
+    which neither group nor others can write.  Without ownership
+    information (on Windows), files are always trusted.
+    """
+    getuid = getattr(os, "getuid", None)
+    if getuid is None:  # pragma: no cover
+        return True
+    return (st.st_uid == getuid()
+            and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+
+
+def make_directory(directory):
+    """Create *directory* if needed, and check that it may be trusted.
+
+    The directory is created accessible by the current user only.
+    :exc:`ZConfig.ConfigurationError` is raised if it is owned by
+    another user, or if group or others can write to it.
+    """
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not is_trusted(os.stat(directory)):
+        raise ZConfig.ConfigurationError(
+            "refusing to use %r: it must be owned by the current user"
+            " and not writable by group or others" % directory)
+
+
+def read_entry(path, read):
+    """Return ``read(file)`` for the file *path* opened for reading
+    bytes, or ``None``.
+
+    ``None`` is returned if the file does not exist, cannot be
+    trusted (see :func:`is_trusted`), or *read* fails: anything wrong
+    with a cache entry is just a miss.
+    """
+    try:
+        with open(path, "rb") as f:
+            if not is_trusted(os.fstat(f.fileno())):
+                return None
+            return read(f)
+    except Exception:
+        return None
+
+
+def write_atomic(path, data):
+    """Write the bytes *data* to the file *path*, replacing it at once.
+
+    The data is written to a temporary file, readable by the current
+    user only, which is then renamed to *path*; readers see either
+    the old or the new file.  Returns ``False`` if the file could not
+    be written.
+    """
+    fd, tmpname = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmpname, path)
+    except OSError:
+        if os.path.exists(tmpname):
+            os.unlink(tmpname)
+        return False
+    return True
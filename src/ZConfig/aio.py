@@ -0,0 +1,87 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Loading schemas and configurations from :mod:`asyncio` code.
+
+The coroutines in this module accept the same arguments as the
+functions of the same names in the :mod:`ZConfig` package and return
+the same results.  The complete load, including all resource I/O for
+``%include`` and ``%import`` directives and the conversion of the
+values, is run in an executor, so the event loop is never blocked.
+
+Each coroutine accepts an optional *executor*; if it is omitted, the
+default executor of the running loop is used.
+
+"""
+
+import asyncio
+import functools
+
+import ZConfig.loader
+
+
+async def loadSchema(url, executor=None):
+    """Load a schema definition from the URL *url*.
+
+    .. seealso:: :func:`ZConfig.loadSchema`
+    """
+    return await _run(executor, ZConfig.loader.loadSchema, url)
+
+
+async def loadSchemaFile(file, url=None, executor=None):
+    """Load a schema definition from the open file object *file*.
+
+    .. seealso:: :func:`ZConfig.loadSchemaFile`
+    """
+    return await _run(executor, ZConfig.loader.loadSchemaFile, file, url)
+
+
+async def loadConfig(schema, url, overrides=(), collect_errors=False,
+                     environ=None, executor=None):
+    """Load a configuration from a URL or pathname given by *url*.
+
+    The result is a tuple containing the configuration object and a
+    composite handler.
+
+    .. seealso:: :func:`ZConfig.loadConfig`
+    """
+    return await _run(executor, ZConfig.loader.loadConfig,
+                      schema, url, overrides, collect_errors, environ)
+
+
+async def loadConfigFile(schema, file, url=None, overrides=(),
+                         collect_errors=False, environ=None, executor=None):
+    """Load a configuration from the open file object *file*.
+
+    .. seealso:: :func:`ZConfig.loadConfigFile`
+    """
+    return await _run(executor, ZConfig.loader.loadConfigFile,
+                      schema, file, url, overrides, collect_errors, environ)
+
+
+async def load(loader, url, executor=None):
+    """Load *url* using the loader object *loader*.
+
+    This can be used with loaders configured beyond what the other
+    coroutines support, such as a
+    :class:`~ZConfig.loader.ConfigLoader` using *prefetch* or a
+    :attr:`~ZConfig.loader.BaseLoader.resource_cache`.  The result is
+    the result of the loader's :meth:`~ZConfig.loader.BaseLoader.loadURL`
+    method.
+    """
+    return await _run(executor, loader.loadURL, url)
+
+
+def _run(executor, func, *args):
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(executor, functools.partial(func, *args))
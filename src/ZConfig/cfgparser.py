@@ -11,7 +11,14 @@
 # FOR A PARTICULAR PURPOSE.
 #
 ##############################################################################
-"""Configuration parser."""
+"""Configuration parser.
+
+Besides :class:`ZConfigParser`, which drives the loaders, this module
+provides :func:`iterparse`, which reports the structure of a
+configuration resource as a stream of events without building any
+section values.
+
+"""
 
 import re
 
@@ -35,9 +42,20 @@ _section_start_rx = re.compile(r"(?P<type>%s)"
 class ZConfigParser:
 
     __slots__ = ('resource', 'context', 'lineno',
-                 'stack', 'defines', 'file', 'url')
+                 'stack', 'defines', 'file', 'url', 'errors', 'environ')
+
+    #: If true, the resource is read in one go and split into lines in
+    #: bulk, which is faster than reading it line by line.  If
+    #: false, lines are read one at a time with ``readline()``, so the
+    #: memory used does not depend on the size of the resource.
+    bulk_read = True
+
+    # Events queued while handling a line, handed out by _parse()
+    # after the line; only the event parser queues any.
+    pending = None
 
-    def __init__(self, resource, context, defines=None):
+    def __init__(self, resource, context, defines=None, errors=None,
+                 environ=None):
         self.resource = resource
         self.context = context
         self.file = resource.file
@@ -47,6 +65,12 @@ class ZConfigParser:
         if defines is None:
             defines = {}
         self.defines = defines
+        # If not None, a list to which errors are added instead of
+        # being raised; parsing continues with the next line.
+        self.errors = errors
+        # The mapping used for $(NAME) references, or None for
+        # os.environ.
+        self.environ = environ
 
     def nextline(self):
         line = self.file.readline()
@@ -56,34 +80,102 @@ class ZConfigParser:
         return True, None
 
     def parse(self, section):
-        done, line = self.nextline()
-        while not done:
-            if line[:1] in ("", "#"):
-                # blank line or comment
-                pass
+        # No events are queued, so this runs the loop to the end.
+        next(self._parse(section), None)
 
-            elif line[:2] == "</":
-                # section end
-                if line[-1] != ">":
-                    self.error("malformed section end")
-                section = self.end_section(section, line[2:-1])
+    def _parse(self, section):
+        # The parse loop, shared with _EventParser.  This yields the
+        # pending events after each line which queued some; lines
+        # with errors queue none.
+        if self.bulk_read and hasattr(self.file, "read"):
+            count, lines = self._split_lines()
+        else:
+            count, lines = None, self._read_lines()
+        # Key/value lines are by far the most common; handle them here
+        # unless a subclass changes how they are handled.
+        inline = type(self).handle_key_value is _handle_key_value
+        match = _keyvalue_rx.match
+        url = self.url
+        pending = self.pending
+        while True:
+            try:
+                for lineno, line in lines:
+                    if not line:
+                        continue
+                    c = line[0]
+                    if c == "#":
+                        continue
+                    self.lineno = lineno
+                    if c == "<":
+                        if line[1:2] == "/":
+                            # section end
+                            if line[-1] != ">":
+                                self._fail("malformed section end")
+                                line += ">"
+                            section = self.end_section(section, line[2:-1])
+                        else:
+                            # section start
+                            if line[-1] != ">":
+                                self._fail("malformed section start")
+                                line += ">"
+                            section = self.start_section(
+                                section, line[1:-1])
 
-            elif line[0] == "<":
-                # section start
-                if line[-1] != ">":
-                    self.error("malformed section start")
-                section = self.start_section(section, line[1:-1])
+                    elif c == "%":
+                        self.handle_directive(section, line[1:])
 
-            elif line[0] == "%":
-                self.handle_directive(section, line[1:])
+                    elif inline:
+                        m = match(line)
+                        if m is None:
+                            self.error("malformed configuration data")
+                        key, value = m.groups()
+                        if not value:
+                            value = ''
+                        elif "$" in value:
+                            value = self.replace(value)
+                        try:
+                            section.addValue(key, value, (lineno, None, url))
+                        except ZConfig.ConfigurationError as e:
+                            self._locate_error(e)
+                            raise
 
-            else:
-                self.handle_key_value(section, line)
+                    else:
+                        self.handle_key_value(section, line)
 
-            done, line = self.nextline()
+                    if pending:
+                        yield pending
+            except ZConfig.ConfigurationError as e:
+                if self.errors is None:
+                    raise
+                if type(e) is ZConfig.ConfigurationError:
+                    # errors of the matchers have no position
+                    e = ZConfig.ConfigurationSyntaxError(
+                        e.message, self.url, self.lineno)
+                # carry on with the next line
+                self.errors.append(e)
+                continue
+            break
 
+        if count is not None:
+            self.lineno = count
         if self.stack:
-            self.error("unclosed sections not allowed")
+            self._fail("unclosed sections not allowed")
+
+    def _read_lines(self):
+        # Yield (lineno, stripped line), reading one line at a time.
+        done, line = self.nextline()
+        while not done:
+            yield self.lineno, line
+            done, line = self.nextline()
+
+    def _split_lines(self):
+        # Return the number of lines and an iterator over (lineno,
+        # stripped line).  Lines end only at "\n", as for readline()
+        # on the files the loader opens.
+        lines = self.file.read().split("\n")
+        if not lines[-1]:
+            lines.pop()
+        return len(lines), enumerate(map(str.strip, lines), 1)
 
     def start_section(self, section, rest):
         isempty = rest[-1:] == "/"
@@ -93,18 +185,31 @@ class ZConfigParser:
         # parse section start stuff here
         m = _section_start_rx.match(text)
         if not m:
-            self.error("malformed section header")
-        type_, name = m.group('type', 'name')
-        type_ = self._normalize_case(type_)
-        if name:
-            name = self._normalize_case(name)
-        try:
-            newsect = self.context.startSection(section, type_, name)
-        except ZConfig.ConfigurationError as e:
-            self.error(e.message)
+            # Only reached when errors are collected; the contents of
+            # the section are skipped, and any end tag closes it.
+            self._fail("malformed section header")
+            type_, name, newsect = None, None, _skipped
+        else:
+            type_, name = m.group('type', 'name')
+            type_ = self._normalize_case(type_)
+            if name:
+                name = self._normalize_case(name)
+            if section is _skipped:
+                newsect = _skipped
+            else:
+                try:
+                    newsect = self.context.startSection(section, type_, name)
+                except ZConfig.ConfigurationError as e:
+                    self._fail(e.message)
+                    newsect = _skipped
 
         if isempty:
-            self.context.endSection(section, type_, name, newsect)
+            if newsect is _skipped:
+                pass
+            elif self.errors is None:
+                self.context.endSection(section, type_, name, newsect)
+            else:
+                self._end_section(section, type_, name, newsect)
             return section
 
         self.stack.append((type_, name, section))
@@ -112,42 +217,62 @@ class ZConfigParser:
 
     def end_section(self, section, rest):
         if not self.stack:
-            self.error("unexpected section end")
+            self._fail("unexpected section end")
+            return section
         type_ = self._normalize_case(rest.rstrip())
         opentype, name, prevsection = self.stack.pop()
-        if type_ != opentype:
-            self.error("unbalanced section end")
+        if type_ != opentype and opentype is not None:
+            # When errors are collected, the open section is closed
+            # anyway.
+            self._fail("unbalanced section end")
+        if section is not _skipped:
+            self._end_section(prevsection, opentype, name, section)
+        return prevsection
+
+    def _end_section(self, parent, type_, name, section):
+        errors = self.errors
+        start = 0 if errors is None else len(errors)
         try:
-            self.context.endSection(
-                prevsection, type_, name, section)
+            self.context.endSection(parent, type_, name, section)
         except ZConfig.DataConversionError as e:
-            if e.lineno < 0:
-                e.lineno = self.lineno
-            if not e.url:
-                e.url = self.url
-            raise
+            self._locate_error(e)
+            if errors is None:
+                raise
+            errors.append(e)
         except ZConfig.ConfigurationError as e:
-            self.error(e.message)
-        return prevsection
+            self._fail(e.message)
+        if errors:
+            # Errors collected while finishing the section are reported
+            # at its end, as they would have been if raised.
+            for i in range(start, len(errors)):
+                e = errors[i]
+                if type(e) is ZConfig.ConfigurationError:
+                    errors[i] = ZConfig.ConfigurationSyntaxError(
+                        e.message, self.url, self.lineno)
+                elif isinstance(e, ZConfig.DataConversionError):
+                    self._locate_error(e)
 
     def handle_key_value(self, section, rest):
         m = _keyvalue_rx.match(rest)
         if not m:
             self.error("malformed configuration data")
-        key, value = m.group('key', 'value')
+        key, value = m.groups()
         if not value:
             value = ''
-        else:
+        elif "$" in value:
             value = self.replace(value)
         try:
             section.addValue(key, value, (self.lineno, None, self.url))
         except ZConfig.ConfigurationError as e:
-            if getattr(e, 'lineno', -1) < 0:
-                e.lineno = self.lineno
-            if not e.url:
-                e.url = self.url
+            self._locate_error(e)
             raise
 
+    def _locate_error(self, e):
+        if getattr(e, 'lineno', -1) < 0:
+            e.lineno = self.lineno
+        if not e.url:
+            e.url = self.url
+
     def handle_directive(self, section, rest):
         m = _keyvalue_rx.match(rest)
         if not m:
@@ -184,7 +309,7 @@ class ZConfigParser:
 
     def replace(self, text):
         try:
-            return substitute(text, self.defines)
+            return substitute(text, self.defines, self.environ)
         except ZConfig.SubstitutionReplacementError as e:
             e.lineno = self.lineno
             e.url = self.url
@@ -193,7 +318,115 @@ class ZConfigParser:
     def error(self, message):
         raise ZConfig.ConfigurationSyntaxError(message, self.url, self.lineno)
 
+    def _fail(self, message):
+        # Like error(), but only records the error if errors are
+        # collected.
+        if self.errors is None:
+            self.error(message)
+        self.errors.append(
+            ZConfig.ConfigurationSyntaxError(message, self.url, self.lineno))
+
     def _normalize_case(self, string):
         # This method is factored out solely to allow subclasses to modify
         # the behavior of the parser.
         return string.lower()
+
+
+_handle_key_value = ZConfigParser.handle_key_value
+
+
+class _SkippedSection:
+    # Stands in for a section which could not be started while errors
+    # are collected; its contents are ignored.
+
+    def addValue(self, key, value, position):
+        pass
+
+
+_skipped = _SkippedSection()
+
+
+def iterparse(resource, defines=None, errors=None):
+    """Iterate over the events in the configuration *resource*.
+
+    *resource* is a :class:`~ZConfig.loader.Resource`; it is read one
+    line at a time, and neither matchers nor section values are
+    created, so the memory used does not depend on the size of the
+    resource.  Each event is an ``(event, data, position)`` tuple,
+    where *position* is ``(lineno, None, url)`` as for the
+    :class:`~ZConfig.info.ValueInfo` objects of a loaded
+    configuration:
+
+    ``"start_section"``
+        *data* is ``(type, name)``; *name* is ``None`` for an unnamed
+        section.  An empty section (``<type name/>``) is reported as
+        a start event immediately followed by an end event.
+
+    ``"end_section"``
+        *data* is ``(type, name)``, as for the matching start event.
+
+    ``"key"``
+        *data* is ``(key, value)``, with substitutions made in
+        *value*.
+
+    ``"directive"``
+        *data* is ``("define", name, value)``, ``("import",
+        package)`` or ``("include", url)``, where *url* is absolute.
+        Included resources are not read; pass the URL and *defines*
+        to :func:`iterparse` again to follow them.
+
+    Type and section names, and the names of defines, are converted
+    to lower case, as when loading.  *defines* is the mapping of
+    substitution names used (and updated by ``%define``) while
+    parsing.  Syntax errors raise
+    :exc:`~ZConfig.ConfigurationSyntaxError` when they are reached,
+    unless *errors* is a list: then they are appended to it, and
+    parsing continues with the next line, as for the *collect_errors*
+    argument of :func:`ZConfig.loadConfig`.  No events are reported
+    for the contents of a section with a malformed header.
+    """
+    return _EventParser(resource, defines, errors).events()
+
+
+class _EventParser(ZConfigParser):
+    # The parser is its own context and section; the callbacks queue
+    # events, which are handed out after each line.
+
+    __slots__ = ('pending',)
+
+    # Read one line at a time, so events are reported as the resource
+    # is read.
+    bulk_read = False
+
+    def __init__(self, resource, defines=None, errors=None):
+        ZConfigParser.__init__(self, resource, self, defines, errors)
+        self.pending = []
+
+    def events(self):
+        for pending in self._parse(self):
+            yield from pending
+            del pending[:]
+
+    def _event(self, event, data):
+        self.pending.append((event, data, (self.lineno, None, self.url)))
+
+    def startSection(self, parent, type_, name):
+        self._event("start_section", (type_, name))
+        return self
+
+    def endSection(self, parent, type_, name, section):
+        self._event("end_section", (type_, name))
+
+    def addValue(self, key, value, position):
+        self._event("key", (key, value))
+
+    def importSchemaComponent(self, pkgname):
+        self._event("directive", ("import", pkgname))
+
+    def includeConfiguration(self, section, newurl, defines):
+        self._event("directive", ("include", newurl))
+
+    def handle_define(self, section, rest):
+        ZConfigParser.handle_define(self, section, rest)
+        name = self._normalize_case(rest.split(None, 1)[0])
+        self._event("directive", ("define", name, self.defines[name]))
@@ -35,8 +35,8 @@ class ExtendedConfigLoader(ZConfig.loader.ConfigLoader):
     command-line overrides.
     """
 
-    def __init__(self, schema):
-        ZConfig.loader.ConfigLoader.__init__(self, schema)
+    def __init__(self, schema, **kw):
+        ZConfig.loader.ConfigLoader.__init__(self, schema, **kw)
         self.clopts = []   # [(optpath, value, source-position), ...]
 
     def addOption(self, spec, pos=None):
@@ -0,0 +1,276 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Matchers finishing sections with code generated for each section type.
+
+The matchers of :mod:`ZConfig.matcher` interpret the load plan of a
+section type (see :meth:`ZConfig.info.SectionType.getloadplan`) when a
+section is finished.  The matchers defined here instead call a
+function generated from the load plan: straight-line Python code
+checking the number of values of each key and section, filling in
+defaults and calling the datatypes, with everything known from the
+schema (attribute names, messages, whether a key has a default or a
+pre-converted default) written into the code.
+
+The generated functions are compiled when a section of the type is
+first finished and are cached until the section type changes.  Use
+them by passing ``codegen=True`` to :class:`ZConfig.loader.ConfigLoader`.
+"""
+
+import threading
+import weakref
+
+import ZConfig
+from ZConfig.info import KEY
+from ZConfig.info import KEYMAP
+from ZConfig.info import MULTIKEY
+from ZConfig.info import MULTIKEYMAP
+from ZConfig.info import MULTISECTION
+from ZConfig.info import NOT_CONVERTED
+from ZConfig.info import SECTION
+from ZConfig.matcher import BaseMatcher
+from ZConfig.matcher import SchemaMatcher
+from ZConfig.matcher import SectionMatcher
+from ZConfig.matcher import _failed
+
+
+# {section type: (load plan, finish function)}
+_finishers = weakref.WeakKeyDictionary()
+_finishers_lock = threading.Lock()
+
+
+def _convert(fail, datatype, vi):
+    try:
+        return datatype(vi.value)
+    except ValueError as e:
+        fail(ZConfig.DataConversionError(e, vi.value, vi.position))
+        return None
+
+
+def _convert_section(fail, s):
+    if s is None or s is _failed:
+        return s
+    try:
+        return s.getSectionDefinition().datatype(s)
+    except ValueError as e:
+        fail(ZConfig.DataConversionError(e, s, (-1, -1, None)))
+        return s
+
+
+class _Generator:
+
+    def __init__(self, sectiontype):
+        self.sectiontype = sectiontype
+        self.plan = sectiontype.getloadplan()
+        self.lines = []
+        self.namespace = {
+            "ConfigurationError": ZConfig.ConfigurationError,
+            "DataConversionError": ZConfig.DataConversionError,
+            "_convert": _convert,
+            "_convert_section": _convert_section,
+            "_failed": _failed,
+        }
+
+    def emit(self, indent, line):
+        self.lines.append("    " * indent + line)
+
+    def bind(self, prefix, index, value):
+        name = "%s%d" % (prefix, index)
+        self.namespace[name] = value
+        return name
+
+    def constant(self, index, value):
+        # Converted defaults of these types are written as literals.
+        if type(value) in (bool, int, str):
+            return repr(value)
+        return self.bind("converted", index, value)
+
+    def fail(self, indent, message, *args):
+        if args:
+            message = "%r %% (%s,)" % (message, ", ".join(args))
+        else:
+            message = repr(message)
+        self.emit(indent, "fail(ConfigurationError(%s))" % message)
+
+    def generate(self):
+        self.emit(0, "def finish(matcher):")
+        self.emit(1, "values = matcher._values")
+        self.emit(1, "fail = matcher._fail")
+        self.emit(1, "handlers = matcher.handlers")
+        entries = self.plan.entries
+        for index, entry in enumerate(entries):
+            self.check(index, *entry)
+        for index, entry in enumerate(entries):
+            self.construct(index, *entry)
+        self.emit(1, "errors = matcher.errors")
+        self.emit(1, "if errors is not None"
+                  " and len(errors) > matcher._first_error:")
+        self.emit(2, "return _failed")
+        self.emit(1, "return matcher.createValue()")
+        return "\n".join(self.lines) + "\n"
+
+    def check(self, index, kind, attr, info, label, default, converted):
+        # The checks of BaseMatcher.finish(), for one child.
+        a = repr(attr)
+        n = info.minOccurs
+        if kind == KEY or kind == SECTION:
+            if not n and default is None:
+                return
+            self.emit(1, "if values[%s] is None:" % a)
+            if n:
+                self.fail(2, f"no values for {label}; {n} required")
+            if default is not None:
+                self.emit(2, "values[%s] = %s"
+                          % (a, self.bind("default", index, default)))
+            return
+        if kind == KEYMAP or kind == MULTIKEYMAP:
+            if n:
+                self.emit(1, "if len(values[%s]) < %d:" % (a, n))
+                self.fail(2, "no keys defined for the %s key/value map;"
+                          " at least %d must be specified" % (attr, n))
+            if kind == KEYMAP:
+                return
+        if default or n:
+            self.emit(1, "v = values[%s]" % a)
+        if default:
+            self.emit(1, "if not v:")
+            self.emit(2, "v = values[%s] = %s"
+                      % (a, self.bind("default", index, default)))
+        if n:
+            self.emit(1, "if len(v) < %d:" % n)
+            self.fail(2, "not enough values for %s; %%d found, %d required"
+                      % (label.replace("%", "%%"), n), "len(v)")
+
+    def construct(self, index, kind, attr, info, label, default, converted):
+        # The conversions of BaseMatcher.constuct(), for one child.
+        a = repr(attr)
+        self.emit(1, "v = values[%s]" % a)
+        if kind == SECTION or kind == MULTISECTION:
+            if kind == SECTION:
+                self.emit(1, "if v is _failed:")
+                self.emit(2, "v = None")
+                self.emit(1, "elif v is not None:")
+                self.emit(2, "try:")
+                self.emit(3, "v = v.getSectionDefinition().datatype(v)")
+                self.emit(2, "except ValueError as e:")
+                self.emit(3, "fail(DataConversionError("
+                          "e, v, (-1, -1, None)))")
+                self.emit(3, "v = None")
+            else:
+                self.emit(1, "v = [_convert_section(fail, s) for s in v]")
+        else:
+            dt = self.bind("datatype", index, info.datatype)
+            if converted is not NOT_CONVERTED:
+                c = self.constant(index, converted)
+            if kind == KEY:
+                if default is not None and converted is not NOT_CONVERTED:
+                    self.emit(1, "if v is default%d:" % index)
+                    self.emit(2, "v = %s" % c)
+                    self.emit(1, "elif v is not None:")
+                else:
+                    self.emit(1, "if v is not None:")
+                self.emit(2, "try:")
+                self.emit(3, "v = %s(v.value)" % dt)
+                self.emit(2, "except ValueError as e:")
+                self.emit(3, "fail(DataConversionError("
+                          "e, v.value, v.position))")
+                self.emit(3, "v = None")
+            elif kind == MULTIKEY:
+                convert = "[_convert(fail, %s, vi) for vi in v]" % dt
+                if default and converted is not NOT_CONVERTED:
+                    self.emit(1, "if v is default%d:" % index)
+                    self.emit(2, "v = list(%s)" % c)
+                    self.emit(1, "else:")
+                    self.emit(2, "v = " + convert)
+                else:
+                    self.emit(1, "v = " + convert)
+            elif kind == KEYMAP:
+                self.emit(1, "if v:")
+                self.emit(2, "for key, vi in v.items():")
+                self.emit(3, "v[key] = _convert(fail, %s, vi)" % dt)
+                if default and converted is not NOT_CONVERTED:
+                    self.emit(1, "else:")
+                    self.emit(2, "v.update(%s)" % c)
+                elif default:
+                    d = self.bind("default", index, default)
+                    self.emit(1, "else:")
+                    self.emit(2, "for key, vi in %s.items():" % d)
+                    self.emit(3, "v[key] = _convert(fail, %s, vi)" % dt)
+            else:
+                convert = "[_convert(fail, %s, vi) for vi in vis]" % dt
+                if default and converted is not NOT_CONVERTED:
+                    self.emit(1, "if v is default%d:" % index)
+                    self.emit(2, "v = {key: list(vs) for key, vs in"
+                              " %s.items()}" % c)
+                    self.emit(1, "else:")
+                    self.emit(2, "for key, vis in v.items():")
+                    self.emit(3, "v[key] = " + convert)
+                else:
+                    if default:
+                        self.emit(1, "if v is default%d:" % index)
+                        self.emit(2, "v = dict(v)")
+                    self.emit(1, "for key, vis in v.items():")
+                    self.emit(2, "v[key] = " + convert)
+        self.emit(1, "values[%s] = v" % a)
+        if info.handler is not None:
+            self.emit(1, "handlers.append((%s, v))"
+                      % self.bind("handler", index, info.handler))
+
+
+def getsource(sectiontype):
+    """Return the source of the finish function for *sectiontype*."""
+    return _Generator(sectiontype).generate()
+
+
+def getfinisher(sectiontype):
+    """Return the finish function generated for *sectiontype*.
+
+    The function is called with a matcher for a section of the type
+    and does what :meth:`ZConfig.matcher.BaseMatcher.finish` does.
+    """
+    plan = sectiontype.getloadplan()
+    cached = _finishers.get(sectiontype)
+    if cached is not None and cached[0] is plan:
+        return cached[1]
+    generator = _Generator(sectiontype)
+    source = generator.generate()
+    filename = "<ZConfig generated finish for %s>" % (
+        sectiontype.name or "schema")
+    namespace = generator.namespace
+    exec(compile(source, filename, "exec"), namespace)
+    finish = namespace["finish"]
+    with _finishers_lock:
+        _finishers[sectiontype] = generator.plan, finish
+    return finish
+
+
+class GeneratedMatcher(BaseMatcher):
+    """Matcher finishing sections with generated functions."""
+
+    def finish(self):
+        return getfinisher(self.type)(self)
+
+    def createSectionMatcher(self, info, type_, name):
+        matcher = GeneratedSectionMatcher(info, type_, name, self.handlers)
+        matcher.schemaref = self.schemaref
+        if self.slots:
+            matcher.slots = True
+        return matcher
+
+
+class GeneratedSectionMatcher(SectionMatcher, GeneratedMatcher):
+    """Matcher for a section, using generated functions."""
+
+
+class GeneratedSchemaMatcher(SchemaMatcher, GeneratedMatcher):
+    """Matcher for the top-level section, using generated functions."""
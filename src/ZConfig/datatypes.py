@@ -438,6 +438,14 @@ stock_datatypes = {
     "timedelta": timedelta,
 }
 
+# The stock conversions whose result depends only on the value given
+# (and not on the file system, say): default values using them are
+# converted once, not for every section.
+_pure_conversions = frozenset(stock_datatypes[name] for name in (
+    "basic-key", "boolean", "byte-size", "dotted-name", "dotted-suffix",
+    "float", "identifier", "integer", "ipaddr-or-hostname", "null",
+    "port-number", "string", "time-interval", "timedelta"))
+
 
 class Registry:
     """Implementation of a simple type registry.
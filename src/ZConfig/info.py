@@ -14,12 +14,16 @@
 """Objects that can describe a ZConfig schema."""
 
 import copy
+import datetime
+import threading
+import weakref
 from abc import ABC
 from abc import abstractmethod
 from collections import OrderedDict
 from functools import total_ordering
 
 import ZConfig
+from ZConfig.datatypes import _pure_conversions
 
 
 @total_ordering
@@ -37,18 +41,49 @@ class UnboundedThing:
     def __repr__(self):
         return "<Unbounded>"
 
+    def __reduce__(self):
+        # Unpickle to the module-level singleton.
+        return "Unbounded"
+
 
 Unbounded = UnboundedThing()
 
 
 class ValueInfo:
-    __slots__ = 'value', 'position'
+    __slots__ = 'value', '_where', '_url'
 
     def __init__(self, value, position):
         self.value = value
-        # position is (lineno, colno, url)
         self.position = position
 
+    @property
+    def position(self):
+        where = self._where
+        if type(where) is int:
+            return (where, None, self._url)
+        return where
+
+    @position.setter
+    def position(self, position):
+        # position is (lineno, colno, url).  For positions without a
+        # column number (those made by the configuration parser), the
+        # line number and the URL are kept, and the tuple is made when
+        # needed; others are kept as they are.  The values read from a
+        # resource share the parser's URL string.
+        try:
+            lineno, colno, url = position
+        except (TypeError, ValueError):
+            lineno = colno = None
+        if colno is None and type(lineno) is int and lineno >= 0:
+            self._where = lineno
+            self._url = url
+        else:
+            self._where = position
+            self._url = None
+
+    def __reduce__(self):
+        return ValueInfo, (self.value, self.position)
+
     def convert(self, datatype):
         try:
             return datatype(self.value)
@@ -271,11 +306,17 @@ class SectionInfo(BaseInfo):
             return None
 
 
+# {abstract type: section types whose section tables include its
+# subtypes}; see SectionType._getsectiontable()
+_abstract_users = weakref.WeakKeyDictionary()
+_abstract_users_lock = threading.Lock()
+
+
 class AbstractType:
     # This isn't actually "abstract" in the Python ABC sense,
     # it's only abstract from the schema sense. This class is
     # instantiated, and not expected to be subclassed.
-    __slots__ = '_subtypes', 'name', 'description'
+    __slots__ = '_subtypes', 'name', 'description', '__weakref__'
 
     def __init__(self, name):
         self._subtypes = OrderedDict()
@@ -287,6 +328,11 @@ class AbstractType:
 
     def addsubtype(self, type_):
         self._subtypes[type_.name] = type_
+        # the section types dispatching to the subtypes change too
+        with _abstract_users_lock:
+            users = list(_abstract_users.get(self, ()))
+        for sectiontype in users:
+            sectiontype._version += 1
 
     def getsubtype(self, name):
         try:
@@ -307,7 +353,137 @@ class AbstractType:
         return True
 
 
+# The kinds of the children of a section type, as used in load plans.
+KEY = "key"
+MULTIKEY = "multikey"
+KEYMAP = "keymap"              # key '+'
+MULTIKEYMAP = "multikeymap"    # multikey '+'
+SECTION = "section"
+MULTISECTION = "multisection"
+
+# Marks a default value which is not converted by the load plan.
+NOT_CONVERTED = object()
+
+_immutable_types = frozenset([
+    bool, int, float, str, type(None), datetime.timedelta])
+
+
+class LoadPlan:
+    """The decisions made when loading each section of a section type.
+
+    Load plans are computed once for a section type by
+    :meth:`SectionType.getloadplan`, and must not be modified.
+
+    *entries* is a tuple with a tuple ``(kind, attribute, info, label,
+    default, converted)`` for each child of the section type, where
+    *kind* is one of :data:`KEY`, :data:`MULTIKEY`, :data:`KEYMAP`,
+    :data:`MULTIKEYMAP`, :data:`SECTION` and :data:`MULTISECTION`,
+    *label* describes the child in error messages, and *default* is the
+    default value of a key (a ``ValueInfo``, a tuple of them, or a
+    mapping).  *converted* is the default converted by the datatype of
+    the key if that only depends on the default and gives an immutable
+    value, and :data:`NOT_CONVERTED` otherwise.
+    """
+
+    __slots__ = 'entries', '_initial', '_lists', '_dicts'
+
+    def __init__(self, sectiontype):
+        entries = []
+        initial = {}
+        lists = []
+        dicts = []
+        for key, info in sectiontype:
+            attr = info.attribute
+            assert attr is not None
+            initial[attr] = None
+            if info.issection():
+                if key:
+                    label = repr(key)
+                else:
+                    label = "section type " + repr(info.sectiontype.name)
+                if info.ismulti():
+                    kind = MULTISECTION
+                    lists.append(attr)
+                else:
+                    kind = SECTION
+                entries.append((kind, attr, info, label, None, None))
+                continue
+            label = repr(key)
+            default = info.getdefault()
+            if info.name == "+":
+                if info.ismulti():
+                    kind = MULTIKEYMAP
+                    converted = self._convert_map(
+                        default, info.datatype, True)
+                else:
+                    kind = KEYMAP
+                    converted = self._convert_map(
+                        default, info.datatype, False)
+                dicts.append(attr)
+            elif info.ismulti():
+                kind = MULTIKEY
+                lists.append(attr)
+                default = tuple(default)
+                converted = self._convert_all(default, info.datatype)
+            else:
+                kind = KEY
+                converted = NOT_CONVERTED
+                if default is not None:
+                    converted = self._convert_all(
+                        (default,), info.datatype)
+                    if converted is not NOT_CONVERTED:
+                        converted = converted[0]
+            entries.append((kind, attr, info, label, default, converted))
+        self.entries = tuple(entries)
+        self._initial = initial
+        self._lists = tuple(lists)
+        self._dicts = tuple(dicts)
+
+    @staticmethod
+    def _convert_all(vis, datatype):
+        if vis and datatype not in _pure_conversions:
+            return NOT_CONVERTED
+        try:
+            values = tuple(vi.convert(datatype) for vi in vis)
+        except ZConfig.DataConversionError:
+            return NOT_CONVERTED
+        for v in values:
+            if type(v) not in _immutable_types:
+                return NOT_CONVERTED
+        return values
+
+    @classmethod
+    def _convert_map(cls, default, datatype, multi):
+        converted = {}
+        for key, vi in default.items():
+            v = cls._convert_all(vi if multi else (vi,), datatype)
+            if v is NOT_CONVERTED:
+                return v
+            converted[key] = v if multi else v[0]
+        return converted
+
+    def newvalues(self):
+        """Return the initial values of a section, keyed by attribute."""
+        values = self._initial.copy()
+        for attr in self._lists:
+            values[attr] = []
+        for attr in self._dicts:
+            values[attr] = {}
+        return values
+
+
 class SectionType:
+
+    # Incremented whenever a child is added, or a subtype to an
+    # abstract type of a child; the tables below are rebuilt when it
+    # changes.
+    _version = 0
+    # (version, {key: index}, {type name: (index, info, exact)}),
+    # built by _getsectiontable() and never pickled
+    _sectiontable = None
+    # (version, LoadPlan), built by getloadplan() and never pickled
+    _loadplan = None
+
     def __init__(self, name, keytype, valuetype, datatype, registry, types):
         # name      - name of the section, or '*' or '+'
         # datatype  - type for the section itself
@@ -348,6 +524,12 @@ class SectionType:
     def itertypes(self):
         return iter(sorted(self._types.items()))
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_sectiontable', None)
+        state.pop('_loadplan', None)
+        return state
+
     def _add_child(self, key, info):
         # check naming constraints
         assert key or info.attribute
@@ -363,6 +545,7 @@ class SectionType:
         if key:
             self._keymap[key] = info
         self._children.append((key, info))
+        self._version += 1
 
     def addkey(self, keyinfo):
         self._add_child(keyinfo.name, keyinfo)
@@ -380,6 +563,22 @@ class SectionType:
         except KeyError:
             raise ZConfig.ConfigurationError("no key matching " + repr(key))
 
+    def getkeyinfo(self, key):
+        """Return the info object for values given for *key*.
+
+        *key* must already be converted by :attr:`keytype`.  This is
+        the key or section named *key* if there is one, and otherwise
+        the key accepting arbitrary names (``+``), if any.  Returns
+        ``None`` if no child matches.
+        """
+        keymap = self._keymap
+        info = keymap.get(key)
+        if info is None:
+            # Sections accepting any name have no key, so this can
+            # only be a key.
+            info = keymap.get("+")
+        return info
+
     def getrequiredtypes(self):
         d = OrderedDict()
         if self.name:
@@ -395,44 +594,69 @@ class SectionType:
                         stack.append(t)
         return list(d.keys())
 
-    def getsectioninfo(self, type_, name):
-        for key, info in self._children:
-            if key:
-                if key == name:
-                    if not info.issection():
-                        raise ZConfig.ConfigurationError(
-                            "section name %s already in use for key" % key)
-                    st = info.sectiontype
-                    if st.isabstract():
-                        try:
-                            st = st.getsubtype(type_)
-                        except ZConfig.ConfigurationError:  # pragma: no cover
-                            raise ZConfig.ConfigurationError(
-                                "section type %s not allowed for name %s"
-                                % (repr(type_), repr(key)))
-                    if st.name != type_:
-                        raise ZConfig.ConfigurationError(
-                            "name %s must be used for a %s section"
-                            % (repr(name), repr(st.name)))
-                    return info
-            # else must be a sectiontype or an abstracttype:
-            elif info.sectiontype.name == type_:
-                if not (name or info.allowUnnamed()):
-                    raise ZConfig.ConfigurationError(
-                        repr(type_) + " sections must be named")
-                return info
-            elif info.sectiontype.isabstract():
+    def getloadplan(self):
+        """Return the :class:`LoadPlan` for sections of this type."""
+        plan = self._loadplan
+        if plan is None or plan[0] != self._version:
+            plan = self._loadplan = self._version, LoadPlan(self)
+        return plan[1]
+
+    def _getsectiontable(self):
+        # Map the keys of the children to their index, and the section
+        # type names which can match the unnamed sections ("*" or "+")
+        # to the first such child, including the concrete types of
+        # abstract section types.
+        table = self._sectiontable
+        if table is None or table[0] != self._version:
+            version = self._version
+            keys = {}
+            types = {}
+            for index, (key, info) in enumerate(self._children):
+                if key:
+                    keys[key] = index
+                    continue
                 st = info.sectiontype
-                if st.name == type_:  # pragma: no cover
-                    raise ZConfig.ConfigurationError(
-                        "cannot define section with an abstract type")
+                types.setdefault(st.name, (index, info, True))
+                if st.isabstract():
+                    # subtypes may be added later (by %import)
+                    with _abstract_users_lock:
+                        users = _abstract_users.get(st)
+                        if users is None:
+                            users = _abstract_users[st] = weakref.WeakSet()
+                        users.add(self)
+                    for subtype, _ in st:
+                        types.setdefault(subtype, (index, info, False))
+            table = self._sectiontable = version, keys, types
+        return table
+
+    def getsectioninfo(self, type_, name):
+        _, keys, types = self._getsectiontable()
+        match = types.get(type_)
+        index = keys.get(name) if name else None
+        if index is not None and (match is None or index < match[0]):
+            key, info = self._children[index]
+            if not info.issection():
+                raise ZConfig.ConfigurationError(
+                    "section name %s already in use for key" % key)
+            st = info.sectiontype
+            if st.isabstract():
                 try:
                     st = st.getsubtype(type_)
                 except ZConfig.ConfigurationError:  # pragma: no cover
-                    # not this one; maybe a different one
-                    pass
-                else:
-                    return info
+                    raise ZConfig.ConfigurationError(
+                        "section type %s not allowed for name %s"
+                        % (repr(type_), repr(key)))
+            if st.name != type_:
+                raise ZConfig.ConfigurationError(
+                    "name %s must be used for a %s section"
+                    % (repr(name), repr(st.name)))
+            return info
+        if match is not None:
+            _, info, exact = match
+            if exact and not (name or info.allowUnnamed()):
+                raise ZConfig.ConfigurationError(
+                    repr(type_) + " sections must be named")
+            return info
         raise ZConfig.ConfigurationError(
             "no matching section defined for type='%s', name='%s'"
             % (type_, name))
@@ -449,6 +673,13 @@ class SchemaType(SectionType):
         self._components = OrderedDict()
         self.handler = handler
         self.url = url
+        # URLs of all resources which contributed to the schema; this
+        # is filled in by the loader.
+        self.sources = []
+        # Schemas derived from this one by %import, keyed by the
+        # component URLs, with the fingerprints of the component
+        # resources; maintained by the config loader.
+        self._derived = {}
 
     def addtype(self, typeinfo):
         n = typeinfo.name
@@ -498,6 +729,7 @@ class SchemaType(SectionType):
                 info = copy.copy(info)
                 info.computedefault(t.keytype)
                 t._children[i] = (key, info)
+        t._version += 1
         return t
 
     def addComponent(self, name):
@@ -513,6 +745,7 @@ def createDerivedSchema(base):
     new = SchemaType(base.keytype, base.valuetype, base.datatype,
                      base.handler, base.url, base.registry)
     new._components.update(base._components)
+    new.sources[:] = base.sources
     new.description = base.description
     new.example = base.example
     new._children[:] = base._children
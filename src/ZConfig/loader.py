@@ -13,21 +13,33 @@
 ##############################################################################
 """Schema loader utility."""
 
+import codecs
+import concurrent.futures
+import functools
+import hashlib
+import mmap
 import os.path
 import pathlib
 import re
 import sys
+import threading
+import time
+import urllib.parse
 import urllib.request
 from abc import ABC
 from abc import abstractmethod
+from collections import OrderedDict
 from io import StringIO
 
 import ZConfig
 import ZConfig.cfgparser
+import ZConfig.codegen
 import ZConfig.datatypes
 import ZConfig.info
 import ZConfig.matcher
 import ZConfig.schema
+import ZConfig.schemacache
+import ZConfig.substitution
 import ZConfig.url
 
 
@@ -41,9 +53,14 @@ def loadSchema(url):
     :func:`loadConfigFile`. The schema object may be used as many
     times as needed.
 
-    .. seealso:: :class:`~.SchemaLoader`, :meth:`.BaseLoader.loadURL`
+    Schemas are shared within the process: loading the same URL again
+    returns the same schema object, unless one of the resources used
+    to build the schema has changed.
+
+    .. seealso:: :class:`~.SchemaLoader`, :meth:`.BaseLoader.loadURL`,
+       :class:`~ZConfig.schemacache.SchemaRegistry`
     """
-    return SchemaLoader().loadURL(url)
+    return ZConfig.schemacache.shared_schemas.loadURL(url)
 
 
 def loadSchemaFile(file, url=None):
@@ -56,12 +73,17 @@ def loadSchemaFile(file, url=None):
     :func:`loadConfig` or :func:`loadConfigFile`. The schema object
     may be used as many times as needed.
 
-    .. seealso:: :class:`~.SchemaLoader`, :meth:`.BaseLoader.loadFile`
+    Schemas are shared within the process: loading the same schema
+    text for the same URL again returns the same schema object.
+
+    .. seealso:: :class:`~.SchemaLoader`, :meth:`.BaseLoader.loadFile`,
+       :class:`~ZConfig.schemacache.SchemaRegistry`
     """
-    return SchemaLoader().loadFile(file, url)
+    return ZConfig.schemacache.shared_schemas.loadFile(file, url)
 
 
-def loadConfig(schema, url, overrides=()):
+def loadConfig(schema, url, overrides=(), collect_errors=False,
+               environ=None):
     """Load and return a configuration from a URL or pathname given by
     *url*.
 
@@ -79,6 +101,13 @@ def loadConfig(schema, url, overrides=()):
     a string of the form ``optionpath=value``, for example,
     ``some/path/to/key=value``.
 
+    If *collect_errors* is true, loading continues past errors in the
+    configuration, and all the errors found are raised together as
+    :exc:`~ZConfig.MultipleConfigurationErrors`.
+
+    If *environ* is given, it is the mapping ``$(NAME)`` references are
+    looked up in, instead of :data:`os.environ`.
+
     .. seealso::
        :meth:`.ExtendedConfigLoader.addOption`
             For information on the format of value specifiers.
@@ -87,10 +116,13 @@ def loadConfig(schema, url, overrides=()):
        :meth:`.BaseLoader.loadURL`
             For information about the format of *url*
     """
-    return _get_config_loader(schema, overrides).loadURL(url)
+    return _get_config_loader(
+        schema, overrides, collect_errors=collect_errors,
+        environ=environ).loadURL(url)
 
 
-def loadConfigFile(schema, file, url=None, overrides=()):
+def loadConfigFile(schema, file, url=None, overrides=(),
+                   collect_errors=False, environ=None):
     """Load and return a configuration from an opened file object.
 
     If *url* is omitted, one will be computed based on the ``name``
@@ -102,23 +134,112 @@ def loadConfigFile(schema, file, url=None, overrides=()):
     The return value is a tuple containing the configuration object
     and a composite handler that, when called with a name-to-handler
     mapping, calls all the handlers for the configuration. The
-    *overrides* argument is the same as for the :func:`loadConfig`
-    function.
+    *overrides*, *collect_errors* and *environ* arguments are the same
+    as for the :func:`loadConfig` function.
 
     .. seealso:: :class:`~.ConfigLoader`, :meth:`.BaseLoader.loadFile`,
        :meth:`.ExtendedConfigLoader.addOption`
     """
-    return _get_config_loader(schema, overrides).loadFile(file, url)
+    return _get_config_loader(
+        schema, overrides, collect_errors=collect_errors,
+        environ=environ).loadFile(file, url)
+
+
+def loadConfigs(schema, urls, workers=None, use_processes=False):
+    """Load many configurations conforming to *schema*.
+
+    Each URL in *urls* is loaded as by :func:`loadConfig`, using a
+    pool of *workers* threads (or processes if *use_processes* is
+    true).  The text of resources included with ``%include`` is read
+    only once and shared by all the loads performed by a worker pool
+    (or, with processes, by each worker process).
+
+    The return value is a list with a tuple ``(url, result, error)``
+    for each URL, in the order of *urls*.  If the configuration was
+    loaded, *result* is the ``(config, handler)`` tuple returned by
+    :func:`loadConfig` and *error* is ``None``; otherwise *result* is
+    ``None`` and *error* is the exception that was raised.
+
+    When processes are used, *schema* and the results are pickled to
+    pass them between processes; results which cannot be pickled are
+    reported as errors.
+    """
+    urls = list(urls)
+    if use_processes:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=_init_batch_worker, initargs=(schema,))
+        load = _load_in_batch_worker
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(workers)
+        load = functools.partial(_load_in_batch, schema, _IncludeCache())
+    with executor:
+        futures = [executor.submit(load, url) for url in urls]
+        results = []
+        for url, future in zip(urls, futures):
+            try:
+                results.append((url, future.result(), None))
+            except Exception as e:
+                results.append((url, None, e))
+    return results
+
+
+def _load_in_batch(schema, include_cache, url):
+    loader = ConfigLoader(schema)
+    loader._include_cache = include_cache
+    return loader.loadURL(url)
+
+
+_batch_worker_state = None
+
+
+def _init_batch_worker(schema):
+    global _batch_worker_state
+    _batch_worker_state = schema, _IncludeCache()
+
+
+def _load_in_batch_worker(url):
+    schema, include_cache = _batch_worker_state
+    return _load_in_batch(schema, include_cache, url)
 
 
-def _get_config_loader(schema, overrides):
+class _IncludeCache:
+    """Text of included resources, shared by several loaders.
+
+    Each resource is read once, even if several threads include it at
+    the same time.  Resources which could not be read are not cached.
+    """
+
+    def __init__(self):
+        self._texts = {}  # {url: future}
+        self._lock = threading.Lock()
+
+    def open(self, loader, url):
+        with self._lock:
+            future = self._texts.get(url)
+            owner = future is None
+            if owner:
+                future = self._texts[url] = concurrent.futures.Future()
+        if owner:
+            try:
+                with loader.openResource(url) as r:
+                    text = r.read()
+            except BaseException as e:
+                with self._lock:
+                    del self._texts[url]
+                future.set_exception(e)
+                raise
+            future.set_result(text)
+        return loader.createResource(StringIO(future.result()), url)
+
+
+def _get_config_loader(schema, overrides, **kw):
     if overrides:
         from ZConfig import cmdline
-        loader = cmdline.ExtendedConfigLoader(schema)
+        loader = cmdline.ExtendedConfigLoader(schema, **kw)
         for opt in overrides:
             loader.addOption(opt)
     else:
-        loader = ConfigLoader(schema)
+        loader = ConfigLoader(schema, **kw)
     return loader
 
 
@@ -130,8 +251,29 @@ class BaseLoader(ABC):
     for the instance to be used via the public API.
     """
 
+    #: If not ``None``, a :class:`~ZConfig.resourcecache.ResourceCache`
+    #: (or an object with a compatible ``read(url)`` method) used to
+    #: retrieve resources which are neither ``file:`` nor ``package:``
+    #: URLs.  This can be set on a loader, or on a loader class.
+    resource_cache = None
+
+    #: If not ``None``, local files of at least this many bytes are
+    #: read through a memory map instead of a buffered file.
+    mmap_threshold = None
+
+    _recorder = None
+
     def __init__(self):
-        pass
+        self._recorder = _ManifestRecorder()
+
+    @property
+    def manifest(self):
+        """List of :class:`ManifestEntry` objects describing the
+        resources used by the most recent load, in the order they
+        were opened."""
+        if self._recorder is None:
+            return []
+        return list(self._recorder.entries)
 
     def createResource(self, file, url):
         """Returns a resource object for an open file and URL, given as *file*
@@ -186,18 +328,34 @@ class BaseLoader(ABC):
         and the returned resource object is created using
         :meth:`createResource`. If the URL cannot be opened,
         :exc:`~.ConfigurationError` is raised.
+
+        Local ``file:`` URLs are opened directly as text files using
+        the UTF-8 encoding.  Remote resources are retrieved through
+        :attr:`resource_cache` if it is set.
         """
         # ConfigurationError exceptions raised here should be
         # str()able to generate a message for an end user.
-        #
-        # XXX This should be replaced to use a local cache for remote
-        # resources.  The policy needs to support both re-retrieve on
-        # change and provide the cached resource when the remote
-        # resource is not accessible.
         url = str(url)
         if url.startswith("package:"):
             _, package, filename = url.split(":", 2)
             file = openPackageResource(package, filename)
+        elif url[:5].lower() == "file:" and _is_local_file_url(url):
+            path = urllib.request.url2pathname(
+                urllib.parse.urlsplit(url).path)
+            try:
+                file = _open_text_file(path, url, self.mmap_threshold)
+            except OSError as e:
+                self._raise_open_error(url, str(e))
+        elif (self.resource_cache is not None
+              and url[:5].lower() != "file:"):
+            try:
+                data = self.resource_cache.read(url)
+            except urllib.request.URLError as e:
+                self._raise_open_error(url, e.reason)
+            except OSError as e:
+                self._raise_open_error(url, str(e))
+            self._remember_content(url, data)
+            file = StringIO(data.decode('utf-8'))
         else:
             try:
                 file = urllib.request.urlopen(url)
@@ -213,12 +371,20 @@ class BaseLoader(ABC):
             finally:
                 file.close()
             if isinstance(data, bytes):
+                self._remember_content(url, data)
                 # Be sure to specify an (useful) encoding so we don't get
                 # the system default, typically ascii.
                 data = data.decode('utf-8')
             file = StringIO(data)
         return self.createResource(file, url)
 
+    def _remember_content(self, url, data):
+        # Remote resources are fingerprinted from the data already
+        # read rather than by fetching them again.
+        if self._recorder is not None:
+            self._recorder.fingerprints[url] = (
+                "sha1", hashlib.sha1(data).hexdigest(), len(data))
+
     def _raise_open_error(self, url, message):
         if url[:7].lower() == "file://":
             what = "file"
@@ -317,6 +483,166 @@ def openPackageResource(package, path):
                                           path=pkg.__path__)
 
 
+def _is_local_file_url(url):
+    return urllib.parse.urlsplit(url).netloc in ("", "localhost")
+
+
+def _open_text_file(path, url, mmap_threshold=None):
+    # The file is opened by descriptor so that it has no name; the
+    # XML parser would otherwise report positions using the path
+    # instead of the URL of the resource.  Line endings are left
+    # untouched, matching the decoded text previously returned by
+    # urlopen().
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        if mmap_threshold is not None:
+            size = os.fstat(fd).st_size
+            if size and size >= mmap_threshold:
+                return _MappedTextFile(fd, path, url)
+        return _TextFile(open(fd, encoding="utf-8", newline="\n"),
+                         path, url)
+    except BaseException:
+        os.close(fd)
+        raise
+
+
+class _TextFile:
+    """Read-only text file of a local resource.
+
+    Errors reading or decoding the file are raised as
+    :exc:`~.ConfigurationError` naming the file and the URL of the
+    resource, since the file itself has no name.
+    """
+
+    def __init__(self, file, path, url):
+        self._file = file
+        self._path = path
+        self._url = url
+
+    def read(self, size=-1):
+        try:
+            return self._read(size)
+        except (OSError, UnicodeDecodeError) as e:
+            self._raise_error(e)
+
+    def readline(self):
+        try:
+            return self._readline()
+        except (OSError, UnicodeDecodeError) as e:
+            self._raise_error(e)
+
+    def _read(self, size):
+        return self._file.read(size)
+
+    def _readline(self):
+        return self._file.readline()
+
+    def _raise_error(self, e):
+        raise ZConfig.ConfigurationError(
+            f"error reading file {self._path}: {e}", self._url) from e
+
+    def __iter__(self):
+        return iter(self.readline, "")
+
+    def close(self):
+        self._file.close()
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, v, tb):
+        self.close()
+
+
+class _MappedTextFile(_TextFile):
+    """Read-only text file backed by a memory map of a UTF-8 file."""
+
+    def __init__(self, fd, path, url):
+        _TextFile.__init__(
+            self, mmap.mmap(fd, 0, access=mmap.ACCESS_READ), path, url)
+        os.close(fd)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def _read(self, size):
+        if size is None or size < 0:
+            data = self._file.read()
+            return self._decoder.decode(data, True)
+        data = self._file.read(size)
+        return self._decoder.decode(data, len(data) < size)
+
+    def _readline(self):
+        data = self._file.readline()
+        return self._decoder.decode(data, not data)
+
+
+def resourceFingerprint(url):
+    """Return a fingerprint for the resource identified by *url*.
+
+    For resources that live in the local filesystem (``file:`` URLs
+    and ``package:`` URLs for packages which are not in a zip file),
+    the fingerprint is based on the modification time and size of the
+    file, so the resource is not read.  Other resources are read and
+    the fingerprint is based on a hash of the content.  The result is
+    a tuple which can be compared to a fingerprint computed earlier.
+
+    If the resource cannot be opened, :exc:`~.ConfigurationError`
+    is raised.
+    """
+    path = _local_path(url)
+    if path is not None:
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            raise ZConfig.ConfigurationError(
+                f"error opening file {path}: {e}", url)
+        return ("stat", st.st_mtime_ns, st.st_size)
+    data = _read_resource(url)
+    return ("sha1", hashlib.sha1(data).hexdigest(), len(data))
+
+
+def _local_path(url):
+    # Return the filesystem path for url, or None if the resource is
+    # not a plain file.
+    if url.startswith("package:"):
+        _, package, filename = url.split(":", 2)
+        try:
+            __import__(package)
+        except ImportError:
+            return None
+        relpath = os.path.join(*filename.split("/"))
+        for dirname in getattr(sys.modules[package], "__path__", ()):
+            path = os.path.join(dirname, relpath)
+            if os.path.isfile(path):
+                return path
+        return None
+    if url[:5].lower() == "file:":
+        return urllib.request.url2pathname(
+            urllib.parse.urlsplit(url).path)
+    return None
+
+
+def _read_resource(url):
+    # Return the content of the resource as bytes.
+    if url.startswith("package:"):
+        _, package, filename = url.split(":", 2)
+        data = openPackageResource(package, filename).read()
+    else:
+        try:
+            with urllib.request.urlopen(url) as f:
+                data = f.read()
+        except (OSError, ValueError) as e:
+            # ValueError: not a URL urlopen() knows how to open
+            raise ZConfig.ConfigurationError(
+                f"error opening URL {url}: {e}", url)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return data
+
+
 def _url_from_file(file_or_path):
     name = getattr(file_or_path, "name", None)
     if name and name[0] != "<" and name[-1] != ">":
@@ -330,23 +656,56 @@ class SchemaLoader(BaseLoader):
     data type registry. If *registry* is provided and not ``None``, it
     will be used, otherwise an instance of
     :class:`ZConfig.datatypes.Registry` will be used.
+
+    If *cache* is provided and not ``None``, it should be a
+    :class:`ZConfig.schemacache.SchemaCache`; schemas loaded from a URL
+    are then stored in the cache, and later loads of the same URL
+    are served from the cache as long as none of the resources the
+    schema was built from have changed.
     """
 
-    def __init__(self, registry=None):
+    def __init__(self, registry=None, cache=None):
         if registry is None:
             registry = ZConfig.datatypes.Registry()
         BaseLoader.__init__(self)
         self.registry = registry
+        self.cache = cache
         self._cache = {}
+        # One list of opened URLs for each schema being parsed.
+        self._sources = []
 
     def loadResource(self, resource):
         if resource.url and resource.url in self._cache:
             schema = self._cache[resource.url]
         else:
-            schema = ZConfig.schema.parseResource(resource, self)
+            schema = None
+            if self.cache is not None and resource.url:
+                schema = self.cache.load(resource.url, self.registry)
+            if schema is None:
+                self._sources.append([])
+                try:
+                    schema = ZConfig.schema.parseResource(resource, self)
+                finally:
+                    sources = self._sources.pop()
+                if resource.url:
+                    sources.insert(0, resource.url)
+                schema.sources[:] = _unique(sources)
+                if self.cache is not None and resource.url:
+                    self.cache.store(schema)
             self._cache[resource.url] = schema
+        if self._sources:
+            self._sources[-1].extend(schema.sources)
         return schema
 
+    def openResource(self, url):
+        if self._sources:
+            self._sources[-1].append(str(url))
+        if self._recorder is None:
+            return BaseLoader.openResource(self, url)
+        url = str(url)
+        kind = "component" if url.startswith("package:") else "schema"
+        return self._recorder.open(self, url, kind, BaseLoader.openResource)
+
     # schema parser support API
 
     def schemaComponentSource(self, package, filename):
@@ -374,6 +733,25 @@ class SchemaLoader(BaseLoader):
         return f"package:{package}:{filename}"
 
 
+_derived_lock = threading.Lock()
+
+
+def _unique(seq):
+    return list(OrderedDict.fromkeys(seq))
+
+
+def _import_components(schema, imports):
+    # Return *schema* extended by the components with the URLs
+    # *imports*, as if imported in that order with %import.
+    if not imports:
+        return schema
+    loader = ConfigLoader(schema)
+    loader._start_private_schema()
+    for url in imports:
+        loader._import_component(url)
+    return loader.schema
+
+
 class ConfigLoader(BaseLoader):
     """Loader for configuration files.
 
@@ -382,24 +760,236 @@ class ConfigLoader(BaseLoader):
     return a tuple consisting of the configuration object and a
     composite handler.
 
+    If *prefetch* is greater than zero, the targets of ``%include``
+    directives are retrieved in advance by that many threads while the
+    configuration is parsed.  Only targets which can be determined
+    from the text of the including resource (and ``%define``
+    directives preceding the ``%include``) are retrieved early; the
+    configuration is still parsed sequentially, so the result and any
+    errors are the same as without prefetching.
+
+    After a load, :attr:`sources` is the list of URLs of the
+    configuration resources that were read: the URL of the loaded
+    resource (``None`` if it has none), followed by the targets of
+    ``%include`` directives.  Schema components imported with
+    ``%import`` are recorded in the ``sources`` of :attr:`schema`.
+
+    If *reloadable* is true, the loader keeps the text of the
+    resources it read and the sections it converted, so that
+    :meth:`reload` can load the configuration again without reading
+    unchanged resources or converting unchanged sections.
+
+    If *collect_errors* is true, loading does not stop at the first
+    error found in the configuration.  Syntax errors, unknown keys and
+    section types, missing or repeated values, and data conversion
+    errors are collected, with their positions, and raised together as
+    :exc:`~ZConfig.MultipleConfigurationErrors` once the whole
+    configuration has been read.  Sections which cannot be started
+    (such as sections of an unknown type) are skipped, and the
+    datatypes of sections with errors are not called.
+
+    ``$(NAME)`` references are looked up in *environ* if it is given,
+    and otherwise in a copy of :data:`os.environ` taken once per load.
+    After a load, :attr:`environ_used` maps the name of each variable
+    looked up to its value, or to ``None`` if it was not set.
+
+    If *codegen* is true, sections are finished by functions generated
+    for each section type by :mod:`ZConfig.codegen` instead of by
+    interpreting the schema; the result is the same.
+
+    If *lazy* is true, the values of keys are converted by their
+    datatypes when the application first uses them rather than while
+    the configuration is loaded, so that the cost of conversions (and
+    conversion errors) is limited to the values used.  Sections are
+    then :class:`~ZConfig.matcher.LazySectionValue` objects, whose
+    :meth:`~ZConfig.matcher.LazySectionValue.validate_all` method
+    converts all values.  Values of keys with a handler are converted
+    while loading, and *lazy* is ignored if *collect_errors* or
+    *codegen* is true.
+
+    If *slots* is true, sections are instances of classes made for
+    each section type by :func:`ZConfig.matcher.getvalueclass`, which
+    keep the values in slots instead of in an instance dictionary and
+    so use less memory.  *slots* is ignored if *lazy* is used.
+
     """
 
-    def __init__(self, schema):
+    _environment = None
+
+    def __init__(self, schema, prefetch=0, reloadable=False,
+                 collect_errors=False, environ=None, codegen=False,
+                 lazy=False, slots=False):
         if schema.isabstract():
             raise ZConfig.SchemaError(
                 "cannot check a configuration an abstract type")
         BaseLoader.__init__(self)
         self.schema = schema
+        self.prefetch = prefetch
+        self.reloadable = reloadable
+        self.collect_errors = collect_errors
+        self.environ = environ
+        self.codegen = codegen
+        self.lazy = lazy
+        self.slots = slots
+        self.environ_used = {}
+        self._errors = None
         self._private_schema = False
+        self._components = ()  # [(url, fingerprint)] of %import sources
+        self._prefetcher = None
+        self._include_cache = None
+        self.sources = []
+        # State kept for reload(); see _record() and endSection().
+        self._result = None
+        self._texts = {}      # {url: (fingerprint, text)}
+        self._sections = {}   # {raw section key: [(sectvalue, handlers)]}
+        self._unchanged = None
 
     def loadResource(self, resource):
+        if self._recorder is None:
+            return self._load_resource(resource)
+        token = self._recorder.begin(resource.url, "config")
+        try:
+            return self._load_resource(resource)
+        finally:
+            self._recorder.end(token)
+
+    def _load_resource(self, resource):
+        if self._private_schema:
+            # start from the original schema; %import extends it again
+            self.schema = self._base_schema
+            self._imports = ()
+            self._components = ()
+        self.sources = [resource.url]
+        self._environment = _Environment(self.environ)
+        self.environ_used = self._environment.used
+        if self.reloadable:
+            self._new_texts = {}
+            self._new_sections = {}
+            self._converted = []
+            resource = self._record(resource.url, lambda: resource)
         sm = self.createSchemaMatcher()
-        self._parse_resource(sm, resource)
-        result = sm.finish(), CompositeHandler(sm.handlers, self.schema)
+        self._errors = [] if self.collect_errors else None
+        if self._errors is not None:
+            sm._collect(self._errors)
+        if self.prefetch > 0 and self._unchanged is None:
+            with _IncludePrefetcher(self, self.prefetch) as prefetcher:
+                self._prefetcher = prefetcher
+                try:
+                    resource = prefetcher.start(resource)
+                    self._parse_resource(sm, resource)
+                finally:
+                    self._prefetcher = None
+        else:
+            self._parse_resource(sm, resource)
+        if self._private_schema:
+            # sections are pickled referring to the imported components
+            sm.schemaref.imports = self._imports
+        config = sm.finish()
+        if self._errors:
+            raise ZConfig.MultipleConfigurationErrors(self._errors)
+        result = config, CompositeHandler(sm.handlers, self.schema)
+        if self.reloadable:
+            self._texts = self._new_texts
+            self._sections = self._new_sections
+            self._result = result
         return result
 
+    def reload(self):
+        """Load the configuration most recently loaded by URL again.
+
+        The loader must have been created with *reloadable* set.
+        Resources which have not changed since the previous load are
+        not read again, and sections whose keys, values and
+        subsections are unchanged are not converted again: the
+        section values from the previous load are used.
+
+        Returns a tuple ``(config, handler, changes)``, where *changes*
+        is a :class:`ReloadChanges` object.  If no resource changed,
+        the configuration object and handler of the previous load are
+        returned.
+        """
+        if not self.reloadable or self._result is None:
+            raise ValueError("reload() requires a reloadable loader"
+                             " which has loaded a configuration")
+        url = self.sources[0]
+        if url is None:
+            raise ValueError("reload() requires a configuration"
+                             " loaded from a URL")
+        unchanged = {}
+        changed = []
+        for source, entry in self._texts.items():
+            if self._fingerprint(source) == entry[0]:
+                unchanged[source] = entry
+            else:
+                changed.append(source)
+        changed.extend(self._changed(self._components))
+        environ = self._environ_changed()
+        if not changed and not environ:
+            return self._result + (ReloadChanges(),)
+
+        old_sources = set(self._texts)
+        sources = self.sources
+        self._unchanged = unchanged
+        try:
+            if url in unchanged:
+                resource = self.createResource(
+                    StringIO(unchanged[url][1]), url)
+                result = self.loadResource(resource)
+            else:
+                result = self.loadURL(url)
+        except BaseException:
+            self.sources = sources
+            raise
+        finally:
+            self._unchanged = None
+        changed.extend(source for source in self._texts
+                       if source not in old_sources)
+        removed = [source for source in old_sources
+                   if source not in self._texts]
+        changes = ReloadChanges(changed, removed, self._converted, environ)
+        return result + (changes,)
+
+    def _record(self, url, open_resource):
+        # Keep the text and fingerprint of a resource for reload().
+        entry = self._new_texts.get(url)
+        if entry is None and self._unchanged is not None:
+            entry = self._unchanged.get(url)
+        if entry is None:
+            fingerprint = self._fingerprint(url) if url else None
+            with open_resource() as r:
+                entry = fingerprint, r.read()
+        if url is not None:
+            self._new_texts[url] = entry
+        return self.createResource(StringIO(entry[1]), url)
+
+    def _changed(self, fingerprints):
+        # URLs of the resources whose fingerprint is not the recorded one.
+        return [url for url, fingerprint in fingerprints
+                if self._fingerprint(url) != fingerprint]
+
+    def _environ_changed(self):
+        # Names of the environment variables used by the previous load
+        # which have changed since.
+        environ = _Environment(self.environ)
+        return [name for name, value in self.environ_used.items()
+                if environ.get(name) != value]
+
+    def _fingerprint(self, url):
+        try:
+            return resourceFingerprint(url)
+        except ZConfig.ConfigurationError:
+            return None
+
     def createSchemaMatcher(self):
-        return ZConfig.matcher.SchemaMatcher(self.schema)
+        if self.codegen:
+            sm = ZConfig.codegen.GeneratedSchemaMatcher(self.schema)
+        elif self.lazy and not self.collect_errors:
+            return ZConfig.matcher.LazySchemaMatcher(self.schema)
+        else:
+            sm = ZConfig.matcher.SchemaMatcher(self.schema)
+        if self.slots:
+            sm.slots = True
+        return sm
 
     # config parser support API
 
@@ -409,39 +999,379 @@ class ConfigLoader(BaseLoader):
             raise ZConfig.ConfigurationError(
                 "concrete sections cannot match abstract section types;"
                 " found abstract type " + repr(type_))
-        return parent.createChildMatcher(t, name)
+        matcher = parent.createChildMatcher(t, name)
+        if self._errors is not None:
+            matcher._collect(self._errors)
+        return matcher
 
     def endSection(self, parent, type_, name, matcher):
-        sectvalue = matcher.finish()
+        if self.reloadable:
+            sectvalue = self._finish_section(matcher)
+        else:
+            sectvalue = matcher.finish()
         parent.addSection(type_, name, sectvalue)
 
+    def _finish_section(self, matcher):
+        # Re-use the section value of the previous load if the section
+        # has the same raw input; each value is used at most once.
+        key = (matcher.info, matcher.type, matcher.name,
+               _freeze(matcher._values))
+        previous = self._sections.get(key)
+        if previous:
+            sectvalue, handlers = entry = previous.pop(0)
+            matcher.handlers.extend(handlers)
+        else:
+            start = len(matcher.handlers)
+            sectvalue = matcher.finish()
+            entry = sectvalue, matcher.handlers[start:]
+            self._converted.append(sectvalue)
+        self._new_sections.setdefault(key, []).append(entry)
+        return sectvalue
+
     def importSchemaComponent(self, pkgname):
-        schema = self.schema
+        self._start_private_schema()
+        url = self._loader.schemaComponentSource(pkgname, '')
+        self._import_component(url)
+
+    def _start_private_schema(self):
         if not self._private_schema:
             # replace the schema with an extended schema on the first %import
             self._loader = SchemaLoader(self.schema.registry)
-            schema = ZConfig.info.createDerivedSchema(self.schema)
+            self._loader._recorder = self._recorder
+            self._base_schema = self.schema
+            self._imports = ()
             self._private_schema = True
-            self.schema = schema
-        url = self._loader.schemaComponentSource(pkgname, '')
-        if schema.hasComponent(url):
+
+    def _import_component(self, url):
+        if self.schema.hasComponent(url):
             return
-        schema.addComponent(url)
-        with self.openResource(url) as resource:
-            ZConfig.schema.parseComponent(resource, self._loader, schema)
+        # Extended schemas are shared by all loads which import the
+        # same components, in the same order, on top of the same
+        # schema, for as long as the components are unchanged.
+        imports = self._imports + (url,)
+        derived = self._base_schema._derived
+        with _derived_lock:
+            entry = derived.get(imports)
+        if entry is not None and not self._changed(entry[1]):
+            schema, components = entry
+            if self._recorder is not None:
+                # Nothing is read; record what the component consists of.
+                for source in schema.sources:
+                    if source not in self.schema.sources:
+                        self._recorder.add(source, "component")
+        else:
+            schema = ZConfig.info.createDerivedSchema(self.schema)
+            schema.addComponent(url)
+            self._loader._sources.append([url])
+            try:
+                with self._open_component(url) as resource:
+                    ZConfig.schema.parseComponent(
+                        resource, self._loader, schema)
+            finally:
+                sources = self._loader._sources.pop()
+            schema.sources[:] = _unique(schema.sources + sources)
+            base = self._base_schema.sources
+            components = [(source, self._fingerprint(source))
+                          for source in schema.sources
+                          if source not in base]
+            with _derived_lock:
+                current = derived.get(imports)
+                if current is entry:
+                    derived[imports] = schema, components
+                else:
+                    # another load built it first; share that one
+                    schema, components = current
+        self.schema = schema
+        self._imports = imports
+        self._components = components
 
     def includeConfiguration(self, section, url, defines):
         url = self.normalizeURL(url)
-        with self.openResource(url) as r:
-            self._parse_resource(section, r, defines)
+        self.sources.append(url)
+        if self._recorder is not None:
+            token = self._recorder.begin(url, "include")
+        try:
+            if self.reloadable:
+                r = self._record(url, lambda: self._open_include(url))
+            else:
+                r = self._open_include(url)
+            with r:
+                self._parse_resource(section, r, defines)
+        finally:
+            if self._recorder is not None:
+                self._recorder.end(token)
+
+    def _open_component(self, url):
+        if self._recorder is None:
+            return self.openResource(url)
+        return self._recorder.open(self, url, "component",
+                                   ConfigLoader.openResource)
+
+    def _open_include(self, url):
+        if self._prefetcher is not None:
+            return self._prefetcher.get(url)
+        elif self._include_cache is not None:
+            return self._include_cache.open(self, url)
+        else:
+            return self.openResource(url)
 
     # internal helper
 
     def _parse_resource(self, matcher, resource, defines=None):
-        parser = ZConfig.cfgparser.ZConfigParser(resource, self, defines)
+        parser = ZConfig.cfgparser.ZConfigParser(
+            resource, self, defines, self._errors, self._environment)
         parser.parse(matcher)
 
 
+class ManifestEntry:
+    """A resource used by a load.
+
+    :attr:`url` is the URL of the resource and :attr:`kind` one of
+    ``"config"`` (the loaded configuration), ``"include"`` (a
+    ``%include`` target), ``"component"`` (a schema component, loaded
+    by ``%import`` or a schema's ``<import package=...>``) or
+    ``"schema"`` (a schema, or a schema used by ``<import src=...>``
+    or ``extends``).
+
+    :attr:`fingerprint` is the value :func:`resourceFingerprint` had
+    for the resource when it was used, and :attr:`size` its size in
+    bytes; both are ``None`` if not known.  :attr:`elapsed` is the
+    time in seconds spent opening, reading and parsing the resource,
+    excluding the time spent on resources it refers to.
+    """
+
+    def __init__(self, url, kind, fingerprint=None, elapsed=0.0):
+        self.url = url
+        self.kind = kind
+        self.fingerprint = fingerprint
+        self.size = fingerprint[2] if fingerprint else None
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return "<{} {} {!r} size={} elapsed={:.6f}>".format(
+            self.__class__.__name__, self.kind, self.url, self.size,
+            self.elapsed)
+
+
+class _ManifestRecorder:
+    # Collects the manifest entries of a load; shared by a
+    # ConfigLoader and the SchemaLoader it uses for %import.
+
+    def __init__(self):
+        self.entries = []
+        self.fingerprints = {}  # {url: fingerprint of data read}
+        self._stack = []        # [[index, start, nested time]]
+
+    def begin(self, url, kind):
+        if not self._stack:
+            # a new load
+            self.entries = []
+            self.fingerprints = {}
+        self.entries.append(ManifestEntry(url, kind))
+        token = [len(self.entries) - 1, time.perf_counter(), 0.0]
+        self._stack.append(token)
+        return token
+
+    def end(self, token):
+        if token not in self._stack:
+            return
+        while self._stack.pop() is not token:
+            pass
+        elapsed = time.perf_counter() - token[1]
+        if self._stack:
+            self._stack[-1][2] += elapsed
+        entry = self.entries[token[0]]
+        entry.elapsed = elapsed - token[2]
+        entry.fingerprint = self._fingerprint(entry.url)
+        entry.size = entry.fingerprint[2] if entry.fingerprint else None
+
+    def add(self, url, kind):
+        self.entries.append(ManifestEntry(url, kind, self._fingerprint(url)))
+
+    def open(self, loader, url, kind, open_resource):
+        token = self.begin(url, kind)
+        try:
+            resource = open_resource(loader, url)
+        except BaseException:
+            self.end(token)
+            raise
+        return _RecordedResource(resource, self, token)
+
+    def _fingerprint(self, url):
+        if url is None:
+            return None
+        fingerprint = self.fingerprints.get(url)
+        if fingerprint is None and _local_path(url) is not None:
+            try:
+                fingerprint = resourceFingerprint(url)
+            except ZConfig.ConfigurationError:
+                pass
+        return fingerprint
+
+
+class _RecordedResource:
+    # Resource wrapper which completes a manifest entry when closed.
+
+    def __init__(self, resource, recorder, token):
+        self._resource = resource
+        self._recorder = recorder
+        self._token = token
+
+    def close(self):
+        self._resource.close()
+        self._recorder.end(self._token)
+
+    def __getattr__(self, name):
+        return getattr(self._resource, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, v, tb):
+        self.close()
+
+
+def _freeze(value):
+    # Hashable form of the raw values collected by a matcher.
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, ZConfig.info.ValueInfo):
+        return value.value
+    return value
+
+
+class ReloadChanges:
+    """Description of the differences found by
+    :meth:`ConfigLoader.reload`.
+
+    :attr:`resources` lists the URLs of the resources which changed or
+    were read for the first time, and :attr:`removed` those which are
+    no longer used.  :attr:`sections` lists the section values which
+    were converted again; all other sections of the new configuration
+    are the section values of the previous load.  :attr:`environ` lists
+    the names of the environment variables used by the previous load
+    whose values changed.  An instance is true if any resource or
+    environment variable changed.
+    """
+
+    def __init__(self, resources=(), removed=(), sections=(), environ=()):
+        self.resources = list(resources)
+        self.removed = list(removed)
+        self.sections = list(sections)
+        self.environ = list(environ)
+
+    def __bool__(self):
+        return bool(self.resources or self.removed or self.environ)
+
+    def __repr__(self):
+        return ("<{} resources={!r} removed={!r} environ={!r}"
+                " sections={}>".format(
+                    self.__class__.__name__, self.resources, self.removed,
+                    self.environ, len(self.sections)))
+
+
+class _IncludePrefetcher:
+    """Retrieve the targets of ``%include`` directives in the background.
+
+    Resources are scanned for ``%include`` directives as they are
+    retrieved; targets which can be computed without knowing the
+    result of the parse are submitted to a thread pool.
+    """
+
+    def __init__(self, loader, workers):
+        self._loader = loader
+        self._executor = concurrent.futures.ThreadPoolExecutor(workers)
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, v, tb):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def start(self, resource):
+        # Scan the top-level resource; the parse uses a copy of its text.
+        text = resource.read()
+        self._scan(text, resource.url, {})
+        return self._loader.createResource(StringIO(text), resource.url)
+
+    def get(self, url):
+        """Return a resource for *url*, using a prefetched copy if
+        there is one."""
+        with self._lock:
+            future = self._futures.get(url)
+        if future is None:
+            return self._loader.openResource(url)
+        # Errors are raised here, where the sequential parse would
+        # have raised them.
+        text = future.result()
+        return self._loader.createResource(StringIO(text), url)
+
+    def _fetch(self, url, defines):
+        with self._loader.openResource(url) as r:
+            text = r.read()
+        self._scan(text, url, defines)
+        return text
+
+    def _scan(self, text, url, defines):
+        defines = dict(defines)
+        for line in text.split("\n"):
+            line = line.strip()
+            if line[:1] != "%":
+                continue
+            m = ZConfig.cfgparser._keyvalue_rx.match(line[1:])
+            if m is None or not m.group("value"):
+                continue
+            name, arg = m.group("key", "value")
+            try:
+                if name == "define":
+                    parts = arg.split(None, 1)
+                    value = parts[1] if len(parts) == 2 else ""
+                    defines.setdefault(
+                        parts[0].lower(),
+                        ZConfig.substitution.substitute(
+                            value, defines, self._loader._environment))
+                elif name == "include":
+                    target = ZConfig.substitution.substitute(
+                        arg.strip(), defines, self._loader._environment)
+                    target = ZConfig.url.urljoin(url, target)
+                    target = self._loader.normalizeURL(target)
+                    self._submit(target, defines)
+            except (ZConfig.ConfigurationError, ValueError):
+                # Can't be determined now; leave it to the parser.
+                continue
+
+    def _submit(self, url, defines):
+        with self._lock:
+            if url not in self._futures:
+                try:
+                    self._futures[url] = self._executor.submit(
+                        self._fetch, url, defines)
+                except RuntimeError:
+                    # The load has finished; nothing more to fetch.
+                    pass
+
+
+class _Environment:
+    # The environment seen by one load: the mapping given to the
+    # loader, or a copy of os.environ taken when first needed.  Every
+    # variable looked up is recorded in used.
+
+    def __init__(self, mapping=None):
+        self._mapping = mapping
+        self.used = {}
+
+    def get(self, name, default=None):
+        if self._mapping is None:
+            self._mapping = dict(os.environ)
+        value = self._mapping.get(name)
+        self.used[name] = value
+        return default if value is None else value
+
+
 class CompositeHandler:
 
     def __init__(self, handlers, schema):
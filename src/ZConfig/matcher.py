@@ -13,32 +13,135 @@
 ##############################################################################
 """Utility that manages the binding of configuration data to a section."""
 
+import threading
+import weakref
+
 import ZConfig
+import ZConfig.loader
+import ZConfig.schemacache
+from ZConfig.info import KEY
+from ZConfig.info import KEYMAP
+from ZConfig.info import MULTIKEY
+from ZConfig.info import MULTIKEYMAP
+from ZConfig.info import MULTISECTION
+from ZConfig.info import NOT_CONVERTED
+from ZConfig.info import SECTION
+from ZConfig.info import LoadPlan
 from ZConfig.info import ValueInfo
 
 
+# Returned by finish() in place of a section value when errors are
+# collected and the section (or one of its subsections) has errors; the
+# datatype of the section is not called.
+_failed = object()
+
+
+def _convert_value(entry, v, convert):
+    # Convert the value *v* of a key of a section, described by the
+    # load plan entry *entry*, using *convert* for each ValueInfo.
+    kind, _, ci, _, default, converted = entry
+    if kind == KEY:
+        if v is default and converted is not NOT_CONVERTED:
+            return converted
+        if v is not None:
+            return convert(v, ci.datatype)
+        return v
+    if kind == MULTIKEY:
+        if v is default and converted is not NOT_CONVERTED:
+            return list(converted)
+        return [convert(vi, ci.datatype) for vi in v]
+    if kind == KEYMAP:
+        if v:
+            for key, val in v.items():
+                v[key] = convert(val, ci.datatype)
+        elif converted is not NOT_CONVERTED:
+            v.update(converted)
+        else:
+            for key, val in default.items():
+                v[key] = convert(val, ci.datatype)
+        return v
+    assert kind == MULTIKEYMAP
+    if v is default:
+        if converted is not NOT_CONVERTED:
+            return {key: list(val) for key, val in converted.items()}
+        return {key: [convert(vi, ci.datatype) for vi in val]
+                for key, val in default.items()}
+    for key, val in v.items():
+        v[key] = [convert(vi, ci.datatype) for vi in val]
+    return v
+
+
 class BaseMatcher:
+
+    # If not None, the list errors are added to instead of being raised
+    # by finish(); see _collect().
+    errors = None
+    _first_error = 0
+
+    # If true, the values of keys are converted when they are first
+    # used; see LazyMatcher.
+    lazy = False
+    _pending = None
+
+    # If true, sections are created as instances of classes with slots
+    # for their attributes; see getvalueclass().
+    slots = False
+
+    # The SchemaReference shared by the matchers of a configuration,
+    # used to pickle the sections.
+    schemaref = None
+
     def __init__(self, info, type_, handlers):
         self.info = info
         self.type = type_
-        self._values = {}
-        for _type_key, type_info in type_:
-            if type_info.name == "+" and not type_info.issection():
-                v = {}
-            elif type_info.ismulti():
-                v = []
-            else:
-                v = None
-            assert type_info.attribute is not None
-            self._values[type_info.attribute] = v
+        if hasattr(type_, "getloadplan"):
+            self._values = type_.getloadplan().newvalues()
+        else:
+            # Section types which are not SectionType instances have
+            # no load plan; their children are looked at one by one.
+            self._values = {}
+            for _type_key, type_info in type_:
+                if type_info.name == "+" and not type_info.issection():
+                    v = {}
+                elif type_info.ismulti():
+                    v = []
+                else:
+                    v = None
+                assert type_info.attribute is not None
+                self._values[type_info.attribute] = v
         self._sectionnames = {}
         self.handlers = handlers if handlers is not None else []
 
+    def _getloadplan(self):
+        if hasattr(self.type, "getloadplan"):
+            return self.type.getloadplan()
+        # not kept, since such a section type may change at any time
+        return LoadPlan(self.type)
+
     def __repr__(self):
         clsname = self.__class__.__name__
         extra = "type " + repr(self.type.name)
         return f"<{clsname} for {extra}>"
 
+    def _collect(self, errors):
+        # Add errors to *errors* instead of raising them.  Any error
+        # added from now until the section is finished means the
+        # section has errors.
+        self.errors = errors
+        self._first_error = len(errors)
+
+    def _fail(self, error):
+        if self.errors is None:
+            raise error
+        self.errors.append(error)
+
+    def _convert(self, vi, datatype):
+        try:
+            return vi.convert(datatype)
+        except ZConfig.DataConversionError as e:
+            self.errors.append(e)
+            return None
+
     def addSection(self, type_, name, sectvalue):
         if name:
             if name in self._sectionnames:
@@ -62,18 +165,11 @@ class BaseMatcher:
             realkey = self.type.keytype(key)
         except ValueError as e:
             raise ZConfig.DataConversionError(e, key, position)
-        arbkey_info = None
-        for i in range(len(self.type)):
-            k, ci = self.type[i]
-            if k == realkey:
-                break
-            if ci.name == "+" and not ci.issection():
-                arbkey_info = k, ci
-        else:
-            if arbkey_info is None:
-                raise ZConfig.ConfigurationError(
-                    repr(key) + " is not a known key name")
-            k, ci = arbkey_info
+        ci = self.type.getkeyinfo(realkey)
+        if ci is None:
+            raise ZConfig.ConfigurationError(
+                repr(key) + " is not a known key name")
+        k = ci.name
         if ci.issection():  # pragma: no cover
             if ci.name:
                 extra = " in %s sections" % repr(self.type.name)
@@ -127,106 +223,100 @@ class BaseMatcher:
             raise ZConfig.ConfigurationError(
                 "%s is not an allowed name for %s sections"
                 % (repr(name), repr(ci.sectiontype.name)))
-        return SectionMatcher(ci, type_, name, self.handlers)
+        return self.createSectionMatcher(ci, type_, name)
+
+    def createSectionMatcher(self, info, type_, name):
+        matcher = SectionMatcher(info, type_, name, self.handlers)
+        matcher.schemaref = self.schemaref
+        if self.slots:
+            matcher.slots = True
+        return matcher
 
     def finish(self):
         """Check the constraints of the section and convert to an application
         object."""
         values = self._values
-        for key, ci in self.type:
-            if key:
-                key = repr(key)
-            else:
-                key = "section type " + repr(ci.sectiontype.name)
-            assert ci.attribute is not None
-            attr = ci.attribute
+        plan = self._getloadplan()
+        for kind, attr, ci, label, default, _ in plan.entries:
             v = values[attr]
-            if ci.name == '+' and not ci.issection():
+            if kind == KEY:
+                if v is None:
+                    if ci.minOccurs:
+                        self._fail(ZConfig.ConfigurationError(
+                            f"no values for {label}; {ci.minOccurs} required"))
+                    values[attr] = default
+                continue
+            if kind == KEYMAP or kind == MULTIKEYMAP:
                 # v is a dict
                 if ci.minOccurs > len(v):
-                    raise ZConfig.ConfigurationError(
+                    self._fail(ZConfig.ConfigurationError(
                         "no keys defined for the %s key/value map; at least %d"
-                        " must be specified" % (attr, ci.minOccurs))
-            if v is None and ci.minOccurs:
-                default = ci.getdefault()
-                if default is None:
-                    raise ZConfig.ConfigurationError(
-                        f"no values for {key}; {ci.minOccurs} required")
-                else:
-                    v = values[attr] = default[:]  # pragma: no cover
-            if ci.ismulti():
-                if not v:
-                    default = ci.getdefault()
-                    if isinstance(default, dict):
-                        v.update(default)
-                    else:
-                        v[:] = default
-                if len(v) < ci.minOccurs:
-                    raise ZConfig.ConfigurationError(
-                        "not enough values for %s; %d found, %d required"
-                        % (key, len(v), ci.minOccurs))
-            if v is None and not ci.issection():
-                if ci.ismulti():
-                    v = ci.getdefault()[:]  # pragma: no cover
-                else:
-                    v = ci.getdefault()
-                values[attr] = v
+                        " must be specified" % (attr, ci.minOccurs)))
+                if kind == KEYMAP:
+                    continue
+            elif kind == SECTION:
+                if v is None and ci.minOccurs:
+                    self._fail(ZConfig.ConfigurationError(
+                        f"no values for {label}; {ci.minOccurs} required"))
+                continue
+            if not v and default:
+                v = values[attr] = default
+            if len(v) < ci.minOccurs:
+                self._fail(ZConfig.ConfigurationError(
+                    "not enough values for %s; %d found, %d required"
+                    % (label, len(v), ci.minOccurs)))
         return self.constuct()
 
     def constuct(self):
         values = self._values
-        for name, ci in self.type:
-            assert ci.attribute is not None
-            attr = ci.attribute
-            if ci.ismulti():
-                if ci.issection():
-                    v = []
-                    for s in values[attr]:
-                        if s is not None:
-                            st = s.getSectionDefinition()
-                            try:
-                                s = st.datatype(s)
-                            except ValueError as e:
-                                raise ZConfig.DataConversionError(
-                                    e, s, (-1, -1, None))
-
-                        v.append(s)
-                elif ci.name == '+':
-                    v = values[attr]
-                    for key, val in v.items():
-                        v[key] = [vi.convert(ci.datatype) for vi in val]
-                else:
-                    v = [vi.convert(ci.datatype) for vi in values[attr]]
-            elif ci.issection():
-                if values[attr] is not None:
-                    st = values[attr].getSectionDefinition()
+        if self.errors is None:
+            convert = ValueInfo.convert
+        else:
+            convert = self._convert
+        # {attribute: (load plan entry, unconverted value)}
+        pending = self._pending = {} if self.lazy else None
+        plan = self._getloadplan()
+        for entry in plan.entries:
+            kind, attr, ci, _, default, converted = entry
+            v = values[attr]
+            if kind == SECTION:
+                if v is not None and v is not _failed:
+                    st = v.getSectionDefinition()
                     try:
-                        v = st.datatype(values[attr])
+                        v = st.datatype(v)
                     except ValueError as e:
-                        raise ZConfig.DataConversionError(
-                            e, values[attr], (-1, -1, None))
-
+                        self._fail(ZConfig.DataConversionError(
+                            e, v, (-1, -1, None)))
+                        v = None
                 else:
                     v = None
-            elif name == '+':
-                v = values[attr]
-                if not v:
-                    for key, val in ci.getdefault().items():
-                        v[key] = val.convert(ci.datatype)
-                else:
-                    for key, val in v.items():
-                        v[key] = val.convert(ci.datatype)
+            elif kind == MULTISECTION:
+                sections = v
+                v = []
+                for s in sections:
+                    if s is not None and s is not _failed:
+                        st = s.getSectionDefinition()
+                        try:
+                            s = st.datatype(s)
+                        except ValueError as e:
+                            self._fail(ZConfig.DataConversionError(
+                                e, s, (-1, -1, None)))
+                    v.append(s)
+            elif pending is not None and ci.handler is None and (v or default):
+                pending[attr] = entry, v
+                continue
             else:
-                v = values[attr]
-                if v is not None:
-                    v = v.convert(ci.datatype)
+                v = _convert_value(entry, v, convert)
             values[attr] = v
             if ci.handler is not None:
                 self.handlers.append((ci.handler, v))
+        if self.errors is not None and len(self.errors) > self._first_error:
+            return _failed
         return self.createValue()
 
     def createValue(self):
-        return SectionValue(self._values, None, self)
+        cls = getvalueclass(self.type) if self.slots else SectionValue
+        return cls(self._values, None, self)
 
 
 class SectionMatcher(BaseMatcher):
@@ -239,28 +329,146 @@ class SectionMatcher(BaseMatcher):
         BaseMatcher.__init__(self, info, type_, handlers)
 
     def createValue(self):
-        return SectionValue(self._values, self.name, self)
+        cls = getvalueclass(self.type) if self.slots else SectionValue
+        return cls(self._values, self.name, self)
 
 
 class SchemaMatcher(BaseMatcher):
     def __init__(self, schema):
         BaseMatcher.__init__(self, schema, schema, [])
+        self.schemaref = SchemaReference(schema)
 
     def finish(self):
         # Since there's no outer container to call datatype()
         # for the schema, we convert on the way out.
-        v = BaseMatcher.finish(self)
+        v = super().finish()
+        if v is _failed:
+            return v
         v = self.type.datatype(v)
         if self.type.handler is not None:
             self.handlers.append((self.type.handler, v))
         return v
 
 
+class LazyMatcher(BaseMatcher):
+    """Matcher leaving the values of keys to be converted when used.
+
+    The sections created are :class:`LazySectionValue` objects.  Values
+    of keys with a handler are converted when the section is finished.
+    """
+
+    lazy = True
+
+    def createSectionMatcher(self, info, type_, name):
+        matcher = LazySectionMatcher(info, type_, name, self.handlers)
+        matcher.schemaref = self.schemaref
+        return matcher
+
+    def createValue(self):
+        return LazySectionValue(self._values, None, self, self._pending)
+
+
+class LazySectionMatcher(SectionMatcher, LazyMatcher):
+
+    def createValue(self):
+        return LazySectionValue(self._values, self.name, self, self._pending)
+
+
+class LazySchemaMatcher(SchemaMatcher, LazyMatcher):
+    pass
+
+
+class SchemaReference:
+    """The schema of the sections of a configuration, for pickling.
+
+    *schema* is the schema the configuration was loaded with, and
+    :attr:`imports` the URLs of the schema components imported by the
+    configuration with ``%import``, in order.
+
+    If *schema* is registered in
+    :data:`ZConfig.schemacache.shared_schemas` (as are the schemas
+    loaded by :func:`ZConfig.loadSchema` and
+    :func:`ZConfig.loadSchemaFile`), the reference is pickled as the
+    key of the schema in the registry and the imports.  When unpickled,
+    the schema registered with the key is used, loaded again if it was
+    loaded by URL; the components are imported again if needed.
+    Otherwise the schema itself is pickled with the reference.
+    """
+
+    _key = _unknown = object()
+
+    def __init__(self, schema, imports=()):
+        self.schema = schema
+        self.imports = imports
+        self._resolved = None
+        self._matchers = {}
+
+    def __reduce_ex__(self, protocol):
+        key = self.getkey()
+        if key is None:
+            return SchemaReference, (self.schema, self.imports)
+        return _load_schemaref, (key, self.imports)
+
+    def getkey(self):
+        """Return the key of the schema in the shared registry, or
+        ``None`` if the schema is not registered."""
+        if self._key is self._unknown:
+            self._key = ZConfig.schemacache.shared_schemas.getkey(
+                self.schema)
+        return self._key
+
+    def gettype(self, name):
+        """Return the section type *name*; the schema if *name* is
+        ``None``."""
+        if name is None:
+            return self.schema
+        schema = self._resolved
+        if schema is None:
+            schema = self.schema
+            if self.imports:
+                schema = ZConfig.loader._import_components(
+                    schema, self.imports)
+            self._resolved = schema
+        return schema.gettype(name)
+
+    def getmatcher(self, name):
+        # The matcher of unpickled sections of type *name*.
+        matcher = self._matchers.get(name)
+        if matcher is None:
+            matcher = BaseMatcher(None, self.gettype(name), None)
+            matcher.schemaref = self
+            self._matchers[name] = matcher
+        return matcher
+
+
+def _load_schemaref(key, imports):
+    schema = ZConfig.schemacache.shared_schemas.lookup(key)
+    ref = SchemaReference(schema, imports)
+    ref._key = key
+    return ref
+
+
+def _load_section(schemaref, typename, cls, name, state):
+    matcher = schemaref.getmatcher(typename)
+    if cls is None:
+        cls = getvalueclass(matcher.type)
+    section = cls.__new__(cls)
+    for attr, value in state.items():
+        object.__setattr__(section, attr, value)
+    section._name = name
+    section._matcher = matcher
+    return section
+
+
 class SectionValue:
     """Generic 'bag-of-values' object for a section.
 
     Derived classes should always call the SectionValue constructor
     before attempting to modify self.
+
+    Sections are pickled without their matchers and section types;
+    these are looked up again by name when unpickled, in the schema
+    referred to by a :class:`SchemaReference`.
     """
 
     def __init__(self, values, name, matcher):
@@ -281,12 +489,31 @@ class SectionValue:
 
     def __str__(self):
         lst = []
-        attrnames = sorted([s for s in self.__dict__ if s[0] != "_"])
+        attrnames = sorted(self._publicnames())
         for k in attrnames:
             v = getattr(self, k)
             lst.append('%-40s: %s' % (k, v))
         return '\n'.join(lst)
 
+    def __reduce_ex__(self, protocol):
+        schemaref = getattr(self._matcher, "schemaref", None)
+        if schemaref is None:
+            return super().__reduce_ex__(protocol)
+        state = self.__dict__.copy()
+        state.pop("_name", None)
+        state.pop("_matcher", None)
+        cls = self.__class__
+        if isinstance(self, SlottedSectionValue):
+            # made by getvalueclass() again when unpickled
+            for attr in self._attributes:
+                state[attr] = getattr(self, attr)
+            cls = None
+        return _load_section, (schemaref, self._matcher.type.name, cls,
+                               self._name, state)
+
+    def _publicnames(self):
+        return [s for s in self.__dict__ if s[0] != "_"]
+
     def getSectionName(self):
         return self._name
 
@@ -301,3 +528,122 @@ class SectionValue:
 
     def getSectionAttributes(self):
         return self._attributes
+
+
+class SlottedSectionValue(SectionValue):
+    """Base class of the section classes made by :func:`getvalueclass`.
+
+    The values of the section are kept in slots rather than in the
+    instance dictionary, which is only created if other attributes are
+    set on the section (by a datatype, say).
+    """
+
+    __slots__ = '_name', '_matcher'
+
+    def __init__(self, values, name, matcher):
+        for attr, value in values.items():
+            setattr(self, attr, value)
+        self._name = name
+        self._matcher = matcher
+
+    def _publicnames(self):
+        names = [s for s in self._attributes if s[0] != "_"]
+        names.extend(SectionValue._publicnames(self))
+        return names
+
+
+# {section type: (load plan, section class)}
+_valueclasses = weakref.WeakKeyDictionary()
+_valueclasses_lock = threading.Lock()
+
+
+def getvalueclass(sectiontype):
+    """Return the class of sections of *sectiontype* with slots.
+
+    The class is a subclass of :class:`SlottedSectionValue` with a slot
+    for each attribute of the section type, made when first needed and
+    kept until the section type changes.  :class:`SectionValue` is
+    returned if the attributes cannot be slots.
+    """
+    plan = sectiontype.getloadplan()
+    cached = _valueclasses.get(sectiontype)
+    if cached is not None and cached[0] is plan:
+        return cached[1]
+    attributes = tuple(entry[1] for entry in plan.entries)
+    if any(attr.startswith("__")
+           or attr in ("_name", "_matcher", "_attributes")
+           for attr in attributes):
+        cls = SectionValue
+    else:
+        # Named like SectionValue, as it is shown by repr().
+        cls = type("SectionValue", (SlottedSectionValue,), {
+            "__slots__": attributes,
+            "__module__": __name__,
+            "_attributes": attributes,
+        })
+    with _valueclasses_lock:
+        _valueclasses[sectiontype] = plan, cls
+    return cls
+
+
+class LazySectionValue(SectionValue):
+    """Section whose values are converted when first used.
+
+    The value of a key is converted by its datatype when the attribute
+    is first looked up, and kept; a
+    :exc:`~ZConfig.DataConversionError` is raised then if the value
+    cannot be converted.
+    """
+
+    def __init__(self, values, name, matcher, pending):
+        SectionValue.__init__(self, values, name, matcher)
+        for attr in pending:
+            del self.__dict__[attr]
+        self._pending = pending
+
+    def __getattr__(self, name):
+        # Only called for attributes not converted yet (or missing).
+        pending = self.__dict__.get("_pending")
+        item = pending.get(name) if pending else None
+        if item is None:
+            try:
+                # converted by another thread in the meantime
+                return self.__dict__[name]
+            except KeyError:
+                raise AttributeError(name) from None
+        entry, v = item
+        if isinstance(v, dict) and v is not entry[4]:
+            # maps are converted in place; keep ours if that fails
+            v = dict(v)
+        v = self.__dict__[name] = _convert_value(entry, v, ValueInfo.convert)
+        pending.pop(name, None)
+        return v
+
+    def __str__(self):
+        self._convert_pending()
+        return SectionValue.__str__(self)
+
+    def __reduce_ex__(self, protocol):
+        # the pending values refer to the schema; pickle converted ones
+        self._convert_pending()
+        return SectionValue.__reduce_ex__(self, protocol)
+
+    def _convert_pending(self):
+        for attr in list(self._pending):
+            getattr(self, attr)
+
+    def validate_all(self):
+        """Convert all values of the section and its subsections.
+
+        A :exc:`~ZConfig.DataConversionError` is raised for the first
+        value which cannot be converted.  Subsections are only checked
+        if they are kept as sections (their section type has no
+        datatype turning them into other objects).
+        """
+        self._convert_pending()
+        for attr in self._attributes:
+            v = getattr(self, attr)
+            sections = v if isinstance(v, list) else (v,)
+            for section in sections:
+                if isinstance(section, LazySectionValue):
+                    section.validate_all()
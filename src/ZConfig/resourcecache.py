@@ -0,0 +1,183 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Local cache for remote resources.
+
+A :class:`ResourceCache` keeps copies of remote resources (such as
+configuration fragments loaded with ``%include http://...``) on disk.
+Cached copies are re-validated with the server once they are older
+than a configurable time-to-live, and are used when the server cannot
+be reached.
+
+A cache is used by a loader when it is assigned to the
+:attr:`~ZConfig.loader.BaseLoader.resource_cache` attribute of the
+loader, or of the loader class.
+
+"""
+
+import hashlib
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+
+from ZConfig._fileutil import read_entry
+from ZConfig._fileutil import write_atomic
+
+
+class ResourceCache:
+    """On-disk cache for remote resources.
+
+    Copies are stored in *directory*, which is created if it does
+    not exist.  A cached copy is used without contacting the server
+    for *ttl* seconds after it was last retrieved or validated; after
+    that, the server is asked whether the resource has changed using
+    the ``ETag`` and ``Last-Modified`` headers it sent.
+
+    If *stale_on_error* is true, the cached copy is used when the
+    server cannot be reached or reports a server error.  The total
+    size of the cached copies is kept below *max_size* bytes by
+    dropping the least recently used resources.
+    """
+
+    def __init__(self, directory, ttl=300, max_size=10 * 1024 * 1024,
+                 stale_on_error=True, timeout=30):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_size = max_size
+        self.stale_on_error = stale_on_error
+        self.timeout = timeout
+        os.makedirs(directory, exist_ok=True)
+
+    def read(self, url):
+        """Return the content of the resource *url* as bytes.
+
+        Errors from :func:`urllib.request.urlopen` are propagated if
+        there is no usable cached copy.
+        """
+        meta = self._read_meta(url)
+        data = self._read_data(url) if meta is not None else None
+        if data is None:
+            meta = None
+        elif time.time() - meta["validated"] < self.ttl:
+            return data
+
+        request = urllib.request.Request(url)
+        if meta is not None:
+            if meta.get("etag"):
+                request.add_header("If-None-Match", meta["etag"])
+            if meta.get("last-modified"):
+                request.add_header("If-Modified-Since",
+                                   meta["last-modified"])
+        try:
+            with urllib.request.urlopen(request,
+                                        timeout=self.timeout) as f:
+                newdata = f.read()
+                headers = f.headers
+        except urllib.error.HTTPError as e:
+            if data is None:
+                raise
+            if e.code == 304:
+                meta["validated"] = time.time()
+                self._write_meta(url, meta)
+                return data
+            if e.code < 500 or not self.stale_on_error:
+                raise
+            return data
+        except OSError:
+            if data is None or not self.stale_on_error:
+                raise
+            return data
+
+        meta = {
+            "url": url,
+            "validated": time.time(),
+            "etag": headers.get("ETag"),
+            "last-modified": headers.get("Last-Modified"),
+        }
+        self._store(url, newdata, meta)
+        return newdata
+
+    def invalidate(self, url):
+        """Remove the cached copy of *url*, if any."""
+        for filename in self._filenames(url):
+            try:
+                os.unlink(filename)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """Remove all cached copies."""
+        for name in os.listdir(self.directory):
+            if name.endswith((".data", ".meta")):
+                os.unlink(os.path.join(self.directory, name))
+
+    # internal helpers
+
+    def _filenames(self, url):
+        base = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, base)
+        return base + ".data", base + ".meta"
+
+    def _read_meta(self, url):
+        meta = read_entry(self._filenames(url)[1], json.load)
+        if not isinstance(meta, dict) or meta.get("url") != url:
+            return None
+        return meta
+
+    def _read_data(self, url):
+        filename = self._filenames(url)[0]
+        data = read_entry(filename, lambda f: f.read())
+        if data is not None:
+            # Record the use for the size limit.
+            try:
+                os.utime(filename)
+            except OSError:  # pragma: no cover
+                pass
+        return data
+
+    def _write_meta(self, url, meta):
+        write_atomic(self._filenames(url)[1],
+                     json.dumps(meta).encode("utf-8"))
+
+    def _store(self, url, data, meta):
+        if len(data) > self.max_size:
+            self.invalidate(url)
+            return
+        datafile, metafile = self._filenames(url)
+        write_atomic(datafile, data)
+        write_atomic(metafile, json.dumps(meta).encode("utf-8"))
+        self._prune()
+
+    def _prune(self):
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(".data"):
+                filename = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(filename)
+                except OSError:  # pragma: no cover
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, filename))
+                total += st.st_size
+        entries.sort()
+        while total > self.max_size and entries:
+            _, size, datafile = entries.pop(0)
+            total -= size
+            for filename in (datafile, datafile[:-5] + ".meta"):
+                try:
+                    os.unlink(filename)
+                except FileNotFoundError:  # pragma: no cover
+                    pass
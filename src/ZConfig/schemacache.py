@@ -0,0 +1,317 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Caching support for loaded schemas.
+
+Parsing a schema and all the components it imports is a noticeable
+part of the startup time of short-lived processes.  A
+:class:`SchemaCache` stores finished schema objects on disk so that
+later processes can skip the XML parsing entirely.
+
+Within a process, :func:`ZConfig.loadSchema` and
+:func:`ZConfig.loadSchemaFile` share parsed schemas through a
+:class:`SchemaRegistry`, so that libraries loading the same schema
+share a single schema object.
+
+"""
+
+import hashlib
+import io
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import ZConfig.loader
+from ZConfig._fileutil import make_directory
+from ZConfig._fileutil import read_entry
+from ZConfig._fileutil import write_atomic
+
+
+# Bump this whenever the pickled representation of schema objects
+# changes incompatibly.
+FORMAT_VERSION = 1
+
+
+class SchemaCache:
+    """On-disk cache of compiled schemas.
+
+    Entries are stored in the directory *directory*, which is created
+    if it does not exist.  Each entry records the fingerprint of every
+    resource the schema was built from (the schema itself, schemas it
+    extends or imports, and all imported components); an entry is only
+    used if all of those fingerprints still match.
+
+    Entries are pickles, so the directory must be owned by the current
+    user and not writable by group or others;
+    :exc:`ZConfig.ConfigurationError` is raised otherwise.  Entries
+    which group or others can write are ignored.
+
+    Data type conversion functions and the data type registry are not
+    stored in the cache; they are looked up by name in the registry of
+    the loader using the cache.
+
+    Pass an instance as the *cache* argument of
+    :class:`~ZConfig.loader.SchemaLoader` to use it.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        make_directory(directory)
+
+    def load(self, url, registry):
+        """Return the cached schema for *url*, or ``None``.
+
+        ``None`` is returned if there is no entry for *url* or if any
+        of the resources the entry depends on has changed.
+        """
+        return read_entry(self._filename(url),
+                          lambda f: self._read(f, url, registry))
+
+    def _read(self, f, url, registry):
+        version, entry_url, sources = pickle.load(f)
+        if version != FORMAT_VERSION or entry_url != url:
+            return None
+        for source, fingerprint in sources:
+            if _fingerprint(source) != fingerprint:
+                return None
+        return _Unpickler(f, registry).load()
+
+    def store(self, schema):
+        """Store *schema* in the cache.
+
+        Schemas which cannot be pickled are silently not cached.
+        """
+        try:
+            sources = [(source, _fingerprint(source))
+                       for source in schema.sources]
+        except ZConfig.ConfigurationError:
+            return
+        if None in (fp for _, fp in sources):
+            return
+        f = io.BytesIO()
+        pickle.dump((FORMAT_VERSION, schema.url, sources), f,
+                    pickle.HIGHEST_PROTOCOL)
+        try:
+            _Pickler(f, schema.registry).dump(schema)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        write_atomic(self._filename(schema.url), f.getvalue())
+
+    def invalidate(self, url):
+        """Remove any cache entry for *url*."""
+        try:
+            os.unlink(self._filename(url))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".schema"):
+                os.unlink(os.path.join(self.directory, name))
+
+    def _filename(self, url):
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + ".schema")
+
+
+class SchemaRegistry:
+    """Thread-safe, size-bounded registry of loaded schemas.
+
+    Schemas loaded by URL are keyed by the URL; schemas loaded from
+    open files are keyed by a hash of the schema text and the URL of
+    the file (if any).  Before a registered schema is returned, the
+    fingerprints of the resources it was built from are checked, and
+    the schema is loaded again if any of them have changed.
+
+    At most *maxsize* schemas are kept; the least recently used
+    schema is dropped first.  If *cache* is given, it is passed to the
+    :class:`~ZConfig.loader.SchemaLoader` used to load schemas.
+    """
+
+    def __init__(self, maxsize=64, cache=None):
+        self.maxsize = maxsize
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # {key: (schema, fingerprints)}
+        self._keys = {}  # {id(schema): key}, for getkey()
+
+    def loadURL(self, url):
+        """Return the schema for *url*, loading it if needed."""
+        loader = self._create_loader()
+        url = loader.normalizeURL(url)
+        return self._load(("url", url), lambda: loader.loadURL(url))
+
+    def loadFile(self, file, url=None):
+        """Return the schema for the open file *file*, loading it if
+        needed.
+
+        The file is always read to compute the key; the XML is only
+        parsed if no schema with the same text and URL is registered.
+        """
+        loader = self._create_loader()
+        if not url:
+            url = ZConfig.loader._url_from_file(file)
+        data = file.read()
+        if isinstance(data, str):
+            digest = hashlib.sha1(data.encode("utf-8")).hexdigest()
+            copy = io.StringIO(data)
+        else:
+            digest = hashlib.sha1(data).hexdigest()
+            copy = io.BytesIO(data)
+        return self._load(("sha1", digest, url),
+                          lambda: loader.loadFile(copy, url))
+
+    def getkey(self, schema):
+        """Return the key *schema* is registered with, or ``None``.
+
+        The key identifies the schema across processes; see
+        :meth:`lookup`.
+        """
+        with self._lock:
+            key = self._keys.get(id(schema))
+            entry = self._entries.get(key)
+        if entry is None or entry[0] is not schema:
+            return None
+        return key
+
+    def lookup(self, key):
+        """Return the schema for *key*, as returned by :meth:`getkey`.
+
+        Schemas loaded by URL are loaded again if needed; for other
+        keys, :exc:`KeyError` is raised if no schema is registered
+        with the key.
+        """
+        if key[0] == "url":
+            return self.loadURL(key[1])
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry[0]
+
+    def invalidate(self, url=None):
+        """Drop registered schemas.
+
+        If *url* is ``None``, all schemas are dropped.  Otherwise
+        schemas which were loaded from *url* or which were built using
+        the resource identified by *url* are dropped.
+        """
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+                self._keys.clear()
+                return
+            for key, (schema, _) in list(self._entries.items()):
+                if key[-1] == url or url in schema.sources:
+                    self._remove(key)
+
+    def clear(self):
+        """Drop all registered schemas."""
+        self.invalidate()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _create_loader(self):
+        return ZConfig.loader.SchemaLoader(cache=self.cache)
+
+    def _load(self, key, load):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            schema, fingerprints = entry
+            if _fingerprints(schema) == fingerprints:
+                with self._lock:
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                return schema
+        schema = load()
+        fingerprints = _fingerprints(schema)
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and current is not entry:
+                # Another thread registered the schema while we were
+                # loading it; share that one.
+                return current[0]
+            if current is not None:
+                self._remove(key)
+            self._entries[key] = schema, fingerprints
+            self._keys[id(schema)] = key
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+        return schema
+
+    def _remove(self, key):
+        # Called with the lock held.
+        schema, _ = self._entries.pop(key)
+        if self._keys.get(id(schema)) == key:
+            del self._keys[id(schema)]
+
+
+#: The registry used by :func:`ZConfig.loadSchema` and
+#: :func:`ZConfig.loadSchemaFile`.
+shared_schemas = SchemaRegistry()
+
+
+def _fingerprints(schema):
+    return [_fingerprint(url) for url in schema.sources]
+
+
+def _fingerprint(url):
+    try:
+        return ZConfig.loader.resourceFingerprint(url)
+    except ZConfig.ConfigurationError:
+        return None
+
+
+def _datatype_names(registry):
+    names = {}
+    for dct in registry._stock, registry._other:
+        for name, conversion in dct.items():
+            names[id(conversion)] = name
+    return names
+
+
+class _Pickler(pickle.Pickler):
+    # The registry and the conversion functions it provides are
+    # replaced with references that are resolved on load.
+
+    def __init__(self, file, registry):
+        pickle.Pickler.__init__(self, file, pickle.HIGHEST_PROTOCOL)
+        self._registry = registry
+        self._names = _datatype_names(registry)
+
+    def persistent_id(self, obj):
+        if obj is self._registry:
+            return ("registry",)
+        name = self._names.get(id(obj))
+        if name is not None:
+            return ("datatype", name)
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+
+    def __init__(self, file, registry):
+        pickle.Unpickler.__init__(self, file)
+        self._registry = registry
+
+    def persistent_load(self, pid):
+        if pid[0] == "registry":
+            return self._registry
+        if pid[0] == "datatype":
+            return self._registry.get(pid[1])
+        raise pickle.UnpicklingError(
+            "unsupported persistent id: " + repr(pid))
@@ -0,0 +1,190 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Snapshots of loaded configurations.
+
+A snapshot is a file holding a fully loaded configuration (the
+section value tree and the composite handler) together with the
+information needed to decide whether it is still valid: the
+fingerprint of every configuration resource and schema resource used,
+and the values of the environment variables the load looked up.
+Loading a configuration from a valid snapshot skips parsing, matching
+and data type conversion entirely.
+
+Schema types, the data type registry and conversion functions are not
+stored in the snapshot; they are taken from the schema passed when
+the snapshot is loaded.
+
+Snapshots are pickles, and loading a pickle can run arbitrary code:
+snapshot files must be as trusted as code.  Only snapshot files owned
+by the current user, which neither group nor others can write, are
+loaded.
+
+"""
+
+import io
+import os
+import pickle
+
+import ZConfig.loader
+from ZConfig._fileutil import read_entry
+from ZConfig._fileutil import write_atomic
+from ZConfig.schemacache import _datatype_names
+from ZConfig.schemacache import _fingerprint
+
+
+MAGIC = b"ZConfig snapshot\n"
+
+# Bump this whenever the snapshot format changes incompatibly.
+FORMAT_VERSION = 1
+
+
+def loadConfig(schema, url, snapshot, overrides=(), environ=None):
+    """Load a configuration, using a snapshot if possible.
+
+    If the file *snapshot* holds a valid snapshot of the configuration
+    at *url* (with the same *overrides*, and the same values for the
+    environment variables it used), the configuration is loaded from
+    it.  Otherwise the configuration is loaded as by
+    :func:`ZConfig.loadConfig`, and a new snapshot is written.
+    *environ* is the mapping used instead of :data:`os.environ`, as
+    for :func:`ZConfig.loadConfig`.
+
+    The return value is the same as for :func:`ZConfig.loadConfig`.
+    """
+    result = load(snapshot, schema, url, overrides, environ)
+    if result is None:
+        loader = ZConfig.loader._get_config_loader(
+            schema, overrides, environ=environ)
+        result = loader.loadURL(url)
+        save(snapshot, loader, result, overrides)
+    return result
+
+
+def save(path, loader, result, overrides=()):
+    """Write a snapshot of the configuration *result* to *path*.
+
+    *loader* is the :class:`~ZConfig.loader.ConfigLoader` which
+    produced *result* (the ``(config, handler)`` tuple returned by its
+    ``load*()`` methods), and *overrides* the overrides it used.
+
+    Returns ``True`` if the snapshot was written.  Configurations
+    which cannot be validated later (because a resource has no URL,
+    or the schema was not loaded from a URL) or which contain values
+    that cannot be pickled are not written.
+    """
+    base = _base_schema(loader)
+    if None in loader.sources or base.url is None:
+        return False
+    urls = ZConfig.loader._unique(loader.sources + loader.schema.sources)
+    sources = [(url, _fingerprint(url)) for url in urls]
+    if None in (fp for _, fp in sources):
+        return False
+    environ = dict(getattr(loader, "environ_used", {}))
+    header = (FORMAT_VERSION, loader.sources[0], tuple(overrides),
+              base.url, getattr(loader, "_imports", ()), sources, environ)
+
+    f = io.BytesIO()
+    f.write(MAGIC)
+    pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+    try:
+        _Pickler(f, base, loader.schema).dump(tuple(result))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return False
+    return write_atomic(path, f.getvalue())
+
+
+def load(path, schema, url=None, overrides=(), environ=None):
+    """Return the configuration stored in the snapshot at *path*.
+
+    The result is a ``(config, handler)`` tuple, or ``None`` if there
+    is no usable snapshot: the file is missing or unreadable, it is
+    owned by another user or writable by group or others, it was made
+    for another schema, URL or *overrides*, or a resource or
+    environment variable it depends on has changed.  If *url* is
+    ``None``, the snapshot may be for any URL.  Environment variables
+    are looked up in *environ* if it is given, and otherwise in
+    :data:`os.environ`.
+    """
+    if environ is None:
+        environ = os.environ
+    return read_entry(
+        path, lambda f: _read(f, schema, url, overrides, environ))
+
+
+def _read(f, schema, url, overrides, environ):
+    if f.read(len(MAGIC)) != MAGIC:
+        return None
+    (version, snapshot_url, snapshot_overrides, schema_url,
+     imports, sources, variables) = pickle.load(f)
+    if version != FORMAT_VERSION:
+        return None
+    if url is not None:
+        url = ZConfig.loader.ConfigLoader(schema).normalizeURL(url)
+        if url != snapshot_url:
+            return None
+    if (tuple(overrides) != snapshot_overrides
+            or schema.url != schema_url):
+        return None
+    for source, fingerprint in sources:
+        if _fingerprint(source) != fingerprint:
+            return None
+    for name, value in variables.items():
+        if environ.get(name) != value:
+            return None
+    derived = ZConfig.loader._import_components(schema, imports)
+    return _Unpickler(f, schema, derived).load()
+
+
+def _base_schema(loader):
+    return getattr(loader, "_base_schema", loader.schema)
+
+
+class _Pickler(pickle.Pickler):
+    # Schemas, types, the registry and conversion functions are
+    # replaced with references that are resolved on load.
+
+    def __init__(self, file, base, derived):
+        pickle.Pickler.__init__(self, file, pickle.HIGHEST_PROTOCOL)
+        self._ids = {id(base.registry): ("registry",),
+                     id(base): ("schema", "base"),
+                     id(derived): ("schema", "derived")}
+        for name in derived.gettypenames():
+            self._ids[id(derived.gettype(name))] = ("type", name)
+        for oid, name in _datatype_names(base.registry).items():
+            self._ids[oid] = ("datatype", name)
+
+    def persistent_id(self, obj):
+        return self._ids.get(id(obj))
+
+
+class _Unpickler(pickle.Unpickler):
+
+    def __init__(self, file, base, derived):
+        pickle.Unpickler.__init__(self, file)
+        self._schemas = {"base": base, "derived": derived}
+        self._base = base
+        self._derived = derived
+
+    def persistent_load(self, pid):
+        kind = pid[0]
+        if kind == "registry":
+            return self._base.registry
+        if kind == "schema":
+            return self._schemas[pid[1]]
+        if kind == "type":
+            return self._derived.gettype(pid[1])
+        if kind == "datatype":
+            return self._base.registry.get(pid[1])
+        raise pickle.UnpicklingError(
+            "unsupported persistent id: " + repr(pid))
@@ -13,6 +13,7 @@
 ##############################################################################
 """Shell-style string substitution helper."""
 
+import functools
 import os
 import re
 
@@ -23,7 +24,7 @@ _name_re = r'[a-zA-Z_][a-zA-Z0-9_]*'
 _name_match = re.compile(_name_re).match
 
 
-def substitute(s, mapping):
+def substitute(s, mapping, environ=None):
     """Substitute values from *mapping* into *s*.
 
     *mapping* can be a :class:`dict` or any type that supports the
@@ -31,27 +32,103 @@ def substitute(s, mapping):
     copied into the result without further interpretation. Raises
     :exc:`~.SubstitutionSyntaxError` if there are malformed constructs
     in *s*.
+
+    ``$(NAME)`` references are looked up in *environ*, which must
+    support ``get()`` as well, or in :data:`os.environ` if *environ*
+    is ``None``.
     """
 
-    if "$" in s:
-        result = ''
-        rest = s
-        while rest:
-            p, name, namecase, rest, vtype = _split(rest)
-            result += p
-            if name:
-                v = None
-                if vtype == 'define':
-                    v = mapping.get(name)
-                if vtype == 'env':
-                    v = os.getenv(namecase)
-
-                if v is None:
-                    raise ZConfig.SubstitutionReplacementError(s, namecase)
-                result += v
-        return result
-    else:
+    segments = _compile(s)
+    if segments is None:
         return s
+    parts = []
+    for segment in segments:
+        if type(segment) is str:
+            parts.append(segment)
+            continue
+        vtype, name, namecase = segment
+        if vtype == 'define':
+            v = mapping.get(name)
+        elif vtype == 'env':
+            if environ is None:
+                v = os.getenv(namecase)
+            else:
+                v = environ.get(namecase)
+        else:
+            raise ZConfig.SubstitutionSyntaxError(name)
+        if v is None:
+            raise ZConfig.SubstitutionReplacementError(s, namecase)
+        parts.append(v)
+    return "".join(parts)
+
+
+# One reference, or "$$".
+_reference_rx = re.compile(r"\$(?:\$|\{(%s)\}|\((%s)\)|(%s))"
+                           % (_name_re, _name_re, _name_re))
+
+
+def _compile(s):
+    # Return the segments of the template *s* (see _compile_template),
+    # or None if *s* is literal text.  Only texts with a "$" are
+    # cached, so that literal values do not evict templates.
+    if "$" not in s:
+        return None
+    return _compile_template(s)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_template(s):
+    # Return the segments of the template *s* as a tuple.  Each segment
+    # is either literal text or a tuple (vtype, name, namecase), where
+    # vtype is 'define' or 'env' for references.  A syntax error ends
+    # the segments with ('error', message, None), so that it is raised
+    # only after the references preceding it have been looked up.
+    segments = []
+    literal = ""
+    pos = 0
+    for m in _reference_rx.finditer(s):
+        text = s[pos:m.start()]
+        if "$" in text:
+            # a "$" which does not start a reference
+            break
+        pos = m.end()
+        define, env, name = m.groups()
+        if define:
+            vtype, name = 'define', define
+        elif env:
+            vtype, name = 'env', env
+        elif name:
+            vtype = 'define'
+        else:
+            literal += text + "$"
+            continue
+        if literal or text:
+            segments.append(literal + text)
+            literal = ""
+        segments.append((vtype, name.lower(), name))
+    text = s[pos:]
+    i = text.find("$")
+    if i >= 0:
+        text = text[:i]
+    if literal or text:
+        segments.append(literal + text)
+    if i >= 0:
+        segments.append(('error', _syntax_error(s, pos + i), None))
+    return tuple(segments)
+
+
+def _syntax_error(s, i):
+    # Message for the malformed reference starting at s[i].
+    c = s[i + 1:i + 2]
+    if c == "":
+        return "illegal lone '$' at end of source"
+    if c in "{(":
+        close = "}" if c == "{" else ")"
+        m = _name_match(s, i + 2)
+        if not m:
+            return f"'${c}' not followed by name"
+        return f"'${c}{m.group(0)}' not followed by '{close}'"
+    return "'$' not followed by '$' or name"
 
 
 def isname(s):
@@ -64,53 +141,3 @@ def isname(s):
         return m.group() == s
     else:
         return False
-
-
-def _split(s):
-    # Return a four tuple:  prefix, name, namecase, suffix
-    # - prefix is text that can be used literally in the result (may be '')
-    # - name is a referenced name, or None
-    # - namecase is the name with case preserved
-    # - suffix is trailling text that may contain additional references
-    #   (may be '' or None)
-    if "$" in s:
-        i = s.find("$")
-        c = s[i + 1:i + 2]
-        if c == "":
-            raise ZConfig.SubstitutionSyntaxError(
-                "illegal lone '$' at end of source")
-        if c == "$":
-            return s[:i + 1], None, None, s[i + 2:], None
-        prefix = s[:i]
-        vtype = 'define'
-        if c == "{":
-            m = _name_match(s, i + 2)
-            if not m:
-                raise ZConfig.SubstitutionSyntaxError(
-                    "'${' not followed by name")
-            name = m.group(0)
-            i = m.end() + 1
-            if not s.startswith("}", i - 1):
-                raise ZConfig.SubstitutionSyntaxError(
-                    "'${%s' not followed by '}'" % name)
-        elif c == "(":
-            m = _name_match(s, i + 2)
-            if not m:
-                raise ZConfig.SubstitutionSyntaxError(
-                    "'$(' not followed by name")
-            name = m.group(0)
-            i = m.end() + 1
-            if not s.startswith(")", i - 1):
-                raise ZConfig.SubstitutionSyntaxError(
-                    "'$(%s' not followed by ')'" % name)
-            vtype = 'env'
-        else:
-            m = _name_match(s, i + 1)
-            if not m:
-                raise ZConfig.SubstitutionSyntaxError(
-                    "'$' not followed by '$' or name")
-            name = m.group(0)
-            i = m.end()
-        return prefix, name.lower(), name, s[i:], vtype
-    else:
-        return s, None, None, None, None
@@ -17,7 +17,9 @@
 import contextlib
 import os
 import pathlib
+import shutil
 import sys
+import tempfile
 from io import StringIO
 
 import ZConfig
@@ -110,3 +112,25 @@ class TestHelper:
 
     def create_config_loader(self, schema):
         return ConfigLoader(schema)
+
+
+class TempDirHelper:
+    """Mixin giving each test a temporary directory to write files in."""
+
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def write(self, name, text):
+        path = os.path.join(self.tmpdir, name)
+        if os.path.exists(path):
+            # make sure the change is seen even with coarse mtimes
+            mtime = os.stat(path).st_mtime_ns + 10**9
+        else:
+            mtime = None
+        with open(path, "w") as f:
+            f.write(text)
+        if mtime is not None:
+            os.utime(path, ns=(mtime, mtime))
+        return path
@@ -0,0 +1,124 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests of ZConfig.aio."""
+
+import asyncio
+import concurrent.futures
+import threading
+import unittest
+from io import StringIO
+
+import ZConfig
+import ZConfig.aio
+import ZConfig.loader
+from ZConfig.tests.support import TempDirHelper
+
+
+SCHEMA = """\
+<schema>
+  <import package='ZConfig.components.logger'/>
+  <key name='port' datatype='port-number' default='8080'/>
+  <multikey name='item' attribute='items'/>
+  <multisection type='logger' name='*' attribute='loggers'/>
+</schema>
+"""
+
+CONFIG = """\
+port 9000
+%include part.conf
+<logger>
+  level info
+</logger>
+"""
+
+
+class RecordingConfigLoader(ZConfig.loader.ConfigLoader):
+
+    def __init__(self, schema):
+        ZConfig.loader.ConfigLoader.__init__(self, schema)
+        self.threads = set()
+
+    def openResource(self, url):
+        self.threads.add(threading.current_thread())
+        return ZConfig.loader.ConfigLoader.openResource(self, url)
+
+
+class AsyncLoadTestCase(TempDirHelper, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.schema_path = self.write("schema.xml", SCHEMA)
+        self.config_path = self.write("main.conf", CONFIG)
+        self.write("part.conf", "item a\nitem b\n")
+
+    def check_config(self, conf):
+        self.assertEqual(conf.port, 9000)
+        self.assertEqual(conf.items, ["a", "b"])
+        self.assertEqual(conf.loggers[0].level, 20)
+
+    def test_same_result_as_sync(self):
+        async def load():
+            schema = await ZConfig.aio.loadSchema(self.schema_path)
+            return schema, await ZConfig.aio.loadConfig(
+                schema, self.config_path)
+        schema, (conf, handler) = asyncio.run(load())
+        self.assertIs(schema, ZConfig.loadSchema(self.schema_path))
+        self.check_config(conf)
+        conf2, handler2 = ZConfig.loadConfig(schema, self.config_path)
+        self.assertEqual((conf.port, conf.items, conf.loggers[0].level),
+                         (conf2.port, conf2.items, conf2.loggers[0].level))
+        self.assertEqual(len(handler), len(handler2))
+
+    def test_files(self):
+        async def load():
+            schema = await ZConfig.aio.loadSchemaFile(StringIO(SCHEMA))
+            return await ZConfig.aio.loadConfigFile(
+                schema, StringIO(CONFIG), self.config_path,
+                overrides=["port=9001"])
+        conf, handler = asyncio.run(load())
+        self.assertEqual(conf.port, 9001)
+        self.assertEqual(conf.items, ["a", "b"])
+
+    def test_io_off_the_loop(self):
+        schema = ZConfig.loadSchema(self.schema_path)
+        loader = RecordingConfigLoader(schema)
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            conf, handler = asyncio.run(ZConfig.aio.load(
+                loader, self.config_path, executor=executor))
+        self.check_config(conf)
+        self.assertEqual(len(loader.threads), 1)
+        self.assertNotIn(threading.current_thread(), loader.threads)
+
+    def test_errors_propagated(self):
+        schema = ZConfig.loadSchema(self.schema_path)
+        self.write("part.conf", "item a\n<logger>\n  level splat\n</logger>\n")
+        with self.assertRaises(ZConfig.DataConversionError):
+            asyncio.run(ZConfig.aio.loadConfig(schema, self.config_path))
+
+    def test_collect_errors(self):
+        schema = ZConfig.loadSchema(self.schema_path)
+        self.write("part.conf", "item a\ncolour red\nport 1\n")
+        with self.assertRaises(ZConfig.MultipleConfigurationErrors) as ctx:
+            asyncio.run(ZConfig.aio.loadConfig(
+                schema, self.config_path, collect_errors=True))
+        self.assertEqual(len(ctx.exception.errors), 2)
+
+    def test_environ(self):
+        async def load():
+            schema = await ZConfig.aio.loadSchemaFile(StringIO(SCHEMA))
+            return await ZConfig.aio.loadConfigFile(
+                schema, StringIO("port $(PORT)\n"),
+                environ={"PORT": "9002"})
+        conf, handler = asyncio.run(load())
+        self.assertEqual(conf.port, 9002)
@@ -43,6 +43,36 @@ class TestImportFromConfiguration(ZConfig.tests.support.TestHelper,
             StringIO("%import ZConfig.tests.library.widget\n"
                      "%import ZConfig.tests.library.widget\n"))
 
+    def test_derived_schema_shared(self):
+        schema = self.load_schema_text("<schema/>")
+        text = ("%import ZConfig.tests.library.widget\n"
+                "%import ZConfig.tests.library.thing\n")
+        loader1 = self.create_config_loader(schema)
+        loader1.loadFile(StringIO(text))
+        loader2 = self.create_config_loader(schema)
+        loader2.loadFile(StringIO(text))
+        self.assertIsNot(schema, loader1.schema)
+        self.assertIs(loader1.schema, loader2.schema)
+        self.assertIn("package:ZConfig.tests.library.widget:component.xml",
+                      loader1.schema.sources)
+        self.assertIn("package:ZConfig.tests.library.thing:component.xml",
+                      loader1.schema.sources)
+
+        # A different order of imports gets a different schema:
+        loader3 = self.create_config_loader(schema)
+        loader3.loadFile(
+            StringIO("%import ZConfig.tests.library.thing\n"
+                     "%import ZConfig.tests.library.widget\n"))
+        self.assertIsNot(loader1.schema, loader3.schema)
+        loader3.schema.gettype("widget-b")
+
+        # A prefix of the imports shares the intermediate schema:
+        loader4 = self.create_config_loader(schema)
+        loader4.loadFile(StringIO("%import ZConfig.tests.library.widget\n"))
+        self.assertIsNot(loader1.schema, loader4.schema)
+        self.assertRaises(ZConfig.SchemaError,
+                          loader4.schema.gettype, "thing-a")
+
     def test_missing_import(self):
         schema = self.load_schema_text("<schema/>")
         loader = self.create_config_loader(schema)
@@ -0,0 +1,343 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests of ZConfig.cfgparser."""
+
+import unittest
+from io import StringIO
+
+import ZConfig
+from ZConfig.cfgparser import ZConfigParser
+from ZConfig.cfgparser import iterparse
+from ZConfig.loader import Resource
+
+
+class RecordingSection:
+
+    def __init__(self, log):
+        self.log = log
+
+    def addValue(self, key, value, position):
+        if key == "unknown":
+            raise ZConfig.ConfigurationError("unknown key")
+        self.log.append(("value", key, value, position[0]))
+
+
+class RecordingContext:
+
+    def __init__(self):
+        self.log = []
+        self.errors = None
+
+    def startSection(self, parent, type_, name):
+        if type_ == "unknown":
+            raise ZConfig.ConfigurationError("unknown type")
+        self.log.append(("start", type_, name))
+        return RecordingSection(self.log)
+
+    def endSection(self, parent, type_, name, matcher):
+        self.log.append(("end", type_, name))
+        if name == "invalid":
+            # as the matchers do when errors are collected
+            self.errors.append(ZConfig.ConfigurationError("missing key"))
+            self.errors.append(ZConfig.DataConversionError(
+                ValueError("bad value"), "x", (-1, None, None)))
+            self.errors.append(ZConfig.ConfigurationSyntaxError(
+                "bad key", "file:///other.conf", 2))
+        elif name == "failing":
+            raise ZConfig.ConfigurationError("cannot finish")
+        elif name == "unconvertible":
+            raise ZConfig.DataConversionError(
+                ValueError("bad section"), "x", (-1, None, None))
+
+
+class ReadlineParser(ZConfigParser):
+    bulk_read = False
+
+
+class MethodKeyValueParser(ZConfigParser):
+    # Handles key/value lines with the method instead of inline.
+
+    def handle_key_value(self, section, rest):
+        ZConfigParser.handle_key_value(self, section, rest)
+
+
+class CustomKeyValueParser(ZConfigParser):
+
+    def handle_key_value(self, section, rest):
+        ZConfigParser.handle_key_value(self, section, rest.upper())
+
+
+class ParserTestCase(unittest.TestCase):
+
+    def parse(self, factory, text):
+        context = RecordingContext()
+        resource = Resource(StringIO(text), "file:///test.conf")
+        parser = factory(resource, context)
+        try:
+            parser.parse(RecordingSection(context.log))
+        except ZConfig.ConfigurationError as e:
+            context.log.append(("error", e.message, e.lineno, e.url))
+        return parser.lineno, context.log
+
+    def check_same(self, text):
+        bulk = self.parse(ZConfigParser, text)
+        readline = self.parse(ReadlineParser, text)
+        self.assertEqual(bulk, readline)
+        self.assertEqual(self.parse(MethodKeyValueParser, text), bulk)
+        return bulk
+
+    def collect(self, text):
+        context = RecordingContext()
+        context.errors = errors = []
+        resource = Resource(StringIO(text), "file:///test.conf")
+        ZConfigParser(resource, context, errors=errors).parse(
+            RecordingSection(context.log))
+        return context.log, [(type(e).__name__, e.message, e.lineno, e.url)
+                             for e in errors]
+
+    def test_values_and_sections(self):
+        lineno, log = self.check_same(
+            "# comment\n"
+            "\n"
+            "key value\n"
+            "  <section name>\n"
+            "    empty\n"
+            "  </section>\n"
+            "<leaf/>\n")
+        self.assertEqual(lineno, 7)
+        self.assertEqual(log, [
+            ("value", "key", "value", 3),
+            ("start", "section", "name"),
+            ("value", "empty", "", 5),
+            ("end", "section", "name"),
+            ("start", "leaf", None),
+            ("end", "leaf", None),
+        ])
+
+    def test_crlf_and_missing_final_newline(self):
+        lineno, log = self.check_same("a 1\r\n\r\nb 2 \r\nc 3")
+        self.assertEqual(lineno, 4)
+        self.assertEqual(log, [
+            ("value", "a", "1", 1),
+            ("value", "b", "2", 3),
+            ("value", "c", "3", 4),
+        ])
+
+    def test_substitution(self):
+        lineno, log = self.check_same(
+            "%define name world\n"
+            "greeting hello $name\n"
+            "price $$5\n")
+        self.assertEqual(log, [
+            ("value", "greeting", "hello world", 2),
+            ("value", "price", "$5", 3),
+        ])
+
+    def test_error_lines(self):
+        for text, message, line in [
+                ("a 1\n\n(bad\n", "malformed configuration data", 3),
+                ("a 1\n<section\n", "malformed section start", 2),
+                ("<s>\n</s\n", "malformed section end", 2),
+                ("<s>\na 1\n\n# end\n\n",
+                 "unclosed sections not allowed", 5),
+                ("a $undefined\n", "undefined", 1),
+                ("a 1\nunknown 2\n", "unknown key", 2),
+        ]:
+            lineno, log = self.check_same(text)
+            error = log[-1]
+            self.assertEqual(error[0], "error")
+            self.assertIn(message, error[1])
+            self.assertEqual(error[2:], (line, "file:///test.conf"))
+
+    def test_collect_errors(self):
+        url = "file:///test.conf"
+        log, errors = self.collect(
+            "</a>\n"
+            "<b\n"
+            "  unknown 1\n"
+            "  c 1\n"
+            "</b\n"
+            "<(bad)>\n"
+            "  d 2\n"
+            "  <e>\n"
+            "    <f/>\n"
+            "  </e>\n"
+            "</bad>\n"
+            "<(bad)/>\n"
+            "<unknown>\n"
+            "  g 3\n"
+            "</unknown>\n"
+            "<unknown/>\n"
+            "h 4\n")
+        self.assertEqual(log, [
+            ("start", "b", None),
+            ("value", "c", "1", 4),
+            ("end", "b", None),
+            ("value", "h", "4", 17),
+        ])
+        self.assertEqual(errors, [
+            ("ConfigurationSyntaxError", "unexpected section end", 1, url),
+            ("ConfigurationSyntaxError", "malformed section start", 2, url),
+            ("ConfigurationSyntaxError", "unknown key", 3, url),
+            ("ConfigurationSyntaxError", "malformed section end", 5, url),
+            ("ConfigurationSyntaxError", "malformed section header", 6, url),
+            ("ConfigurationSyntaxError", "malformed section header", 12,
+             url),
+            ("ConfigurationSyntaxError", "unknown type", 13, url),
+            ("ConfigurationSyntaxError", "unknown type", 16, url),
+        ])
+
+    def test_collect_errors_finishing_sections(self):
+        url = "file:///test.conf"
+        log, errors = self.collect(
+            "<s invalid>\n"
+            "</s>\n"
+            "<s failing/>\n"
+            "<s unconvertible>\n"
+            "</s>\n")
+        self.assertEqual(log, [
+            ("start", "s", "invalid"),
+            ("end", "s", "invalid"),
+            ("start", "s", "failing"),
+            ("end", "s", "failing"),
+            ("start", "s", "unconvertible"),
+            ("end", "s", "unconvertible"),
+        ])
+        self.assertEqual(errors, [
+            ("ConfigurationSyntaxError", "missing key", 2, url),
+            ("DataConversionError", "bad value", 2, url),
+            ("ConfigurationSyntaxError", "bad key", 2, "file:///other.conf"),
+            ("ConfigurationSyntaxError", "cannot finish", 3, url),
+            ("DataConversionError", "bad section", 5, url),
+        ])
+
+    def test_overridden_handle_key_value(self):
+        lineno, log = self.parse(CustomKeyValueParser, "key value\n")
+        self.assertEqual(log, [("value", "KEY", "VALUE", 1)])
+
+    def test_file_without_read(self):
+        # Resources which only support readline() are read line by line.
+        class ReadlineOnly:
+            def __init__(self, text):
+                self.readline = StringIO(text).readline
+
+        context = RecordingContext()
+        resource = Resource(ReadlineOnly("a 1\nb 2\n"), "file:///test.conf")
+        ZConfigParser(resource, context).parse(RecordingSection(context.log))
+        self.assertEqual(context.log, [
+            ("value", "a", "1", 1),
+            ("value", "b", "2", 2),
+        ])
+
+
+class IterparseTestCase(unittest.TestCase):
+
+    url = "file:///dir/test.conf"
+
+    def events(self, text, defines=None):
+        return list(iterparse(Resource(StringIO(text), self.url), defines))
+
+    def test_events(self):
+        events = self.events(
+            "# comment\n"
+            "%define Base /var\n"
+            "%import some.package\n"
+            "Key value\n"
+            "<Section Name>\n"
+            "  path $base/lib\n"
+            "  <leaf/>\n"
+            "</section>\n"
+            "%include other.conf\n")
+        self.assertEqual(events, [
+            ("directive", ("define", "base", "/var"),
+             (2, None, self.url)),
+            ("directive", ("import", "some.package"),
+             (3, None, self.url)),
+            ("key", ("Key", "value"), (4, None, self.url)),
+            ("start_section", ("section", "name"), (5, None, self.url)),
+            ("key", ("path", "/var/lib"), (6, None, self.url)),
+            ("start_section", ("leaf", None), (7, None, self.url)),
+            ("end_section", ("leaf", None), (7, None, self.url)),
+            ("end_section", ("section", "name"), (8, None, self.url)),
+            ("directive", ("include", "file:///dir/other.conf"),
+             (9, None, self.url)),
+        ])
+
+    def test_defines(self):
+        defines = {"name": "value"}
+        events = self.events("%define other x\nkey $name\n", defines)
+        self.assertEqual(events[1][1], ("key", "value"))
+        self.assertEqual(defines, {"name": "value", "other": "x"})
+
+    def test_lazy(self):
+        lines = []
+
+        class File:
+            def __init__(self, text):
+                self._readline = StringIO(text).readline
+
+            def readline(self):
+                line = self._readline()
+                lines.append(line)
+                return line
+
+        it = iterparse(Resource(File("a 1\nb 2\nc 3\n"), self.url))
+        self.assertEqual(next(it)[1], ("a", "1"))
+        self.assertEqual(lines, ["a 1\n"])
+        self.assertEqual(len(list(it)), 2)
+
+    def test_errors(self):
+        it = iterparse(Resource(StringIO("a 1\n<s>\n(bad\n"), self.url))
+        self.assertEqual(next(it)[0], "key")
+        self.assertEqual(next(it)[0], "start_section")
+        with self.assertRaises(ZConfig.ConfigurationSyntaxError) as ctx:
+            next(it)
+        self.assertEqual(ctx.exception.lineno, 3)
+        self.assertEqual(ctx.exception.url, self.url)
+        self.assertRaisesRegex(ZConfig.ConfigurationSyntaxError,
+                               "unclosed sections not allowed",
+                               self.events, "<s>\n")
+
+    def test_collect_errors(self):
+        errors = []
+        text = ("a 1\n"
+                "(bad\n"
+                "<s>\n"
+                "  %unknown x\n"
+                "  b 2\n"
+                "</t>\n"
+                "<(bad)>\n"
+                "  c 3\n"
+                "</bad>\n"
+                "<u>\n")
+        events = list(iterparse(Resource(StringIO(text), self.url),
+                                errors=errors))
+        self.assertEqual([(event, data, position[0])
+                          for event, data, position in events], [
+            ("key", ("a", "1"), 1),
+            ("start_section", ("s", None), 3),
+            ("key", ("b", "2"), 5),
+            ("end_section", ("s", None), 6),
+            ("start_section", ("u", None), 10),
+        ])
+        self.assertEqual([(e.message, e.lineno) for e in errors], [
+            ("malformed configuration data", 2),
+            ("unknown directive: 'unknown'", 4),
+            ("unbalanced section end", 6),
+            ("malformed section header", 7),
+            ("unclosed sections not allowed", 10),
+        ])
+        for e in errors:
+            self.assertIsInstance(e, ZConfig.ConfigurationSyntaxError)
+            self.assertEqual(e.url, self.url)
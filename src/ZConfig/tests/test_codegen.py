@@ -0,0 +1,207 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests of ZConfig.codegen."""
+
+import unittest
+from io import StringIO
+
+import ZConfig
+import ZConfig.codegen
+from ZConfig.info import KeyInfo
+from ZConfig.loader import ConfigLoader
+from ZConfig.matcher import SectionValue
+
+
+def upper(section):
+    if section.name == "bad":
+        raise ValueError("bad name")
+    return section.name.upper()
+
+
+SCHEMA = """\
+<schema>
+  <abstracttype name='thing'/>
+  <sectiontype name='widget' implements='thing'
+      datatype='ZConfig.tests.test_codegen.upper'>
+    <key name='name' required='yes'/>
+  </sectiontype>
+  <sectiontype name='server'>
+    <key name='host' default='localhost'/>
+    <key name='port' datatype='port-number' default='8080'/>
+    <key name='path' datatype='existing-directory' default='.'/>
+    <key name='words' datatype='string-list' default='a b'/>
+    <key name='size' datatype='byte-size'/>
+    <multikey name='alias'>
+      <default>www</default>
+    </multikey>
+    <multikey name='tag' datatype='integer' required='yes'/>
+    <multikey name='+' attribute='options' datatype='integer'>
+      <default key='workers'>4</default>
+      <default key='workers'>5</default>
+    </multikey>
+    <section type='thing' name='main' attribute='main'/>
+  </sectiontype>
+  <key name='count' datatype='integer' required='yes' handler='count'/>
+  <key name='+' attribute='settings' datatype='boolean'>
+    <default key='debug'>off</default>
+  </key>
+  <multisection type='server' name='+' attribute='servers'/>
+  <multisection type='thing' name='*' attribute='things'/>
+</schema>
+"""
+
+CONFIG = """\
+count 3
+verbose on
+<server one>
+  tag 1
+  tag 2
+  <widget main>
+    name x
+  </widget>
+</server>
+<server two>
+  host example.com
+  port 80
+  size 1KB
+  alias a
+  alias b
+  tag 3
+  threads 2
+  threads 3
+</server>
+<widget>
+  name y
+</widget>
+"""
+
+
+def _values(value):
+    # The contents of configuration objects, for comparisons.
+    if isinstance(value, SectionValue):
+        return (value.getSectionName(), value.getSectionType(),
+                {attr: _values(getattr(value, attr))
+                 for attr in value.getSectionAttributes()})
+    if isinstance(value, list):
+        return [_values(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _values(v) for k, v in value.items()}
+    return value
+
+
+class CodegenTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = ZConfig.loadSchemaFile(StringIO(SCHEMA))
+
+    def load(self, text, codegen, **kw):
+        loader = ConfigLoader(self.schema, codegen=codegen, **kw)
+        try:
+            conf, handlers = loader.loadFile(StringIO(text))
+        except ZConfig.ConfigurationError as e:
+            return type(e), str(e)
+        return _values(conf), [(name, _values(v))
+                               for name, v in handlers._handlers]
+
+    def check_same(self, text, **kw):
+        interpreted = self.load(text, False, **kw)
+        generated = self.load(text, True, **kw)
+        self.assertEqual(generated, interpreted)
+        return generated
+
+    def test_same_values(self):
+        conf, handlers = self.check_same(CONFIG)
+        self.assertEqual(handlers, [("count", 3)])
+        _, _, values = conf
+        self.assertEqual(values["settings"], {"verbose": True})
+        one, two = values["servers"]
+        self.assertEqual(one[2]["port"], 8080)
+        self.assertEqual(one[2]["options"], {"workers": [4, 5]})
+        self.assertEqual(one[2]["main"], "X")
+        self.assertEqual(two[2]["alias"], ["a", "b"])
+        self.assertEqual(two[2]["options"], {"threads": [2, 3]})
+        self.assertEqual(values["things"], ["Y"])
+
+    def test_generated_matchers(self):
+        loader = ConfigLoader(self.schema, codegen=True)
+        matcher = loader.createSchemaMatcher()
+        self.assertIsInstance(matcher, ZConfig.codegen.GeneratedSchemaMatcher)
+        child = matcher.createChildMatcher(self.schema.gettype("server"), "s")
+        self.assertIsInstance(child, ZConfig.codegen.GeneratedSectionMatcher)
+        conf, _ = loader.loadFile(StringIO(CONFIG))
+        self.assertIsInstance(conf.servers[0].getSectionMatcher(),
+                              ZConfig.codegen.GeneratedSectionMatcher)
+
+    def test_same_errors(self):
+        for text in [
+                "",
+                "count x\n",
+                "count 1\n<server s>\n</server>\n",
+                "count 1\n<server s>\n  tag 1\n  port x\n</server>\n",
+                "count 1\n<server s>\n  tag 1\n  threads x\n</server>\n",
+                "count 1\n<widget>\n  name bad\n</widget>\n",
+                "count 1\n<widget/>\n",
+                "count 1\nflag maybe\n",
+        ]:
+            error, message = self.check_same(text)
+            self.assertTrue(issubclass(error, ZConfig.ConfigurationError))
+            self.check_same(text, collect_errors=True)
+
+    def test_section_labels(self):
+        schema = ZConfig.loadSchemaFile(StringIO("""\
+            <schema>
+              <sectiontype name='bar'/>
+              <section type='bar' name='foo' attribute='foo' required='yes'/>
+              <multisection type='bar' name='*' attribute='bars'
+                            required='yes'/>
+            </schema>
+            """))
+        for codegen in False, True:
+            loader = ConfigLoader(schema, codegen=codegen)
+            with self.assertRaises(ZConfig.ConfigurationError) as ctx:
+                loader.loadFile(StringIO("<bar x>\n</bar>\n"))
+            self.assertEqual(str(ctx.exception),
+                             "no values for 'foo'; 1 required")
+            with self.assertRaises(ZConfig.ConfigurationError) as ctx:
+                loader.loadFile(StringIO("<bar foo>\n</bar>\n"))
+            self.assertEqual(str(ctx.exception),
+                             "not enough values for section type 'bar';"
+                             " 0 found, 1 required")
+
+    def test_collected_errors(self):
+        text = ("<server s>\n  port x\n  threads y\n</server>\n"
+                "<widget>\n  name bad\n</widget>\n")
+        error, message = self.check_same(text, collect_errors=True)
+        self.assertIs(error, ZConfig.MultipleConfigurationErrors)
+        self.assertEqual(len(message.splitlines()), 5)
+
+    def test_source(self):
+        source = ZConfig.codegen.getsource(self.schema.gettype("server"))
+        compile(source, "<test>", "exec")
+        # Converted defaults of simple types are written into the code.
+        self.assertIn("v = 8080\n", source)
+        self.assertIn("not enough values for 'tag'; %d found, 1 required\""
+                      " % (len(v),)", source)
+
+    def test_cached(self):
+        # a schema of its own, as it is changed
+        self.schema = ZConfig.loader.SchemaLoader().loadFile(StringIO(SCHEMA))
+        server = self.schema.gettype("server")
+        finish = ZConfig.codegen.getfinisher(server)
+        self.assertIs(ZConfig.codegen.getfinisher(server), finish)
+        server.addkey(KeyInfo("other", str, 0, None, "other"))
+        other = ZConfig.codegen.getfinisher(server)
+        self.assertIsNot(other, finish)
+        conf, _ = self.load(CONFIG, True)
+        self.assertIsNone(conf[2]["servers"][0][2]["other"])
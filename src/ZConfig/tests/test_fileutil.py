@@ -0,0 +1,60 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests of ZConfig._fileutil."""
+
+import os
+import unittest
+
+from ZConfig._fileutil import read_entry
+from ZConfig._fileutil import write_atomic
+from ZConfig.tests.support import TempDirHelper
+
+
+class FileUtilTestCase(TempDirHelper, unittest.TestCase):
+
+    def read(self, f):
+        return f.read()
+
+    def test_write_and_read(self):
+        path = os.path.join(self.tmpdir, "entry")
+        self.assertTrue(write_atomic(path, b"first"))
+        self.assertTrue(write_atomic(path, b"second"))
+        self.assertEqual(read_entry(path, self.read), b"second")
+        self.assertEqual(os.listdir(self.tmpdir), ["entry"])
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "needs file ownership")
+    def test_written_private(self):
+        path = os.path.join(self.tmpdir, "entry")
+        write_atomic(path, b"data")
+        self.assertFalse(os.stat(path).st_mode & 0o077)
+        os.chmod(path, 0o644)
+        self.assertEqual(read_entry(path, self.read), b"data")
+        os.chmod(path, 0o664)
+        self.assertIsNone(read_entry(path, self.read))
+
+    def test_write_fails(self):
+        path = os.path.join(self.tmpdir, "directory")
+        os.mkdir(path)
+        os.mkdir(os.path.join(path, "child"))
+        self.assertFalse(write_atomic(path, b"data"))
+        self.assertEqual(os.listdir(self.tmpdir), ["directory"])
+
+    def test_read_misses(self):
+        path = os.path.join(self.tmpdir, "entry")
+        self.assertIsNone(read_entry(path, self.read))
+        write_atomic(path, b"data")
+
+        def fail(f):
+            raise ValueError("corrupt")
+        self.assertIsNone(read_entry(path, fail))
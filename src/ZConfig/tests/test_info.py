@@ -12,18 +12,24 @@
 #
 ##############################################################################
 
+import pickle
 import unittest
+from io import StringIO
 
 from ZConfig import ConfigurationError
 from ZConfig import SchemaError
+from ZConfig.info import NOT_CONVERTED
 from ZConfig.info import AbstractType
 from ZConfig.info import BaseInfo
 from ZConfig.info import BaseKeyInfo
 from ZConfig.info import KeyInfo
+from ZConfig.info import LoadPlan
 from ZConfig.info import SchemaType
 from ZConfig.info import SectionInfo
 from ZConfig.info import SectionType
 from ZConfig.info import Unbounded
+from ZConfig.info import ValueInfo
+from ZConfig.loader import SchemaLoader
 from ZConfig.tests.support import TestHelper
 
 
@@ -38,6 +44,41 @@ class UnboundTestCase(unittest.TestCase):
         self.assertEqual(repr(Unbounded), '<Unbounded>')
 
 
+class ValueInfoTestCase(unittest.TestCase):
+
+    def test_position(self):
+        url = "file:///etc/app.conf"
+        for position in [(1, None, url), (0, None, None),
+                         (2 ** 32, None, url)]:
+            vi = ValueInfo("value", position)
+            self.assertIsInstance(vi._where, int)
+            self.assertEqual(vi.position, position)
+        self.assertIs(ValueInfo("value", (1, None, url)).position[2],
+                      ValueInfo("value", (2, None, url)).position[2])
+
+    def test_other_positions(self):
+        # Positions which cannot be packed are kept as given.
+        for position in [(3, 7, "file:///schema.xml"), (-1, None, None),
+                         (1.5, None, None), None]:
+            vi = ValueInfo("value", position)
+            self.assertIs(vi.position, position)
+
+    def test_set_position(self):
+        vi = ValueInfo("value", (1, None, "file:///etc/app.conf"))
+        for position in [(2, None, "file:///other.conf"),
+                         (3, 7, "file:///schema.xml"), None,
+                         (4, None, None)]:
+            vi.position = position
+            self.assertEqual(vi.position, position)
+        self.assertIsInstance(vi._where, int)
+
+    def test_pickle(self):
+        vi = ValueInfo("value", (12, None, "file:///etc/app.conf"))
+        copy = pickle.loads(pickle.dumps(vi))
+        self.assertEqual(copy.value, "value")
+        self.assertEqual(copy.position, vi.position)
+
+
 class InfoMixin(TestHelper):
 
     Class = None
@@ -201,6 +242,166 @@ class SectionTypeTestCase(TestHelper, unittest.TestCase):
                                info.getsectioninfo,
                                None, 'baz')
 
+    def test_getkeyinfo(self):
+        schema = self.load_schema_text("""\
+            <schema>
+              <key name='a'/>
+              <key name='+' attribute='other'/>
+              <sectiontype name='t'/>
+              <section type='t' name='s'/>
+              <section type='t' name='*' attribute='any'/>
+            </schema>
+            """)
+        self.assertIs(schema.getkeyinfo('a'), schema.getinfo('a'))
+        self.assertIs(schema.getkeyinfo('s'), schema.getinfo('s'))
+        self.assertIs(schema.getkeyinfo('b'), schema.getinfo('+'))
+        self.assertIs(schema.getkeyinfo('+'), schema.getinfo('+'))
+        self.assertIsNone(schema.gettype('t').getkeyinfo('a'))
+
+    def test_getsectioninfo_dispatch(self):
+        schema = self.load_schema_text("""\
+            <schema>
+              <abstracttype name='base'/>
+              <sectiontype name='one' implements='base'/>
+              <sectiontype name='named'/>
+              <section type='named' name='fixed'/>
+              <section type='base' name='*' attribute='any'/>
+              <section type='named' name='+' attribute='other'/>
+            </schema>
+            """)
+        any_, other = [info for key, info in schema if key is None]
+        self.assertEqual((any_.attribute, other.attribute), ('any', 'other'))
+        self.assertIs(schema.getsectioninfo('named', 'fixed'),
+                      schema.getinfo('fixed'))
+        self.assertIs(schema.getsectioninfo('one', None), any_)
+        self.assertIs(schema.getsectioninfo('named', 'other'), other)
+        self.assertRaisesRegex(ConfigurationError,
+                               "'named' sections must be named",
+                               schema.getsectioninfo, 'named', None)
+        self.assertRaisesRegex(ConfigurationError,
+                               "no matching section",
+                               schema.getsectioninfo, 'two', None)
+        # Types implementing an abstract type later are found as well.
+        two = schema.createSectionType('two', None, None, None)
+        schema.gettype('base').addsubtype(two)
+        self.assertIs(schema.getsectioninfo('two', None), any_)
+
+    def test_getsectioninfo_not_pickled(self):
+        schema = self.load_schema_text("""\
+            <schema>
+              <sectiontype name='t'/>
+              <section type='t' name='*' attribute='any'/>
+            </schema>
+            """)
+        info = schema.getsectioninfo('t', None)
+        self.assertIsNotNone(schema._sectiontable)
+        self.assertNotIn('_sectiontable', schema.__getstate__())
+        self.assertIs(pickle.loads(pickle.dumps(schema))._sectiontable, None)
+        self.assertIs(schema.getsectioninfo('t', 'name'), info)
+
+
+class LoadPlanTestCase(TestHelper, unittest.TestCase):
+
+    schema_text = """\
+        <schema>
+          <key name='number' datatype='integer' default='42'/>
+          <key name='path' datatype='existing-directory' default='.'/>
+          <key name='words' datatype='string-list' default='a b'/>
+          <key name='bad' datatype='integer' default='x'/>
+          <multikey name='multi' datatype='integer'>
+            <default>1</default>
+            <default>2</default>
+          </multikey>
+          <key name='+' attribute='map' datatype='integer'>
+            <default key='a'>1</default>
+          </key>
+          <sectiontype name='t'>
+            <multikey name='+' attribute='multimap' datatype='integer'>
+              <default key='k'>1</default>
+              <default key='k'>2</default>
+            </multikey>
+          </sectiontype>
+          <multisection type='t' name='*' attribute='sections'/>
+        </schema>
+        """
+
+    def setUp(self):
+        self.schema = self.load_schema_text(self.schema_text)
+
+    def entry(self, attr, type_=None):
+        type_ = self.schema.gettype(type_) if type_ else self.schema
+        for entry in type_.getloadplan().entries:
+            if entry[1] == attr:
+                return entry
+
+    def test_entries(self):
+        plan = self.schema.getloadplan()
+        self.assertIs(self.schema.getloadplan(), plan)
+        self.assertEqual(
+            [entry[0] for entry in plan.entries],
+            ['key', 'key', 'key', 'key', 'multikey', 'keymap',
+             'multisection'])
+        self.assertEqual(plan.newvalues(), {
+            'number': None, 'path': None, 'words': None, 'bad': None,
+            'multi': [], 'map': {}, 'sections': []})
+        self.assertEqual(self.entry('multimap', 't')[0], 'multikeymap')
+
+    def test_converted_defaults(self):
+        self.assertEqual(self.entry('number')[5], 42)
+        self.assertEqual(self.entry('multi')[5], (1, 2))
+        self.assertEqual(self.entry('map')[5], {'a': 1})
+        self.assertEqual(self.entry('multimap', 't')[5], {'k': (1, 2)})
+        # Conversions depending on more than the value, giving mutable
+        # values, or failing are made for each section.
+        self.assertIs(self.entry('path')[5], NOT_CONVERTED)
+        self.assertIs(self.entry('words')[5], NOT_CONVERTED)
+        self.assertIs(self.entry('bad')[5], NOT_CONVERTED)
+
+    def test_loaded_values(self):
+        conf = self.load_config_text(self.schema, "bad 1\n<t/>\n<t/>\n")
+        self.assertEqual(conf.number, 42)
+        self.assertEqual(conf.words, ['a', 'b'])
+        self.assertEqual(conf.multi, [1, 2])
+        self.assertEqual(conf.map, {'a': 1})
+        first, second = conf.sections
+        self.assertEqual(first.multimap, {'k': [1, 2]})
+        self.assertEqual(second.multimap, first.multimap)
+        # Each section gets its own containers.
+        self.assertIsNot(second.multimap, first.multimap)
+        self.assertIsNot(second.multimap['k'], first.multimap['k'])
+        again = self.load_config_text(self.schema, "bad 2\n")
+        self.assertIsNot(again.multi, conf.multi)
+        self.assertIsNot(again.words, conf.words)
+
+    def test_rebuilt(self):
+        plan = self.schema.getloadplan()
+        self.schema.addkey(KeyInfo('other', str, 0, None, 'other'))
+        self.assertIsNot(self.schema.getloadplan(), plan)
+        self.assertEqual(self.schema.getloadplan().entries[-1][1], 'other')
+        self.assertIsInstance(self.schema.getloadplan(), LoadPlan)
+
+    def test_not_rebuilt_for_other_schemas(self):
+        plan = self.schema.getloadplan()
+        table = self.schema._getsectiontable()
+        other = SchemaLoader().loadFile(StringIO("""\
+            <schema>
+              <abstracttype name='base'/>
+              <sectiontype name='one' implements='base'/>
+              <sectiontype name='two' extends='one'/>
+              <key name='x'/>
+              <multisection type='base' name='*' attribute='things'/>
+            </schema>
+            """))
+        other.getloadplan()
+        self.assertIs(self.schema.getloadplan(), plan)
+        self.assertIs(self.schema._getsectiontable(), table)
+        # other types of the same schema are not rebuilt either
+        one = other.gettype('one')
+        one_plan = one.getloadplan()
+        other.addkey(KeyInfo('y', str, 0, None, 'y'))
+        self.assertIs(one.getloadplan(), one_plan)
+        self.assertEqual(other.getloadplan().entries[-1][1], 'y')
+
 
 class SchemaTypeTestCase(TestHelper, unittest.TestCase):
 
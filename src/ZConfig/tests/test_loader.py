@@ -15,16 +15,20 @@
 
 import os
 import os.path
+import shutil
 import sys
 import tempfile
+import threading
 import unittest
 import urllib.request
 from io import StringIO
+from unittest import mock
 
 import ZConfig
 import ZConfig.loader
 import ZConfig.url
 from ZConfig.tests.support import CONFIG_BASE
+from ZConfig.tests.support import TempDirHelper
 from ZConfig.tests.support import TestHelper
 
 
@@ -265,6 +269,695 @@ class LoaderTestCase(TestHelper, unittest.TestCase):
         assertTrue(not isPath("file:///c|/foo/bar.conf"))
 
 
+class RecordingConfigLoader(ZConfig.loader.ConfigLoader):
+
+    def __init__(self, schema, **kw):
+        ZConfig.loader.ConfigLoader.__init__(self, schema, **kw)
+        self.opened = []
+
+    def openResource(self, url):
+        self.opened.append((url, threading.current_thread().name))
+        return ZConfig.loader.ConfigLoader.openResource(self, url)
+
+
+class PrefetchTestCase(TempDirHelper, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.schema = ZConfig.loadSchemaFile(StringIO("""\
+            <schema>
+              <multikey name='item' attribute='items'/>
+              <key name='name'/>
+            </schema>
+            """))
+        for i in range(4):
+            self.write("part%d.conf" % i, "item %d\n" % i)
+        self.write("nested.conf",
+                   "item nested\n"
+                   "%include part3.conf\n"
+                   "%define later part2\n")
+        self.write("main.conf",
+                   "name main\n"
+                   "%define part part1\n"
+                   "%include part0.conf\n"
+                   "%include $part.conf\n"
+                   "%include nested.conf\n"
+                   "%include $later.conf\n")
+
+    def load(self, prefetch):
+        loader = RecordingConfigLoader(self.schema, prefetch=prefetch)
+        conf, _ = loader.loadURL(os.path.join(self.tmpdir, "main.conf"))
+        return conf, loader.opened
+
+    def test_same_result(self):
+        conf, opened = self.load(0)
+        conf2, opened2 = self.load(2)
+        self.assertEqual(conf.items,
+                         ["0", "1", "nested", "3", "2"])
+        self.assertEqual(conf2.items, conf.items)
+        self.assertEqual(conf2.name, conf.name)
+
+    def test_prefetch_threads(self):
+        conf, opened = self.load(2)
+        main_thread = threading.current_thread().name
+        threads = {url.rsplit("/", 1)[1]: thread for url, thread in opened}
+        self.assertEqual(threads["main.conf"], main_thread)
+        # includes which can be computed up front are retrieved by the
+        # pool, including nested includes:
+        for name in ("part0.conf", "part1.conf", "nested.conf",
+                     "part3.conf"):
+            self.assertNotEqual(threads[name], main_thread)
+        # $later is defined by an included resource, so the target is
+        # only known once the parser gets there
+        self.assertEqual(threads["part2.conf"], main_thread)
+
+    def test_errors_raised_in_order(self):
+        os.unlink(os.path.join(self.tmpdir, "part0.conf"))
+        self.write("nested.conf", "<bad\n")
+        for prefetch in (0, 2):
+            with self.assertRaises(ZConfig.ConfigurationError) as ctx:
+                self.load(prefetch)
+            self.assertIn("part0.conf", str(ctx.exception))
+
+
+class ReloadTestCase(TempDirHelper, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.schema = ZConfig.loadSchemaFile(StringIO("""\
+            <schema>
+              <sectiontype name='server'>
+                <key name='port' datatype='port-number'/>
+                <key name='host' default='localhost' handler='host'/>
+              </sectiontype>
+              <key name='name'/>
+              <multisection type='server' name='*' attribute='servers'/>
+            </schema>
+            """))
+        self.write("a.conf", self.server("a", 8080))
+        self.write("b.conf", self.server("b", 8081))
+        self.url = self.write("main.conf",
+                              "name main\n"
+                              "%include a.conf\n"
+                              "%include b.conf\n")
+        self.loader = RecordingConfigLoader(self.schema, reloadable=True)
+
+    def server(self, name, port):
+        return "<server %s>\n  port %d\n</server>\n" % (name, port)
+
+    def opened(self):
+        names = [url.rsplit("/", 1)[1] for url, _ in self.loader.opened]
+        del self.loader.opened[:]
+        return names
+
+    def test_unchanged(self):
+        conf, handler = self.loader.loadURL(self.url)
+        self.assertEqual(self.opened(), ["main.conf", "a.conf", "b.conf"])
+        conf2, handler2, changes = self.loader.reload()
+        self.assertIs(conf2, conf)
+        self.assertIs(handler2, handler)
+        self.assertFalse(changes)
+        self.assertEqual(self.opened(), [])
+
+    def test_changed_include(self):
+        conf, handler = self.loader.loadURL(self.url)
+        self.opened()
+        self.write("b.conf", self.server("b", 9090))
+        conf2, handler2, changes = self.loader.reload()
+        self.assertTrue(changes)
+        self.assertEqual(self.opened(), ["b.conf"])
+        base = self.loader.sources[0][:-9]
+        self.assertEqual(changes.resources, [base + "b.conf"])
+        self.assertEqual(changes.removed, [])
+        self.assertEqual([s.port for s in conf2.servers], [8080, 9090])
+        # the unchanged section is re-used, the other one is new:
+        self.assertIs(conf2.servers[0], conf.servers[0])
+        self.assertIsNot(conf2.servers[1], conf.servers[1])
+        self.assertEqual(changes.sections, [conf2.servers[1]])
+        # handlers for re-used sections are still called:
+        hosts = []
+        handler2({"host": hosts.append})
+        self.assertEqual(hosts, ["localhost", "localhost"])
+
+    def test_added_and_removed_includes(self):
+        conf, _ = self.loader.loadURL(self.url)
+        self.write("c.conf", self.server("c", 8082))
+        self.write("main.conf", "name main\n"
+                                "%include a.conf\n"
+                                "%include c.conf\n")
+        conf2, _, changes = self.loader.reload()
+        base = self.loader.sources[0][:-9]
+        self.assertEqual(sorted(changes.resources),
+                         [base + "c.conf", base + "main.conf"])
+        self.assertEqual(changes.removed, [base + "b.conf"])
+        self.assertEqual([s.getSectionName() for s in conf2.servers],
+                         ["a", "c"])
+        self.assertIs(conf2.servers[0], conf.servers[0])
+        self.assertEqual(self.loader.sources,
+                         [base + "main.conf", base + "a.conf",
+                          base + "c.conf"])
+
+    def test_path_url(self):
+        # a path instead of a URL cannot be fingerprinted, but loads
+        path = os.path.join(self.tmpdir, "other.conf")
+        conf, _ = self.loader.loadFile(StringIO("name other\n"), path)
+        self.assertEqual(conf.name, "other")
+        self.assertEqual(self.loader.sources, [path])
+
+    def test_identical_sections_not_shared(self):
+        self.write("main.conf", "<server>\n</server>\n" * 2 + "name x\n")
+        conf, _ = self.loader.loadURL(self.url)
+        self.write("main.conf", "<server>\n</server>\n" * 2 + "name y\n")
+        conf2, _, changes = self.loader.reload()
+        self.assertEqual(changes.sections, [])
+        self.assertIs(conf2.servers[0], conf.servers[0])
+        self.assertIs(conf2.servers[1], conf.servers[1])
+        self.assertIsNot(conf2.servers[0], conf2.servers[1])
+
+    def test_failed_reload_keeps_state(self):
+        conf, _ = self.loader.loadURL(self.url)
+        self.write("b.conf", "<server b>\n  port splat\n</server>\n")
+        self.assertRaises(ZConfig.DataConversionError, self.loader.reload)
+        self.write("b.conf", self.server("b", 8081))
+        conf2, _, changes = self.loader.reload()
+        self.assertEqual([s.port for s in conf2.servers], [8080, 8081])
+
+    def test_changed_environment(self):
+        environ = {"PORT": "8080"}
+        self.write("a.conf", "<server a>\n  port $(PORT)\n</server>\n")
+        loader = ZConfig.loader.ConfigLoader(
+            self.schema, reloadable=True, environ=environ)
+        conf, _ = loader.loadURL(self.url)
+        self.assertFalse(loader.reload()[2])
+        environ["PORT"] = "9090"
+        conf2, _, changes = loader.reload()
+        self.assertTrue(changes)
+        self.assertEqual(changes.resources, [])
+        self.assertEqual(changes.environ, ["PORT"])
+        self.assertEqual([s.port for s in conf2.servers], [9090, 8081])
+        self.assertIs(conf2.servers[1], conf.servers[1])
+
+    def test_changed_multikeys_and_multisections(self):
+        schema = ZConfig.loadSchemaFile(StringIO("""\
+            <schema>
+              <sectiontype name='server'>
+                <multikey name='alias' attribute='aliases'/>
+              </sectiontype>
+              <sectiontype name='group'>
+                <multisection type='server' name='*' attribute='servers'/>
+              </sectiontype>
+              <multisection type='group' name='*' attribute='groups'/>
+            </schema>
+            """))
+
+        def write(a_aliases, b_names):
+            text = "<group a>\n"
+            for name, aliases in zip("xy", a_aliases):
+                text += "<server %s>\n" % name
+                text += "".join("  alias %s\n" % a for a in aliases)
+                text += "</server>\n"
+            text += "</group>\n<group b>\n"
+            text += "".join("<server %s>\n</server>\n" % name
+                            for name in b_names)
+            self.write("main.conf", text + "</group>\n")
+
+        write([["x1", "x2"], ["y1"]], ["p", "q"])
+        loader = ZConfig.loader.ConfigLoader(schema, reloadable=True)
+        conf, _ = loader.loadURL(self.url)
+
+        # a changed multikey value
+        write([["x1", "x3"], ["y1"]], ["p", "q"])
+        conf2, _, changes = loader.reload()
+        a, b = conf.groups
+        a2, b2 = conf2.groups
+        self.assertEqual(a2.servers[0].aliases, ["x1", "x3"])
+        self.assertIsNot(a2.servers[0], a.servers[0])
+        self.assertIs(a2.servers[1], a.servers[1])
+        # the group holding the changed section is converted again
+        self.assertIsNot(a2, a)
+        self.assertIs(b2, b)
+        self.assertEqual(changes.sections, [a2.servers[0], a2])
+
+        # a changed multisection: the order of the sections matters
+        write([["x1", "x3"], ["y1"]], ["q", "p"])
+        conf3, _, changes = loader.reload()
+        a3, b3 = conf3.groups
+        self.assertIs(a3, a2)
+        self.assertEqual([s.getSectionName() for s in b3.servers],
+                         ["q", "p"])
+        self.assertIs(b3.servers[0], b2.servers[1])
+        self.assertIs(b3.servers[1], b2.servers[0])
+        self.assertIsNot(b3, b2)
+        self.assertEqual(changes.sections, [b3])
+
+    def test_changed_component(self):
+        os.mkdir(os.path.join(self.tmpdir, "zconfig_reload_component"))
+        self.write("zconfig_reload_component/__init__.py", "")
+        self.write("zconfig_reload_component/component.xml",
+                   "<component><sectiontype name='thing-a'"
+                   " implements='thing'>"
+                   "<key name='size' datatype='integer'/>"
+                   "</sectiontype></component>")
+        sys.path.insert(0, self.tmpdir)
+        self.addCleanup(sys.modules.pop, "zconfig_reload_component", None)
+        self.addCleanup(sys.path.remove, self.tmpdir)
+        schema = ZConfig.loadSchemaFile(StringIO(
+            "<schema><abstracttype name='thing'/>"
+            "<section type='thing' name='*' attribute='thing'/>"
+            "</schema>"))
+        self.write("main.conf", "%import zconfig_reload_component\n"
+                                "<thing-a>\n  size 1\n</thing-a>\n")
+        loader = ZConfig.loader.ConfigLoader(schema, reloadable=True)
+        conf, _ = loader.loadURL(self.url)
+        self.assertEqual(conf.thing.size, 1)
+        self.assertFalse(loader.reload()[2])
+
+        self.write("zconfig_reload_component/component.xml",
+                   "<component><sectiontype name='thing-a'"
+                   " implements='thing'>"
+                   "<key name='size' datatype='float'/>"
+                   "</sectiontype></component>")
+        conf2, _, changes = loader.reload()
+        self.assertEqual(changes.resources,
+                         ["package:zconfig_reload_component:component.xml"])
+        self.assertIsInstance(conf2.thing.size, float)
+        # other loads use the new component as well
+        conf3, _ = ZConfig.loader.ConfigLoader(schema).loadURL(self.url)
+        self.assertIsInstance(conf3.thing.size, float)
+        self.assertIs(conf3.getSectionDefinition(),
+                      conf2.getSectionDefinition())
+
+    def test_not_reloadable(self):
+        loader = ZConfig.loader.ConfigLoader(self.schema)
+        self.assertRaises(ValueError, loader.reload)
+        loader.loadURL(self.url)
+        self.assertRaises(ValueError, loader.reload)
+        self.loader.loadFile(StringIO("name x\n"))
+        self.assertRaises(ValueError, self.loader.reload)
+
+
+class EnvironmentTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = ZConfig.loadSchemaFile(StringIO("""\
+            <schema>
+              <key name='home'/>
+              <key name='user'/>
+            </schema>
+            """))
+
+    def test_injected_environment(self):
+        environ = {"HOME": "/home/someone", "UNUSED": "x"}
+        loader = ZConfig.loader.ConfigLoader(self.schema, environ=environ)
+        conf, _ = loader.loadFile(StringIO("%define h $(HOME)\nhome $h\n"))
+        self.assertEqual(conf.home, "/home/someone")
+        self.assertEqual(loader.environ_used, {"HOME": "/home/someone"})
+        conf, _ = ZConfig.loadConfigFile(
+            self.schema, StringIO("user $(USER)\n"),
+            environ={"USER": "someone"})
+        self.assertEqual(conf.user, "someone")
+
+    def test_missing_variables_recorded(self):
+        loader = ZConfig.loader.ConfigLoader(self.schema, environ={})
+        self.assertRaises(ZConfig.SubstitutionReplacementError,
+                          loader.loadFile, StringIO("user $(USER)\n"))
+        self.assertEqual(loader.environ_used, {"USER": None})
+
+    def test_environment_copied_once_per_load(self):
+        name = "ZCONFIG_TEST_ENVIRONMENT"
+        os.environ[name] = "before"
+        self.addCleanup(os.environ.pop, name, None)
+        loader = ZConfig.loader.ConfigLoader(self.schema)
+        conf, _ = loader.loadFile(StringIO("home $(%s)\n" % name))
+        self.assertEqual(conf.home, "before")
+        environment = loader._environment
+        os.environ[name] = "after"
+        # the copy taken by the load is not affected
+        self.assertEqual(environment.get(name), "before")
+        conf, _ = loader.loadFile(StringIO("home $(%s)\n" % name))
+        self.assertEqual(conf.home, "after")
+        self.assertEqual(loader.environ_used, {name: "after"})
+
+
+class LoadConfigsTestCase(TempDirHelper, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.schema = ZConfig.loadSchemaFile(StringIO("""\
+            <schema>
+              <multikey name='item' attribute='items'/>
+              <key name='name' required='yes'/>
+            </schema>
+            """))
+        self.write("shared.conf", "item shared\n")
+        self.urls = []
+        for i in range(6):
+            self.urls.append(self.write(
+                "tenant%d.conf" % i,
+                "name tenant%d\n%%include shared.conf\n" % i))
+
+    def test_threads(self):
+        opened = []
+        open_resource = ZConfig.loader.ConfigLoader.openResource
+
+        def openResource(loader, url):
+            opened.append(url)
+            return open_resource(loader, url)
+        with mock.patch.object(ZConfig.loader.ConfigLoader, "openResource",
+                               openResource):
+            results = ZConfig.loadConfigs(self.schema, self.urls, workers=3)
+        self.assertEqual([url for url, _, _ in results], self.urls)
+        for i, (url, result, error) in enumerate(results):
+            self.assertIsNone(error)
+            conf, handler = result
+            self.assertEqual(conf.name, "tenant%d" % i)
+            self.assertEqual(conf.items, ["shared"])
+        shared = [url for url in opened
+                  if url.endswith("/shared.conf")]
+        self.assertEqual(len(shared), 1)
+
+    def test_errors_per_url(self):
+        self.write("tenant1.conf", "item x\n")
+        self.write("tenant2.conf", "<bad\n")
+        os.unlink(self.urls[3])
+        results = ZConfig.loadConfigs(self.schema, self.urls, workers=2)
+        errors = [error for _, _, error in results]
+        self.assertIsNone(errors[0])
+        self.assertIsInstance(errors[1], ZConfig.ConfigurationError)
+        self.assertIsInstance(errors[2], ZConfig.ConfigurationError)
+        self.assertIsInstance(errors[3], ZConfig.ConfigurationError)
+        self.assertIsNone(errors[4])
+        self.assertIsNone(results[1][1])
+        self.assertEqual(results[4][1][0].name, "tenant4")
+
+    def test_include_error_not_cached(self):
+        cache = ZConfig.loader._IncludeCache()
+        loader = ZConfig.loader.ConfigLoader(self.schema)
+        url = loader.normalizeURL(os.path.join(self.tmpdir, "new.conf"))
+        self.assertRaises(ZConfig.ConfigurationError,
+                          cache.open, loader, url)
+        self.write("new.conf", "item new\n")
+        with cache.open(loader, url) as r:
+            self.assertEqual(r.read(), "item new\n")
+        os.unlink(os.path.join(self.tmpdir, "new.conf"))
+        with cache.open(loader, url) as r:
+            self.assertEqual(r.read(), "item new\n")
+
+    def test_processes(self):
+        results = ZConfig.loadConfigs(self.schema, self.urls[:2],
+                                      workers=2, use_processes=True)
+        self.assertEqual([result[0].name for _, result, _ in results],
+                         ["tenant0", "tenant1"])
+        self.assertEqual(results[1][1][0].items, ["shared"])
+
+
+class ManifestTestCase(TempDirHelper, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write("base.xml", "<schema><key name='name'/></schema>")
+        self.write("schema.xml",
+                   "<schema extends='base.xml'>"
+                   "<import package='ZConfig.tests.library.widget'/>"
+                   "<multikey name='item' attribute='items'/>"
+                   "</schema>")
+        self.write("part.conf", "item a\n")
+        self.write("main.conf",
+                   "name main\n"
+                   "%import ZConfig.tests.library.thing\n"
+                   "%include part.conf\n")
+
+    def summary(self, manifest):
+        return [(entry.kind, entry.url.rsplit("/", 1)[-1])
+                for entry in manifest]
+
+    def test_schema_manifest(self):
+        loader = ZConfig.loader.SchemaLoader()
+        schema = loader.loadURL(os.path.join(self.tmpdir, "schema.xml"))
+        self.assertEqual(self.summary(loader.manifest), [
+            ("schema", "schema.xml"),
+            ("schema", "base.xml"),
+            ("component", "package:ZConfig.tests.library.widget:"
+                          "component.xml"),
+        ])
+        entry = loader.manifest[0]
+        self.assertEqual(entry.size, os.path.getsize(
+            os.path.join(self.tmpdir, "schema.xml")))
+        self.assertEqual(entry.fingerprint,
+                         ZConfig.loader.resourceFingerprint(entry.url))
+        self.assertGreaterEqual(entry.elapsed, 0.0)
+        self.assertEqual(
+            [entry.url for entry in loader.manifest], schema.sources)
+
+    def test_config_manifest(self):
+        schema = ZConfig.loader.SchemaLoader().loadURL(
+            os.path.join(self.tmpdir, "schema.xml"))
+        loader = ZConfig.loader.ConfigLoader(schema)
+        loader.loadURL(os.path.join(self.tmpdir, "main.conf"))
+        expected = [
+            ("config", "main.conf"),
+            ("component", "package:ZConfig.tests.library.thing:"
+                          "component.xml"),
+            ("include", "part.conf"),
+        ]
+        self.assertEqual(self.summary(loader.manifest), expected)
+        self.assertEqual(loader.manifest[2].size, 7)
+        total = sum(entry.elapsed for entry in loader.manifest)
+        self.assertGreater(total, 0.0)
+        # the component is now taken from the shared extended schema,
+        # but still listed:
+        loader.loadURL(os.path.join(self.tmpdir, "main.conf"))
+        self.assertEqual(self.summary(loader.manifest), expected)
+
+    def test_manifest_of_file(self):
+        schema = ZConfig.loader.SchemaLoader().loadURL(
+            os.path.join(self.tmpdir, "schema.xml"))
+        loader = ZConfig.loader.ConfigLoader(schema)
+        loader.loadFile(StringIO("item x\n"))
+        entry, = loader.manifest
+        self.assertEqual((entry.kind, entry.url, entry.size),
+                         ("config", None, None))
+
+
+class LocalFileTestCase(TempDirHelper, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.tmpdir, "sample.conf")
+        with open(self.path, "wb") as f:
+            f.write("key caf\u00e9\r\nother value\n".encode("utf-8"))
+        self.url = ZConfig.url.urlnormalize(
+            "file://" + urllib.request.pathname2url(self.path))
+
+    def read_lines(self, loader):
+        with loader.openResource(self.url) as r:
+            self.assertEqual(r.url, self.url)
+            return list(iter(r.readline, ""))
+
+    def test_file_opened_directly(self):
+        loader = ZConfig.loader.SchemaLoader()
+        with loader.openResource(self.url) as r:
+            f = r.file
+            # not read into memory, and no file name to confuse the
+            # XML parser
+            self.assertNotIsInstance(f, StringIO)
+            self.assertNotIsInstance(getattr(f, "name", 0), str)
+        self.assertTrue(f.closed)
+        self.assertEqual(self.read_lines(loader),
+                         ["key caf\u00e9\r\n", "other value\n"])
+
+    def test_mmap_reader(self):
+        loader = ZConfig.loader.SchemaLoader()
+        loader.mmap_threshold = 1
+        with loader.openResource(self.url) as r:
+            f = r.file
+            self.assertIsInstance(f, ZConfig.loader._MappedTextFile)
+            self.assertEqual(r.read(5), "key c")
+            # the read stops inside a multi-byte character
+            self.assertEqual(r.read(3), "af")
+            self.assertEqual(r.readline(), "\u00e9\r\n")
+            self.assertEqual(r.read(), "other value\n")
+            self.assertEqual(r.readline(), "")
+        self.assertTrue(f.closed)
+        self.assertEqual(self.read_lines(loader),
+                         ["key caf\u00e9\r\n", "other value\n"])
+
+    def test_empty_file_not_mapped(self):
+        open(self.path, "w").close()
+        loader = ZConfig.loader.SchemaLoader()
+        loader.mmap_threshold = 0
+        self.assertEqual(self.read_lines(loader), [])
+
+    def test_missing_file(self):
+        loader = ZConfig.loader.SchemaLoader()
+        os.unlink(self.path)
+        with self.assertRaises(ZConfig.ConfigurationError) as ctx:
+            loader.openResource(self.url)
+        self.assertEqual(ctx.exception.url, self.url)
+
+    def test_not_utf8(self):
+        with open(self.path, "wb") as f:
+            f.write("key café\n".encode("latin-1"))
+        schema = ZConfig.loadSchemaFile(StringIO(
+            "<schema><key name='key'/></schema>"))
+        for threshold in (None, 1):
+            loader = ZConfig.loader.ConfigLoader(schema)
+            loader.mmap_threshold = threshold
+            with self.assertRaises(ZConfig.ConfigurationError) as ctx:
+                loader.loadURL(self.url)
+            self.assertEqual(ctx.exception.url, self.url)
+            self.assertIn("error reading file " + self.path,
+                          str(ctx.exception))
+            self.assertIsInstance(ctx.exception.__cause__,
+                                  UnicodeDecodeError)
+
+    def test_schema_positions_use_url(self):
+        with open(self.path, "w") as f:
+            f.write("<schema>\n"
+                    "<key name='k' datatype='integer' default='x'/>\n"
+                    "</schema>\n")
+        schema = ZConfig.loader.SchemaLoader().loadURL(self.url)
+        with self.assertRaises(ZConfig.DataConversionError) as ctx:
+            ZConfig.loader.ConfigLoader(schema).loadFile(StringIO(""))
+        self.assertEqual(ctx.exception.url, self.url)
+        self.assertEqual(ctx.exception.lineno, 2)
+
+
+def server_section(section):
+    server_sections.append(section.getSectionName())
+    return section.port, section.alias
+
+
+server_sections = []
+
+
+class CollectErrorsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = ZConfig.loadSchemaFile(StringIO("""\
+            <schema>
+              <sectiontype name='server'
+                  datatype='ZConfig.tests.test_loader.server_section'>
+                <key name='port' datatype='integer' required='yes'/>
+                <multikey name='alias' datatype='ipaddr-or-hostname'/>
+              </sectiontype>
+              <key name='workers' datatype='integer'/>
+              <key name='debug' datatype='boolean' default='off'/>
+              <multisection type='server' name='*' attribute='servers'/>
+            </schema>
+            """))
+        del server_sections[:]
+
+    def load(self, text, **kw):
+        loader = ZConfig.loader.ConfigLoader(
+            self.schema, collect_errors=True, **kw)
+        return loader.loadFile(StringIO(text), "file:///test.conf")
+
+    def errors(self, text, **kw):
+        with self.assertRaises(ZConfig.MultipleConfigurationErrors) as ctx:
+            self.load(text, **kw)
+        return [(type(e).__name__, e.message, e.lineno, e.url)
+                for e in ctx.exception.errors]
+
+    def test_no_errors(self):
+        conf, handler = self.load("workers 4\n<server a>\nport 80\n</server>")
+        self.assertEqual(conf.workers, 4)
+        self.assertEqual(conf.servers, [(80, [])])
+
+    def test_all_errors_reported(self):
+        url = "file:///test.conf"
+        errors = self.errors(
+            "workers many\n"
+            "colour blue\n"
+            "debug on\n"
+            "debug off\n"
+            "(bad\n"
+            "<server a>\n"
+            "  alias ::bad::\n"
+            "  port http\n"
+            "</server>\n"
+            "<server b>\n"
+            "</server>\n"
+            "<client c>\n"
+            "  port 1\n"
+            "</client>\n"
+            "<server c>\n"
+            "  port 2\n"
+            "</servers>\n"
+            "key $undefined\n")
+        self.assertEqual(errors, [
+            ("ConfigurationSyntaxError", "'colour' is not a known key name",
+             2, url),
+            ("ConfigurationSyntaxError",
+             "'debug' does not support multiple values", 4, url),
+            ("ConfigurationSyntaxError", "malformed configuration data",
+             5, url),
+            ("DataConversionError",
+             "invalid literal for int() with base 10: 'http'", 8, url),
+            ("DataConversionError", "'::bad::' is not a valid IPv6 address",
+             7, url),
+            ("ConfigurationSyntaxError",
+             "no values for 'port'; 1 required", 11, url),
+            ("ConfigurationSyntaxError", "unknown type name: 'client'",
+             12, url),
+            ("ConfigurationSyntaxError", "unbalanced section end", 17, url),
+            ("SubstitutionReplacementError", "no replacement for 'undefined'",
+             18, url),
+            ("DataConversionError",
+             "invalid literal for int() with base 10: 'many'", 1, url),
+        ])
+
+    def test_positions_reported(self):
+        with self.assertRaises(ZConfig.MultipleConfigurationErrors) as ctx:
+            self.load("workers 1\ncolour blue\nworkers 2\n")
+        self.assertEqual(str(ctx.exception).splitlines(), [
+            "'colour' is not a known key name",
+            "(line 2 in file:///test.conf)",
+            "'workers' does not support multiple values",
+            "(line 3 in file:///test.conf)",
+        ])
+
+    def test_section_datatypes_not_called_with_errors(self):
+        self.errors("<server a>\n  port 1\n</server>\n"
+                    "<server b>\n  port x\n</server>\n")
+        self.assertEqual(server_sections, ["a"])
+
+    def test_errors_in_included_files(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, "inc.conf")
+        with open(path, "w") as f:
+            f.write("# included\nworkers x\n<server a>\n")
+        url = ZConfig.url.urlnormalize(
+            "file://" + urllib.request.pathname2url(path))
+        errors = self.errors("%include " + url + "\ncolour red\n")
+        self.assertEqual(errors, [
+            ("ConfigurationSyntaxError", "unclosed sections not allowed",
+             3, url),
+            ("ConfigurationSyntaxError", "'colour' is not a known key name",
+             2, "file:///test.conf"),
+            ("DataConversionError",
+             "invalid literal for int() with base 10: 'x'", 2, url),
+        ])
+
+    def test_str(self):
+        e = ZConfig.MultipleConfigurationErrors([
+            ZConfig.ConfigurationSyntaxError("first", "file:///a.conf", 1),
+            ZConfig.ConfigurationError("second"),
+        ])
+        self.assertIsInstance(e, ZConfig.ConfigurationError)
+        self.assertEqual(str(e), "first\n(line 1 in file:///a.conf)\nsecond")
+
+    def test_default_mode_stops_at_first_error(self):
+        loader = ZConfig.loader.ConfigLoader(self.schema)
+        with self.assertRaises(ZConfig.ConfigurationError) as ctx:
+            loader.loadFile(StringIO("colour blue\nworkers x\n"))
+        self.assertNotIsInstance(ctx.exception,
+                                 ZConfig.MultipleConfigurationErrors)
+        self.assertEqual(ctx.exception.message,
+                         "'colour' is not a known key name")
+
+
 class TestNonExistentResources(unittest.TestCase):
 
     # XXX Not sure if this is the best approach for these.  These
@@ -12,13 +12,22 @@
 #
 ##############################################################################
 
+import pickle
 import unittest
+from io import StringIO
 
+import ZConfig
 from ZConfig import ConfigurationError
 from ZConfig import DataConversionError
+from ZConfig.info import ValueInfo
+from ZConfig.loader import ConfigLoader
+from ZConfig.loader import SchemaLoader
 from ZConfig.matcher import BaseMatcher
+from ZConfig.matcher import LazySectionValue
 from ZConfig.matcher import SectionMatcher
 from ZConfig.matcher import SectionValue
+from ZConfig.matcher import SlottedSectionValue
+from ZConfig.matcher import getvalueclass
 from ZConfig.tests.support import TestHelper
 
 
@@ -146,3 +155,237 @@ class BaseMatcherTestCase(TestHelper, unittest.TestCase):
                                'is not an allowed name',
                                matcher.createChildMatcher,
                                MockType(), 'ignored')
+
+    def test_type_without_load_plan(self):
+        schema = self.load_schema_text("""\
+            <schema>
+              <key name='a' datatype='integer' default='1'/>
+              <multikey name='b' datatype='integer'/>
+              <key name='+' attribute='c'/>
+            </schema>
+            """)
+
+        class MockType(list):
+            name = 'mock'
+
+        type_ = MockType(schema)
+        matcher = BaseMatcher(None, type_, None)
+        self.assertEqual(matcher._values, {'a': None, 'b': [], 'c': {}})
+        matcher._values['b'].append(ValueInfo('2', None))
+        section = matcher.finish()
+        self.assertEqual((section.a, section.b, section.c), (1, [2], {}))
+
+
+converted = []
+
+
+def counted(value):
+    converted.append(value)
+    return int(value)
+
+
+class LazySectionValueTestCase(TestHelper, unittest.TestCase):
+
+    schema_text = """\
+        <schema>
+          <sectiontype name='part'>
+            <key name='size' datatype='ZConfig.tests.test_matcher.counted'/>
+          </sectiontype>
+          <key name='count' datatype='ZConfig.tests.test_matcher.counted'/>
+          <key name='handled' datatype='ZConfig.tests.test_matcher.counted'
+               handler='handled'/>
+          <multikey name='number'
+               datatype='ZConfig.tests.test_matcher.counted'/>
+          <key name='+' attribute='map'
+               datatype='ZConfig.tests.test_matcher.counted'/>
+          <key name='default' datatype='integer' default='7'/>
+          <multisection type='part' name='*' attribute='parts'/>
+        </schema>
+        """
+
+    def setUp(self):
+        self.schema = self.load_schema_text(self.schema_text)
+        del converted[:]
+
+    def load(self, text, **kw):
+        loader = ConfigLoader(self.schema, lazy=True, **kw)
+        conf, handlers = loader.loadFile(StringIO(text))
+        return conf
+
+    def test_lazy(self):
+        conf = self.load("count 1\nhandled 2\nnumber 3\nnumber 4\n"
+                         "a 5\n<part>\n  size 6\n</part>\n")
+        self.assertIsInstance(conf, LazySectionValue)
+        # values of keys with handlers are converted while loading
+        self.assertEqual(converted, ["2"])
+        self.assertEqual(conf.number, [3, 4])
+        self.assertEqual(converted, ["2", "3", "4"])
+        self.assertEqual(conf.number, [3, 4])
+        self.assertEqual(converted, ["2", "3", "4"])
+        self.assertEqual(conf.default, 7)
+        self.assertEqual(conf.getSectionAttributes(),
+                         ("count", "handled", "number", "map", "default",
+                          "parts"))
+        conf.validate_all()
+        self.assertEqual(sorted(converted), ["1", "2", "3", "4", "5", "6"])
+        self.assertEqual((conf.count, conf.map, conf.parts[0].size),
+                         (1, {"a": 5}, 6))
+        self.assertIn("count", str(conf))
+        self.assertRaises(AttributeError, getattr, conf, "missing")
+
+    def test_errors(self):
+        conf = self.load("count x\na 1\nb y\n<part>\n  size z\n</part>\n")
+        part = conf.parts[0]
+        for _ in range(2):
+            with self.assertRaises(DataConversionError) as ctx:
+                conf.map
+            self.assertEqual(ctx.exception.value, "y")
+            self.assertEqual(ctx.exception.lineno, 3)
+        self.assertRaises(DataConversionError, getattr, conf, "count")
+        self.assertRaises(DataConversionError, getattr, part, "size")
+        self.assertRaises(DataConversionError, part.validate_all)
+        self.assertRaises(DataConversionError, conf.validate_all)
+
+    def test_not_lazy(self):
+        # Collecting errors means converting everything.
+        with self.assertRaises(ZConfig.MultipleConfigurationErrors):
+            self.load("count x\n", collect_errors=True)
+
+
+def tagged(section):
+    section.tag = "tagged"
+    return section
+
+
+class SlottedSectionValueTestCase(TestHelper, unittest.TestCase):
+
+    schema_text = """\
+        <schema>
+          <sectiontype name='part'
+                       datatype='ZConfig.tests.test_matcher.tagged'>
+            <key name='size' datatype='integer' default='1'/>
+          </sectiontype>
+          <sectiontype name='odd'>
+            <key name='name' attribute='_name'/>
+          </sectiontype>
+          <key name='count' datatype='integer'/>
+          <multisection type='part' name='*' attribute='parts'/>
+          <section type='odd' name='*' attribute='odd'/>
+        </schema>
+        """
+
+    def setUp(self):
+        self.schema = self.load_schema_text(self.schema_text)
+
+    def load(self, text, **kw):
+        loader = ConfigLoader(self.schema, slots=True, **kw)
+        conf, handlers = loader.loadFile(StringIO(text))
+        return conf
+
+    def test_slots(self):
+        conf = self.load("count 2\n<part p>\n  size 3\n</part>\n<part/>\n")
+        self.assertIsInstance(conf, SlottedSectionValue)
+        self.assertEqual(vars(conf), {})
+        self.assertEqual(conf.count, 2)
+        self.assertEqual(conf.getSectionAttributes(),
+                         ("count", "parts", "odd"))
+        first, second = conf.parts
+        self.assertIs(type(first), type(second))
+        self.assertIs(type(first), getvalueclass(self.schema.gettype("part")))
+        self.assertEqual((first.size, second.size), (3, 1))
+        self.assertEqual(first.getSectionName(), "p")
+        self.assertEqual(first.getSectionType(), "part")
+        self.assertTrue(repr(first).startswith("<SectionValue for part 'p'"))
+        # attributes set by datatypes are kept as well
+        self.assertEqual(first.tag, "tagged")
+        self.assertEqual(str(first), "size%s: 3\ntag%s: tagged"
+                         % (" " * 36, " " * 37))
+
+    def test_same_as_without_slots(self):
+        text = ("count 2\n<part p>\n  size 3\n</part>\n"
+                "<odd>\n  name n\n</odd>\n")
+        plain, _ = ConfigLoader(self.schema).loadFile(StringIO(text))
+        for conf in self.load(text), self.load(text, codegen=True):
+            self.assertEqual(str(conf), str(plain))
+            self.assertEqual(conf.parts[0].size, plain.parts[0].size)
+
+    def test_not_slotted(self):
+        # attributes clashing with those of SectionValue are not slots
+        self.assertIs(getvalueclass(self.schema.gettype("odd")),
+                      SectionValue)
+        conf = self.load("<odd>\nname n\n</odd>\n")
+        self.assertIs(type(conf.odd), SectionValue)
+
+
+class PicklingTestCase(TestHelper, unittest.TestCase):
+
+    schema_text = SlottedSectionValueTestCase.schema_text
+    config_text = "count 2\n<part p>\n  size 3\n</part>\n<part q/>\n"
+
+    def setUp(self):
+        self.schema = self.load_schema_text(self.schema_text)
+
+    def load(self, schema=None, text=None, **kw):
+        loader = ConfigLoader(schema or self.schema, **kw)
+        conf, handlers = loader.loadFile(StringIO(text or self.config_text))
+        return conf
+
+    def check(self, conf):
+        copy = pickle.loads(pickle.dumps(conf))
+        self.assertIs(type(copy), type(conf))
+        self.assertEqual(str(copy), str(conf))
+        self.assertEqual(copy.getSectionAttributes(),
+                         conf.getSectionAttributes())
+        self.assertIs(copy.getSectionDefinition(), self.schema)
+        first = copy.parts[0]
+        self.assertEqual((first.size, first.tag), (3, "tagged"))
+        self.assertEqual(first.getSectionName(), "p")
+        self.assertIs(first.getSectionDefinition(),
+                      self.schema.gettype("part"))
+        self.assertIs(first.getSectionMatcher(),
+                      copy.parts[1].getSectionMatcher())
+        return copy
+
+    def test_pickle(self):
+        conf = self.load()
+        data = pickle.dumps(conf)
+        # neither the matchers nor the schema are pickled
+        self.assertNotIn(b"SectionMatcher", data)
+        self.assertNotIn(b"SchemaType", data)
+        copy = self.check(conf)
+        self.check(copy)
+
+    def test_slots_lazy_codegen(self):
+        for kw in {"slots": True}, {"lazy": True}, {"codegen": True}:
+            self.check(self.load(**kw))
+
+    def test_lazy_converted(self):
+        conf = self.load(text="count x\n", lazy=True)
+        self.assertRaises(DataConversionError, pickle.dumps, conf)
+
+    def test_imports(self):
+        loader = ConfigLoader(self.schema)
+        conf, _ = loader.loadFile(StringIO(
+            "%import ZConfig.tests.library.widget\n" + self.config_text))
+        copy = self.check(conf)
+        ref = copy.getSectionMatcher().schemaref
+        self.assertEqual(ref.imports,
+                         ("package:ZConfig.tests.library.widget:"
+                          "component.xml",))
+        self.assertIs(ref.gettype("widget-a"),
+                      loader.schema.gettype("widget-a"))
+
+    def test_not_registered(self):
+        # sections are pickled with their schema
+        schema = SchemaLoader().loadFile(StringIO(self.schema_text))
+        for kw in {}, {"slots": True}:
+            conf = self.load(schema, **kw)
+            data = pickle.dumps(conf)
+            self.assertEqual(data.count(b"SchemaType"), 1)
+            copy = pickle.loads(data)
+            self.assertEqual(type(copy).__bases__, type(conf).__bases__)
+            self.assertEqual(str(copy), str(conf))
+            self.assertEqual(copy.parts[0].getSectionType(), "part")
+            self.assertEqual(copy.parts[0].size, 3)
+            self.assertIs(copy.parts[0].getSectionDefinition(),
+                          copy.getSectionDefinition().gettype("part"))
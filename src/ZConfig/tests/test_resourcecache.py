@@ -0,0 +1,172 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests of ZConfig.resourcecache."""
+
+import hashlib
+import http.server
+import os
+import threading
+import unittest
+import urllib.error
+from io import StringIO
+
+import ZConfig
+from ZConfig.loader import ConfigLoader
+from ZConfig.resourcecache import ResourceCache
+from ZConfig.tests.support import TempDirHelper
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.path)
+        if self.path in server.failing:
+            self.send_error(503)
+            return
+        if self.path not in server.documents:
+            self.send_error(404)
+            return
+        body = server.documents[self.path].encode("utf-8")
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            server.not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ResourceCacheTestCase(TempDirHelper, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), _Handler)
+        self.server.documents = {"/a.conf": "key value\n"}
+        self.server.failing = set()
+        self.server.requests = []
+        self.server.not_modified = 0
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       args=(0.05,))
+        self.thread.daemon = True
+        self.thread.start()
+        self.base = "http://127.0.0.1:%d" % self.server.server_address[1]
+
+    def tearDown(self):
+        self.stop_server()
+
+    def stop_server(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.thread.join()
+            self.server = None
+
+    def create_cache(self, **kw):
+        return ResourceCache(os.path.join(self.tmpdir, "cache"), **kw)
+
+    def test_fresh_copy_served_from_cache(self):
+        cache = self.create_cache()
+        url = self.base + "/a.conf"
+        self.assertEqual(cache.read(url), b"key value\n")
+        self.assertEqual(cache.read(url), b"key value\n")
+        self.assertEqual(self.server.requests, ["/a.conf"])
+
+    def test_revalidation(self):
+        cache = self.create_cache(ttl=0)
+        url = self.base + "/a.conf"
+        self.assertEqual(cache.read(url), b"key value\n")
+        self.assertEqual(cache.read(url), b"key value\n")
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.server.not_modified, 1)
+        self.server.documents["/a.conf"] = "key other\n"
+        self.assertEqual(cache.read(url), b"key other\n")
+        self.assertEqual(self.server.not_modified, 1)
+
+    def test_stale_on_error(self):
+        cache = self.create_cache(ttl=0)
+        url = self.base + "/a.conf"
+        cache.read(url)
+        self.server.failing.add("/a.conf")
+        self.assertEqual(cache.read(url), b"key value\n")
+        self.stop_server()
+        self.assertEqual(cache.read(url), b"key value\n")
+
+    def test_no_stale_on_error(self):
+        cache = self.create_cache(ttl=0, stale_on_error=False)
+        url = self.base + "/a.conf"
+        cache.read(url)
+        self.server.failing.add("/a.conf")
+        self.assertRaises(urllib.error.HTTPError, cache.read, url)
+        self.stop_server()
+        self.assertRaises(OSError, cache.read, url)
+
+    def test_missing_resource(self):
+        cache = self.create_cache(ttl=0)
+        self.assertRaises(urllib.error.HTTPError,
+                          cache.read, self.base + "/missing.conf")
+        url = self.base + "/a.conf"
+        cache.read(url)
+        del self.server.documents["/a.conf"]
+        # a resource that was removed is not served from the cache
+        self.assertRaises(urllib.error.HTTPError, cache.read, url)
+
+    def test_size_limit(self):
+        cache = self.create_cache(max_size=25)
+        self.server.documents["/b.conf"] = "key other value\n"
+        self.server.documents["/big.conf"] = "x" * 26
+        cache.read(self.base + "/a.conf")
+        cache.read(self.base + "/b.conf")
+        # a.conf was dropped to make room for b.conf
+        self.assertEqual(len(os.listdir(cache.directory)), 2)
+        self.assertIsNone(cache._read_meta(self.base + "/a.conf"))
+        # resources larger than the limit are not stored at all
+        cache.read(self.base + "/big.conf")
+        self.assertEqual(len(os.listdir(cache.directory)), 2)
+        self.assertIsNone(cache._read_meta(self.base + "/big.conf"))
+        cache.clear()
+        self.assertEqual(os.listdir(cache.directory), [])
+
+    def test_invalidate(self):
+        cache = self.create_cache()
+        url = self.base + "/a.conf"
+        cache.read(url)
+        cache.invalidate(url)
+        cache.read(url)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_loader_integration(self):
+        schema = ZConfig.loadSchemaFile(StringIO(
+            "<schema><key name='key'/></schema>"))
+        loader = ConfigLoader(schema)
+        loader.resource_cache = self.create_cache()
+        url = self.base + "/a.conf"
+        conf, _ = loader.loadFile(StringIO("%include " + url))
+        self.assertEqual(conf.key, "value")
+        self.stop_server()
+        conf, _ = loader.loadURL(url)
+        self.assertEqual(conf.key, "value")
+        loader.resource_cache.invalidate(url)
+        with self.assertRaises(ZConfig.ConfigurationError) as ctx:
+            loader.loadURL(url)
+        self.assertIn("error opening URL", str(ctx.exception))
@@ -0,0 +1,249 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests of ZConfig.schemacache."""
+
+import os
+import threading
+import unittest
+from io import StringIO
+from unittest import mock
+
+import ZConfig
+import ZConfig.schema
+from ZConfig.loader import ConfigLoader
+from ZConfig.loader import SchemaLoader
+from ZConfig.schemacache import SchemaCache
+from ZConfig.schemacache import SchemaRegistry
+from ZConfig.schemacache import shared_schemas
+from ZConfig.tests.support import TempDirHelper
+
+
+SCHEMA = """\
+<schema>
+  <import package='ZConfig.components.logger'/>
+  <key name='port' datatype='port-number' default='8080'/>
+  <multisection type='logger' name='*' attribute='loggers'/>
+</schema>
+"""
+
+
+class SchemaCacheTestCase(TempDirHelper, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = SchemaCache(os.path.join(self.tmpdir, "cache"))
+        self.schema_path = self.write("schema.xml", SCHEMA)
+        patcher = mock.patch.object(ZConfig.schema, "parseResource",
+                                    side_effect=ZConfig.schema.parseResource)
+        self.parseResource = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @property
+    def parses(self):
+        return self.parseResource.call_count
+
+    def load(self, registry=None):
+        loader = SchemaLoader(registry, cache=self.cache)
+        return loader.loadURL(self.schema_path)
+
+    def test_sources_recorded(self):
+        schema = self.load()
+        self.assertTrue(schema.sources[0].endswith("/schema.xml"))
+        self.assertIn("package:ZConfig.components.logger:component.xml",
+                      schema.sources)
+        self.assertIn("package:ZConfig.components.logger:handlers.xml",
+                      schema.sources)
+
+    def test_warm_load_skips_parsing(self):
+        schema1 = self.load()
+        self.assertEqual(self.parses, 1)
+        schema2 = self.load()
+        self.assertEqual(self.parses, 1)
+        self.assertIsNot(schema1, schema2)
+        self.assertEqual(schema1.sources, schema2.sources)
+        self.assertEqual(sorted(schema1.gettypenames()),
+                         sorted(schema2.gettypenames()))
+
+    def test_cached_schema_uses_loader_registry(self):
+        self.load()
+        registry = ZConfig.datatypes.Registry()
+        schema = self.load(registry)
+        self.assertEqual(self.parses, 1)
+        self.assertIs(schema.registry, registry)
+        self.assertIs(schema.getinfo("port").datatype,
+                      registry.get("port-number"))
+
+    def test_cached_schema_loads_config(self):
+        self.load()
+        schema = self.load()
+        conf, handler = ConfigLoader(schema).loadFile(StringIO(
+            "port 9000\n"
+            "<logger>\n"
+            "  level info\n"
+            "</logger>\n"))
+        self.assertEqual(conf.port, 9000)
+        self.assertEqual(conf.loggers[0].level, 20)
+
+    def test_change_invalidates(self):
+        self.load()
+        self.write("schema.xml", SCHEMA.replace("8080", "8081"))
+        schema = self.load()
+        self.assertEqual(self.parses, 2)
+        self.assertEqual(schema.getinfo("port").getdefault().value, "8081")
+
+    def test_invalidate_and_clear(self):
+        schema = self.load()
+        self.cache.invalidate(schema.url)
+        self.load()
+        self.assertEqual(self.parses, 2)
+        self.cache.clear()
+        self.load()
+        self.assertEqual(self.parses, 3)
+        self.cache.invalidate("file:///no/such/schema.xml")
+
+    def test_corrupt_entry_is_a_miss(self):
+        schema = self.load()
+        with open(self.cache._filename(schema.url), "wb") as f:
+            f.write(b"not a pickle")
+        self.load()
+        self.assertEqual(self.parses, 2)
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "needs file ownership")
+    def test_directory_private(self):
+        directory = os.path.join(self.tmpdir, "new", "cache")
+        SchemaCache(directory)
+        self.assertFalse(os.stat(directory).st_mode & 0o077)
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "needs file ownership")
+    def test_untrusted_directory_refused(self):
+        os.chmod(self.cache.directory, 0o777)
+        self.assertRaisesRegex(ZConfig.ConfigurationError,
+                               "refusing to use",
+                               SchemaCache, self.cache.directory)
+        os.chmod(self.cache.directory, 0o700)
+        with mock.patch("os.getuid", return_value=os.getuid() + 1):
+            self.assertRaises(ZConfig.ConfigurationError,
+                              SchemaCache, self.cache.directory)
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "needs file ownership")
+    def test_untrusted_entry_is_a_miss(self):
+        schema = self.load()
+        os.chmod(self.cache._filename(schema.url), 0o666)
+        self.load()
+        self.assertEqual(self.parses, 2)
+
+    def test_schema_without_url_not_cached(self):
+        loader = SchemaLoader(cache=self.cache)
+        loader.loadFile(StringIO(SCHEMA))
+        self.assertEqual(os.listdir(self.cache.directory), [])
+
+
+class SchemaRegistryTestCase(TempDirHelper, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.schema_path = self.write("schema.xml", SCHEMA)
+        self.registry = SchemaRegistry(maxsize=2)
+
+    def test_load_url_shared(self):
+        schema1 = self.registry.loadURL(self.schema_path)
+        schema2 = self.registry.loadURL(self.schema_path)
+        self.assertIs(schema1, schema2)
+        self.assertEqual(len(self.registry), 1)
+
+    def test_load_file_shared_by_content(self):
+        schema1 = self.registry.loadFile(StringIO(SCHEMA))
+        schema2 = self.registry.loadFile(StringIO(SCHEMA))
+        self.assertIs(schema1, schema2)
+        schema3 = self.registry.loadFile(StringIO(SCHEMA + " "))
+        self.assertIsNot(schema1, schema3)
+        schema4 = self.registry.loadFile(StringIO(SCHEMA),
+                                         "file:///tmp/other.xml")
+        self.assertIsNot(schema1, schema4)
+
+    def test_getkey_lookup(self):
+        by_url = self.registry.loadURL(self.schema_path)
+        by_text = self.registry.loadFile(StringIO(SCHEMA))
+        url_key = self.registry.getkey(by_url)
+        text_key = self.registry.getkey(by_text)
+        self.assertIs(self.registry.lookup(url_key), by_url)
+        self.assertIs(self.registry.lookup(text_key), by_text)
+        self.assertIsNone(self.registry.getkey(
+            SchemaLoader().loadFile(StringIO(SCHEMA))))
+        # the least recently used schema is dropped
+        self.registry.loadURL(self.schema_path)
+        self.registry.loadFile(StringIO(SCHEMA + " "))
+        self.assertIsNone(self.registry.getkey(by_text))
+        self.assertEqual(self.registry.getkey(by_url), url_key)
+        self.registry.clear()
+        self.assertIsNone(self.registry.getkey(by_url))
+        # schemas loaded by URL are loaded again
+        self.assertEqual(self.registry.lookup(url_key).url, by_url.url)
+        self.assertRaises(KeyError, self.registry.lookup, text_key)
+
+    def test_changed_source_reloads(self):
+        schema1 = self.registry.loadURL(self.schema_path)
+        self.write("schema.xml", SCHEMA.replace("8080", "8081"))
+        schema2 = self.registry.loadURL(self.schema_path)
+        self.assertIsNot(schema1, schema2)
+        self.assertEqual(schema2.getinfo("port").getdefault().value, "8081")
+
+    def test_invalidate(self):
+        schema1 = self.registry.loadURL(self.schema_path)
+        self.registry.invalidate(
+            "package:ZConfig.components.logger:logger.xml")
+        self.assertEqual(len(self.registry), 0)
+        schema2 = self.registry.loadURL(self.schema_path)
+        self.assertIsNot(schema1, schema2)
+        self.registry.loadFile(StringIO(SCHEMA))
+        self.assertEqual(len(self.registry), 2)
+        self.registry.invalidate(schema2.url)
+        self.assertEqual(len(self.registry), 1)
+        # only URLs match, not the other parts of the keys
+        schema3 = self.registry.loadFile(StringIO(SCHEMA))
+        for other in ("url", "sha1", self.registry.getkey(schema3)[1]):
+            self.registry.invalidate(other)
+        self.assertEqual(len(self.registry), 1)
+        self.registry.clear()
+        self.assertEqual(len(self.registry), 0)
+
+    def test_bounded(self):
+        schema1 = self.registry.loadURL(self.schema_path)
+        self.registry.loadFile(StringIO("<schema/>"))
+        self.registry.loadURL(self.schema_path)
+        self.registry.loadFile(StringIO("<schema></schema>"))
+        self.assertEqual(len(self.registry), 2)
+        # the most recently used schema was kept
+        self.assertIs(self.registry.loadURL(self.schema_path), schema1)
+
+    def test_threads_share_one_schema(self):
+        results = []
+
+        def load():
+            results.append(self.registry.loadURL(self.schema_path))
+        threads = [threading.Thread(target=load) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(results), 8)
+        self.assertEqual(len({id(schema) for schema in results}), 1)
+
+    def test_load_schema_uses_shared_registry(self):
+        schema1 = ZConfig.loadSchema(self.schema_path)
+        self.assertIs(ZConfig.loadSchema(self.schema_path), schema1)
+        self.assertIs(ZConfig.loadSchemaFile(StringIO(SCHEMA)),
+                      ZConfig.loadSchemaFile(StringIO(SCHEMA)))
+        shared_schemas.invalidate(schema1.url)
+        self.assertIsNot(ZConfig.loadSchema(self.schema_path), schema1)
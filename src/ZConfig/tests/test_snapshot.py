@@ -0,0 +1,181 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests of ZConfig.snapshot."""
+
+import os
+import unittest
+from io import StringIO
+from unittest import mock
+
+import ZConfig
+import ZConfig.cfgparser
+import ZConfig.snapshot
+from ZConfig.loader import ConfigLoader
+from ZConfig.tests.support import TempDirHelper
+
+
+SCHEMA = """\
+<schema>
+  <sectiontype name='server'>
+    <key name='port' datatype='port-number'/>
+    <key name='host' default='localhost'/>
+  </sectiontype>
+  <key name='name'/>
+  <key name='home' datatype='existing-directory'/>
+  <multisection type='server' name='*' attribute='servers'/>
+</schema>
+"""
+
+CONFIG = """\
+name $(ZCONFIG_SNAPSHOT_NAME)
+home .
+%include servers.conf
+"""
+
+
+class SnapshotTestCase(TempDirHelper, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.schema = ZConfig.loadSchema(self.write("schema.xml", SCHEMA))
+        self.url = self.write("main.conf", CONFIG)
+        self.write("servers.conf", self.servers(8080))
+        self.snapshot = os.path.join(self.tmpdir, "main.snapshot")
+        patcher = mock.patch.dict(os.environ,
+                                  {"ZCONFIG_SNAPSHOT_NAME": "first"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        ZConfigParser = ZConfig.cfgparser.ZConfigParser
+        patcher = mock.patch.object(ZConfigParser, "parse", autospec=True,
+                                    side_effect=ZConfigParser.parse)
+        self.parse = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @property
+    def parses(self):
+        return self.parse.call_count
+
+    def servers(self, port):
+        return "<server a>\n  port %d\n</server>\n" % port
+
+    def load(self, **kw):
+        return ZConfig.snapshot.loadConfig(
+            self.schema, self.url, self.snapshot, **kw)
+
+    def test_snapshot_skips_parsing(self):
+        conf, handler = self.load()
+        self.assertEqual(self.parses, 2)
+        self.assertTrue(os.path.exists(self.snapshot))
+        conf2, handler2 = self.load()
+        self.assertEqual(self.parses, 2)
+        self.assertEqual(conf2.name, "first")
+        self.assertEqual(conf2.servers[0].port, 8080)
+        self.assertEqual(conf2.servers[0].host, "localhost")
+        self.assertEqual(conf2.home, conf.home)
+        self.assertIs(conf2.getSectionDefinition(), self.schema)
+        self.assertIs(conf2.servers[0].getSectionDefinition(),
+                      self.schema.gettype("server"))
+        self.assertEqual(len(handler2), len(handler))
+
+    def test_changed_include_invalidates(self):
+        self.load()
+        self.write("servers.conf", self.servers(9090))
+        conf, _ = self.load()
+        self.assertEqual(self.parses, 4)
+        self.assertEqual(conf.servers[0].port, 9090)
+
+    def test_changed_environment_invalidates(self):
+        self.load()
+        os.environ["ZCONFIG_SNAPSHOT_NAME"] = "second"
+        conf, _ = self.load()
+        self.assertEqual(self.parses, 4)
+        self.assertEqual(conf.name, "second")
+
+    def test_injected_environment(self):
+        environ = {"ZCONFIG_SNAPSHOT_NAME": "injected"}
+        conf, _ = self.load(environ=environ)
+        self.assertEqual(conf.name, "injected")
+        # the snapshot is only valid for the same environment
+        conf, _ = self.load(environ=environ)
+        self.assertEqual(self.parses, 2)
+        conf, _ = self.load()
+        self.assertEqual(self.parses, 4)
+        self.assertEqual(conf.name, "first")
+
+    def test_changed_schema_invalidates(self):
+        self.load()
+        self.schema = ZConfig.loadSchema(self.write(
+            "schema.xml", SCHEMA.replace("localhost", "example.com")))
+        conf, _ = self.load()
+        self.assertEqual(self.parses, 4)
+        self.assertEqual(conf.servers[0].host, "example.com")
+
+    def test_overrides(self):
+        self.load()
+        conf, _ = self.load(overrides=["name=other"])
+        self.assertEqual(self.parses, 4)
+        self.assertEqual(conf.name, "other")
+
+    def test_imported_components(self):
+        self.write("main.conf", "%import ZConfig.components.logger\n"
+                   "<eventlog>\n  level warning\n</eventlog>\n" + CONFIG)
+        schema = ZConfig.loadSchema(self.write(
+            "schema.xml", SCHEMA.replace(
+                "</schema>",
+                "<import package='ZConfig.components.logger'"
+                " file='abstract.xml'/>"
+                "<section type='ZConfig.logger.log' name='*'"
+                " attribute='eventlog'/></schema>")))
+        conf, _ = ZConfig.snapshot.loadConfig(schema, self.url,
+                                              self.snapshot)
+        conf2, _ = ZConfig.snapshot.loadConfig(schema, self.url,
+                                               self.snapshot)
+        self.assertEqual(self.parses, 2)
+        self.assertEqual(conf2.eventlog.level, 30)
+        self.assertEqual(conf2.eventlog.level, conf.eventlog.level)
+
+    def test_unusable_snapshots(self):
+        for data in (b"", b"garbage", ZConfig.snapshot.MAGIC + b"junk"):
+            with open(self.snapshot, "wb") as f:
+                f.write(data)
+            self.assertIsNone(ZConfig.snapshot.load(
+                self.snapshot, self.schema, self.url))
+        self.load()
+        self.assertIsNone(ZConfig.snapshot.load(
+            self.snapshot, self.schema, self.write("other.conf", "")))
+        self.assertIsNotNone(ZConfig.snapshot.load(
+            self.snapshot, self.schema))
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "needs file ownership")
+    def test_untrusted_snapshots(self):
+        self.load()
+        self.assertIsNotNone(ZConfig.snapshot.load(
+            self.snapshot, self.schema, self.url))
+        with mock.patch("os.getuid", return_value=os.getuid() + 1):
+            self.assertIsNone(ZConfig.snapshot.load(
+                self.snapshot, self.schema, self.url))
+        os.chmod(self.snapshot, 0o666)
+        self.assertIsNone(ZConfig.snapshot.load(
+            self.snapshot, self.schema, self.url))
+        # the snapshot is replaced by a trusted one
+        self.load()
+        self.assertEqual(self.parses, 4)
+        self.assertFalse(os.stat(self.snapshot).st_mode & 0o077)
+
+    def test_not_saved_without_url(self):
+        loader = ConfigLoader(self.schema)
+        result = loader.loadFile(StringIO("name x\n"))
+        self.assertFalse(ZConfig.snapshot.save(
+            self.snapshot, loader, result))
+        self.assertFalse(os.path.exists(self.snapshot))
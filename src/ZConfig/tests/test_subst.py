@@ -18,6 +18,7 @@ import unittest
 
 from ZConfig import SubstitutionReplacementError
 from ZConfig import SubstitutionSyntaxError
+from ZConfig.substitution import _compile_template
 from ZConfig.substitution import isname
 from ZConfig.substitution import substitute
 
@@ -50,6 +51,7 @@ class SubstitutionTestCase(unittest.TestCase):
 
         # Check for an ENV var
         self.assertEqual(substitute("$(PATH)", d), os.getenv("PATH"))
+        self.assertEqual(substitute("$(PATH)", d, {"PATH": "/bin"}), "/bin")
 
     def test_undefined_names(self):
         d = {"name": "value"}
@@ -90,6 +92,32 @@ class SubstitutionTestCase(unittest.TestCase):
         check("$")
         check("$ stuff")
 
+    def test_error_order(self):
+        # Errors are raised in the order they occur in the source.
+        self.assertRaises(SubstitutionReplacementError,
+                          substitute, "$undefined $", {})
+        self.assertRaises(SubstitutionSyntaxError,
+                          substitute, "$name $", {"name": "value"})
+        with self.assertRaises(SubstitutionReplacementError) as ctx:
+            substitute("$name $Other", {"name": "value"})
+        self.assertEqual(ctx.exception.source, "$name $Other")
+        self.assertEqual(ctx.exception.name, "Other")
+
+    def test_many_references(self):
+        d = {"a": "x", "b": "yy"}
+        s = "$a-${b}$$" * 1000
+        self.assertEqual(substitute(s, d), "x-yy$" * 1000)
+        # the compiled template is reused with other mappings
+        self.assertEqual(substitute(s, {"a": "", "b": ""}), "-$" * 1000)
+
+    def test_literal_text_not_cached(self):
+        _compile_template.cache_clear()
+        self.assertEqual(substitute("no references", {}), "no references")
+        self.assertEqual(substitute("", {}), "")
+        self.assertEqual(_compile_template.cache_info().currsize, 0)
+        substitute("$$", {})
+        self.assertEqual(_compile_template.cache_info().currsize, 1)
+
     def test_non_nesting(self):
         d = {"name": "$value"}
         self.assertEqual(substitute("$name", d), "$value")
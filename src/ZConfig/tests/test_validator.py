@@ -60,6 +60,17 @@ class TestValidator(unittest.TestCase):
         self.assertEqual(res, 1)
         self.assertIn("'refouter' is not a known key name", sio.getvalue())
 
+    def test_all_errors(self):
+        sio = StringIO()
+        with support.stderr_replaced(sio):
+            res = run_validator("--schema", support.input_file("simple.xml"),
+                                "--all-errors",
+                                support.input_file("outer.conf"))
+        self.assertEqual(res, 1)
+        err = sio.getvalue()
+        self.assertIn("'refouter' is not a known key name", err)
+        self.assertIn("'refinner' is not a known key name", err)
+
 
 def test_suite():
     return unittest.defaultTestLoader.loadTestsFromName(__name__)
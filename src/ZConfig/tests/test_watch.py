@@ -0,0 +1,139 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Tests of ZConfig.watch."""
+
+import os
+import sys
+import threading
+import unittest
+from io import StringIO
+
+import ZConfig
+from ZConfig.tests.support import TempDirHelper
+from ZConfig.watch import Watcher
+
+
+SCHEMA = """\
+<schema>
+  <key name='name' handler='name'/>
+  <multikey name='item' attribute='items'/>
+</schema>
+"""
+
+
+class WatcherTestCase(TempDirHelper, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.schema = ZConfig.loadSchemaFile(StringIO(SCHEMA))
+        self.write("items.conf", "item a\n")
+        self.url = self.write("main.conf",
+                              "name first\n%include items.conf\n")
+        self.names = []
+        self.handlers = {"name": self.names.append}
+
+    def test_sources(self):
+        watcher = Watcher(self.schema, self.url, self.handlers, delay=0)
+        self.assertEqual([url.rsplit("/", 1)[1] for url in watcher.sources],
+                         ["main.conf", "items.conf"])
+        self.assertEqual(watcher.config.name, "first")
+        self.assertEqual(self.names, [])
+
+    def test_reload_on_change(self):
+        changes = []
+        watcher = Watcher(self.schema, self.url, self.handlers, delay=0,
+                          callback=lambda *args: changes.append(args))
+        self.assertFalse(watcher.check())
+        self.write("items.conf", "item b\n")
+        self.assertTrue(watcher.check())
+        self.assertEqual(watcher.config.items, ["b"])
+        self.assertEqual(self.names, ["first"])
+        config, change = changes[0]
+        self.assertIs(config, watcher.config)
+        self.assertEqual(len(change.resources), 1)
+        self.assertFalse(watcher.check())
+
+    def test_new_include_watched(self):
+        watcher = Watcher(self.schema, self.url, self.handlers, delay=0)
+        self.write("more.conf", "item c\n")
+        self.write("main.conf", "name first\n%include more.conf\n")
+        self.assertTrue(watcher.check())
+        self.write("more.conf", "item d\n")
+        self.assertTrue(watcher.check())
+        self.assertEqual(watcher.config.items, ["d"])
+
+    def test_debounce(self):
+        watcher = Watcher(self.schema, self.url, self.handlers, delay=60)
+        self.write("items.conf", "item b\n")
+        self.assertFalse(watcher.check())
+        self.write("items.conf", "item c\n")
+        self.assertFalse(watcher.check())
+        watcher.delay = 0
+        self.assertTrue(watcher.check())
+        self.assertEqual(watcher.config.items, ["c"])
+
+    def test_error_keeps_config(self):
+        watcher = Watcher(self.schema, self.url, self.handlers, delay=0)
+        self.write("items.conf", "<bad\n")
+        with self.assertLogs("ZConfig.watch"):
+            self.assertFalse(watcher.check())
+        self.assertEqual(watcher.config.items, ["a"])
+        self.assertFalse(watcher.check())
+        self.assertEqual(len(watcher.sources), 2)
+        self.write("items.conf", "item e\n")
+        self.assertTrue(watcher.check())
+        self.assertEqual(watcher.config.items, ["e"])
+
+    def test_imported_components(self):
+        pkg = os.path.join(self.tmpdir, "zconfig_watch_component")
+        os.mkdir(pkg)
+        open(os.path.join(pkg, "__init__.py"), "w").close()
+        component = self.write(
+            "zconfig_watch_component/component.xml",
+            "<component><sectiontype name='thing-a' implements='thing'>"
+            "<key name='size' datatype='integer'/>"
+            "</sectiontype></component>")
+        schema = ZConfig.loadSchemaFile(StringIO(
+            "<schema><abstracttype name='thing'/>"
+            "<section type='thing' name='*' attribute='thing'/>"
+            "</schema>"))
+        self.write("main.conf", "%import zconfig_watch_component\n"
+                                "<thing-a>\n  size 1\n</thing-a>\n")
+        sys.path.insert(0, self.tmpdir)
+        try:
+            watcher = Watcher(schema, self.url, delay=0)
+            self.assertIn(
+                "package:zconfig_watch_component:component.xml",
+                watcher.sources)
+            self.write("zconfig_watch_component/component.xml",
+                       open(component).read().replace("integer", "float"))
+            self.assertTrue(watcher.check())
+            self.assertEqual(watcher.config.thing.size, 1.0)
+            self.assertIsInstance(watcher.config.thing.size, float)
+        finally:
+            sys.path.remove(self.tmpdir)
+            sys.modules.pop("zconfig_watch_component", None)
+
+    def test_thread(self):
+        reloaded = threading.Event()
+        watcher = Watcher(self.schema, self.url, self.handlers,
+                          interval=0.01, delay=0,
+                          callback=lambda *args: reloaded.set())
+        watcher.start()
+        try:
+            self.write("items.conf", "item f\n")
+            self.assertTrue(reloaded.wait(10))
+        finally:
+            watcher.stop()
+        self.assertEqual(watcher.config.items, ["f"])
@@ -40,6 +40,13 @@ def main(args=None):
         metavar="FILE"
     )
 
+    optparser.add_argument(
+        "-a", "--all-errors", dest="all_errors",
+        action="store_true",
+        help="report all the errors found in each file instead of"
+             " stopping at the first one",
+    )
+
     optparser.add_argument(
         "file",
         nargs='*',
@@ -62,7 +69,8 @@ def main(args=None):
     errors = False
     for f in options.file:
         try:
-            ZConfig.loadConfigFile(schema, f)
+            ZConfig.loadConfigFile(schema, f,
+                                   collect_errors=options.all_errors)
         except ZConfig.ConfigurationError as e:
             print(str(e), file=sys.stderr)
             errors = True
@@ -0,0 +1,149 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Reloading configurations when their files change.
+
+A :class:`Watcher` loads a configuration and keeps track of every
+resource it was built from: the configuration file, the files it
+includes, and the schema components it imports.  Local resources are
+polled with :func:`os.stat`; when they change, the configuration is
+reloaded and the handlers are called with the new values.
+
+Resources which are not local files (such as ``http:`` URLs) are not
+watched.
+
+"""
+
+import logging
+import os
+import threading
+import time
+
+import ZConfig.loader
+
+
+logger = logging.getLogger(__name__)
+
+
+class Watcher:
+    """Load the configuration at *url* and reload it when it changes.
+
+    The configuration is loaded using *schema* when the watcher is
+    created, and is available as :attr:`config` and :attr:`handler`.
+    *handlers* is the mapping passed to the composite handler of each
+    reloaded configuration; it is not called for the initial load.  If
+    *callback* is given, it is called with the new configuration and
+    the :class:`~ZConfig.loader.ReloadChanges` after the handlers.
+
+    Changes are only acted upon once the watched files have not
+    changed for *delay* seconds, so that a burst of edits causes a
+    single reload.  Errors during a reload are logged; the previous
+    configuration stays in effect until the files change again.
+
+    :meth:`start` starts a daemon thread which calls :meth:`check`
+    every *interval* seconds; :meth:`check` can also be called
+    directly.
+    """
+
+    def __init__(self, schema, url, handlers=None, interval=1.0,
+                 delay=0.5, callback=None):
+        self.handlers = handlers if handlers is not None else {}
+        self.interval = interval
+        self.delay = delay
+        self.callback = callback
+        self.loader = ZConfig.loader.ConfigLoader(schema, reloadable=True)
+        self.config, self.handler = self.loader.loadURL(url)
+        self.url = self.loader.sources[0]
+        self._base = schema
+        self._stats = self._stat_all()
+        self._pending = None
+        self._pending_since = None
+        self._stopped = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def sources(self):
+        """URLs of the resources the current configuration was built
+        from, excluding the resources of the schema itself."""
+        base = set(self._base.sources)
+        components = [url for url in self.loader.schema.sources
+                      if url not in base]
+        return ZConfig.loader._unique(self.loader.sources + components)
+
+    def start(self):
+        """Start polling in a background thread."""
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="ZConfig.watch", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread, if running."""
+        self._stopped.set()
+        if self._thread is not None:
+            if self._thread is not threading.current_thread():
+                self._thread.join()
+            self._thread = None
+
+    def check(self):
+        """Check the watched resources once.
+
+        Returns ``True`` if the configuration was reloaded.
+        """
+        with self._lock:
+            stats = self._stat_all()
+            if stats == self._stats:
+                self._pending = None
+                return False
+            now = time.monotonic()
+            if stats != self._pending:
+                self._pending = stats
+                self._pending_since = now
+            if now - self._pending_since < self.delay:
+                return False
+            self._pending = None
+            return self._reload(stats)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.check()
+
+    def _reload(self, stats):
+        try:
+            config, handler, changes = self.loader.reload()
+            handler(self.handlers)
+        except Exception:
+            logger.exception("error reloading configuration %s", self.url)
+            self._stats = stats
+            return False
+        self.config, self.handler = config, handler
+        self._stats = self._stat_all()
+        if self.callback is not None:
+            self.callback(config, changes)
+        return True
+
+    def _stat_all(self):
+        stats = {}
+        for url in self.sources:
+            path = ZConfig.loader._local_path(url)
+            if path is None:
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                stats[url] = None
+            else:
+                stats[url] = st.st_mtime_ns, st.st_size
+        return stats